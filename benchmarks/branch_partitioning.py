@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Branch partitioning benchmark: plain vs tenant branch_id index
+
+Loads random memories spread over hundreds of branches (interleaved, as real
+sessions write them), times branch-filtered work with the plain keyword
+index, migrates the same collection to the tenant layout with
+set_branch_partitioning() and times it again:
+
+    search_branch       top-k search filtered to one branch
+    search_3_branches   top-k search filtered to three branches (MatchAny)
+    scroll_branch       page through a whole branch (merge_branches path)
+    count_branch        exact count of one branch
+
+Needs Qdrant at QDRANT_URL (the embedded backend keeps no payload indexes).
+
+Usage:
+    python benchmarks/branch_partitioning.py --size 100000 --branches 300
+    python benchmarks/branch_partitioning.py --size 20000 --branches 500 --searches 100
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+
+from common import summarize, timed, random_vectors
+
+from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny, PointStruct, CollectionStatus
+
+from src.hivemind import create_qdrant_client, create_collection_schema, set_branch_partitioning
+
+
+def wait_green(client, collection: str):
+    while client.get_collection(collection_name=collection).status != CollectionStatus.GREEN:
+        time.sleep(0.5)
+
+
+def branch_filter(branches: list[str]) -> Filter:
+    if len(branches) == 1:
+        return Filter(must=[FieldCondition(key="branch_id", match=MatchValue(value=branches[0]))])
+    return Filter(must=[FieldCondition(key="branch_id", match=MatchAny(any=branches))])
+
+
+def measure(client, collection: str, args, rng: random.Random) -> dict:
+    """Time branch-filtered operations against random branches"""
+    branches = [f"branch-{i}" for i in range(args.branches)]
+    queries = random_vectors(args.searches, args.dim, seed=args.seed - 1)
+    results = {}
+
+    samples = []
+    for query in queries:
+        with timed(samples):
+            client.query_points(
+                collection_name=collection, query=query, limit=args.limit,
+                query_filter=branch_filter([rng.choice(branches)])
+            )
+    results["search_branch"] = summarize(samples)
+
+    samples = []
+    for query in queries:
+        with timed(samples):
+            client.query_points(
+                collection_name=collection, query=query, limit=args.limit,
+                query_filter=branch_filter(rng.sample(branches, 3))
+            )
+    results["search_3_branches"] = summarize(samples)
+
+    samples = []
+    for _ in range(args.scrolls):
+        scroll_filter = branch_filter([rng.choice(branches)])
+        with timed(samples):
+            offset = None
+            while True:
+                _, offset = client.scroll(
+                    collection_name=collection, scroll_filter=scroll_filter,
+                    limit=1000, offset=offset, with_vectors=True
+                )
+                if offset is None:
+                    break
+    results["scroll_branch"] = summarize(samples)
+
+    samples = []
+    for _ in range(args.scrolls):
+        with timed(samples):
+            client.count(
+                collection_name=collection, count_filter=branch_filter([rng.choice(branches)]), exact=True
+            )
+    results["count_branch"] = summarize(samples)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Plain vs tenant branch_id index benchmark")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--branches", type=int, default=300)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch", type=int, default=512)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--scrolls", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--collection", default="jarvis_bench_partitioning")
+    args = parser.parse_args()
+
+    client = create_qdrant_client(backend="server")
+    if client.collection_exists(args.collection):
+        client.delete_collection(args.collection)
+    create_collection_schema(client, args.dim, collection_name=args.collection, partitioning="index")
+
+    rng = random.Random(args.seed)
+    report = {"config": vars(args)}
+    try:
+        print(f"📦 Loading {args.size} memories over {args.branches} branches...", file=sys.stderr)
+        load_started = time.perf_counter()
+        for start in range(0, args.size, args.batch):
+            count = min(args.batch, args.size - start)
+            vectors = random_vectors(count, args.dim, seed=args.seed + start)
+            client.upsert(
+                collection_name=args.collection,
+                points=[
+                    PointStruct(
+                        id=start + i,
+                        vector=vector,
+                        payload={"branch_id": f"branch-{rng.randrange(args.branches)}", "text": ""}
+                    )
+                    for i, vector in enumerate(vectors)
+                ],
+                wait=True
+            )
+        wait_green(client, args.collection)
+        report["load_seconds"] = round(time.perf_counter() - load_started, 2)
+
+        print("⏱️  plain keyword index...", file=sys.stderr)
+        report["index"] = measure(client, args.collection, args, random.Random(args.seed))
+
+        print("🔧 Migrating to tenant index...", file=sys.stderr)
+        migrate_started = time.perf_counter()
+        set_branch_partitioning(client, "tenant", args.collection)
+        wait_green(client, args.collection)
+        report["migration_seconds"] = round(time.perf_counter() - migrate_started, 2)
+
+        print("⏱️  tenant index...", file=sys.stderr)
+        report["tenant"] = measure(client, args.collection, args, random.Random(args.seed))
+    finally:
+        client.delete_collection(args.collection)
+        client.close()
+
+    print(f"\n{'operation':20} {'index p50':>10} {'tenant p50':>11} {'index p95':>10} {'tenant p95':>11}", file=sys.stderr)
+    for operation in report["index"]:
+        before, after = report["index"][operation], report["tenant"][operation]
+        print(f"{operation:20} {before['p50_ms']:>10} {after['p50_ms']:>11} "
+              f"{before['p95_ms']:>10} {after['p95_ms']:>11}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
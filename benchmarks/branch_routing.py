@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Branch routing benchmark: unfiltered search vs centroid-routed search
+
+Loads memories over --branches branches, each about --topics sub-topics of
+its own (a vector per sub-topic plus noise, so branches are distinguishable
+but not trivially), builds the centroids as scripts/build_centroids.py does
+and times, for queries near random memories:
+
+    all         top-k over the whole collection
+    routed_N    score the centroids in RAM, then top-k filtered to the N
+                best branches (both steps timed)
+
+Recall is the share of the unfiltered top-k a routed search also returns.
+Routing only pays off where filtered search is cheaper than a full one:
+Qdrant server with a branch_id index (tenant partitioning helps most).
+
+Usage:
+    python benchmarks/branch_routing.py --backend server --size 100000 --branches 200
+    python benchmarks/branch_routing.py --size 20000 --branches 50 --routes 1 3
+"""
+
+import sys
+import json
+import argparse
+
+import numpy as np
+
+from common import summarize, timed
+
+from qdrant_client.models import Filter, FieldCondition, MatchAny, PointStruct
+
+from src.hivemind import create_qdrant_client, create_collection_schema
+from src.branch_router import spherical_kmeans, unit_rows
+
+
+def make_memories(args, rng) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(unit vectors, branch index, topic vectors) of the synthetic collection"""
+    topics = unit_rows(rng.standard_normal((args.branches * args.topics, args.dim)))
+    topic = rng.integers(0, len(topics), args.size)
+    noise = rng.standard_normal((args.size, args.dim)) * args.noise / np.sqrt(args.dim)
+    return unit_rows(topics[topic] + noise), topic // args.topics, topics
+
+
+def route(centroids: np.ndarray, owners: np.ndarray, query: np.ndarray, top: int) -> list[str]:
+    """Same ranking as BranchRouter.score_branches"""
+    best = []
+    for row in np.argsort(-(centroids @ query)):
+        if owners[row] not in best:
+            best.append(owners[row])
+            if len(best) == top:
+                break
+    return [f"branch-{b}" for b in best]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Unfiltered vs centroid-routed search benchmark")
+    parser.add_argument("--backend", choices=["embedded", "server"], default="embedded")
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--branches", type=int, default=50)
+    parser.add_argument("--topics", type=int, default=4, help="Sub-topics per branch")
+    parser.add_argument("--noise", type=float, default=1.0, help="Noise norm relative to the topic vector")
+    parser.add_argument("--centroids", type=int, default=4, help="Centroids per branch")
+    parser.add_argument("--routes", type=int, nargs="+", default=[1, 3], help="Branches searched when routed")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch", type=int, default=512)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--collection", default="jarvis_bench_routing")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors, branch_of, _ = make_memories(args, rng)
+
+    centroids, owners = [], []
+    for branch in range(args.branches):
+        centers, _ = spherical_kmeans(vectors[branch_of == branch], args.centroids)
+        centroids.append(unit_rows(centers))
+        owners.extend([branch] * len(centers))
+    centroids, owners = np.vstack(centroids), np.asarray(owners)
+
+    picks = rng.integers(0, args.size, args.searches)
+    queries = unit_rows(vectors[picks] + rng.standard_normal((args.searches, args.dim)) / np.sqrt(args.dim))
+
+    options = {"path": ":memory:"} if args.backend == "embedded" else {}
+    client = create_qdrant_client(backend=args.backend, **options)
+    if client.collection_exists(args.collection):
+        client.delete_collection(args.collection)
+    create_collection_schema(client, args.dim, collection_name=args.collection, partitioning="tenant")
+    report = {"config": vars(args)}
+    try:
+        print(f"📦 Loading {args.size} memories over {args.branches} branches...", file=sys.stderr)
+        for start in range(0, args.size, args.batch):
+            client.upsert(
+                collection_name=args.collection,
+                points=[
+                    PointStruct(id=i, vector=vectors[i].tolist(), payload={"branch_id": f"branch-{branch_of[i]}"})
+                    for i in range(start, min(start + args.batch, args.size))
+                ],
+                wait=True
+            )
+
+        samples, truth = [], []
+        for query in queries:
+            with timed(samples):
+                points = client.query_points(
+                    collection_name=args.collection, query=query.tolist(), limit=args.limit
+                ).points
+            truth.append({point.id for point in points})
+        report["all"] = {**summarize(samples), "recall": 1.0}
+
+        for top in args.routes:
+            samples, found = [], 0
+            for query, expected in zip(queries, truth):
+                with timed(samples):
+                    branches = route(centroids, owners, query, top)
+                    points = client.query_points(
+                        collection_name=args.collection, query=query.tolist(), limit=args.limit,
+                        query_filter=Filter(must=[FieldCondition(key="branch_id", match=MatchAny(any=branches))])
+                    ).points
+                found += len(expected & {point.id for point in points})
+            report[f"routed_{top}"] = {**summarize(samples), "recall": round(found / (len(truth) * args.limit), 3)}
+    finally:
+        client.delete_collection(args.collection)
+        client.close()
+
+    print(f"\n{'search':10} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7}", file=sys.stderr)
+    for name, row in report.items():
+        if name != "config":
+            print(f"{name:10} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['recall']:>7}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Chunked memories benchmark: chunking throughput and retrieval of buried facts
+
+    chunking    MB/s of iter_chunks() over a multi-MB text, whole and streamed
+                line by line
+    retrieval   long "incident write-ups" (random filler with one fact each)
+                stored as one vector vs as chunks; for each fact, the rank of
+                its write-up when searching for the fact
+
+Runs in memory on the embedded backend, by default with the local embedder
+(no network).
+
+Usage:
+    python benchmarks/chunked_memories.py
+    python benchmarks/chunked_memories.py --megabytes 20 --documents 200 --doc-chars 20000
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+from common import ROOT  # noqa: F401 (puts the repo on sys.path)
+
+FILLER = (
+    "deploy rollback latency alert pager dashboard service cluster node queue "
+    "retry timeout config release canary metrics logs trace outage ticket"
+).split()
+SYLLABLES = "ka zu mi ro te vo pa shi gle dor fen quo ix bar lun".split()
+
+
+def filler(rng: random.Random, chars: int) -> str:
+    sentences = []
+    length = 0
+    while length < chars:
+        sentence = " ".join(rng.choice(FILLER) for _ in range(rng.randint(6, 16))).capitalize() + "."
+        sentences.append(sentence)
+        length += len(sentence) + 1
+        if rng.random() < 0.1:
+            sentences.append("\n\n")
+    return " ".join(sentences)
+
+
+def codename(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(3))
+
+
+def measure_chunking(megabytes: float, chunk_chars: int, overlap: int) -> dict:
+    from src.chunking import iter_chunks
+
+    text = filler(random.Random(0), int(megabytes * 1024 ** 2))
+    results = {}
+    for mode, pieces in (("whole", lambda: [text]), ("lines", lambda: iter(text.splitlines(True)))):
+        started = time.perf_counter()
+        chunks = sum(1 for _ in iter_chunks(pieces(), chunk_chars, overlap))
+        elapsed = time.perf_counter() - started
+        results[mode] = {"chunks": chunks, "seconds": round(elapsed, 3), "mb_per_sec": round(megabytes / elapsed, 1)}
+    return results
+
+
+def measure_retrieval(args) -> dict:
+    from src.hivemind import get_qdrant_client, ensure_collection
+    from src.embeddings import get_vector_size, generate_embedding
+    from src import memory_text
+    from src.memory_text import memory_points
+    from src.hot_tier import search_memories
+
+    rng = random.Random(args.seed)
+    client = get_qdrant_client()
+    ensure_collection(client, get_vector_size())
+    # Each fact names things no other write-up mentions (like real root causes)
+    facts = [
+        f"Root cause: {codename(rng)} exhausted the {codename(rng)} pool on {codename(rng)}"
+        for _ in range(args.documents)
+    ]
+    results = {}
+    for layout, threshold in (("single", 0), ("chunked", args.threshold)):
+        memory_text.CHUNK_THRESHOLD_CHARS = threshold  # 0 = one vector per write-up
+        branch = f"bench-{layout}"
+        ids = []
+        points = 0
+        started = time.perf_counter()
+        for i, fact in enumerate(facts):
+            doc_rng = random.Random(args.seed + i)
+            position = doc_rng.randint(0, args.doc_chars)
+            body = filler(doc_rng, args.doc_chars)
+            text = f"{body[:position]} {fact}. {body[position:]}"
+            stored = memory_points(text, branch, {"type": "incident"})
+            client.upsert(collection_name=os.environ["COLLECTION_NAME"], points=stored, wait=True)
+            ids.append(stored[0].id)
+            points += len(stored)
+        store_seconds = time.perf_counter() - started
+
+        ranks = []
+        for memory_id, fact in zip(ids, facts):
+            found = search_memories(generate_embedding(fact), args.limit, branches=[branch])
+            found_ids = [p.id for p in found]
+            ranks.append(found_ids.index(memory_id) + 1 if memory_id in found_ids else None)
+        hits = [r for r in ranks if r is not None]
+        results[layout] = {
+            "points": points,
+            "store_seconds": round(store_seconds, 2),
+            "top1": round(sum(1 for r in hits if r == 1) / len(ranks), 3),
+            f"top{args.limit}": round(len(hits) / len(ranks), 3),
+            "mrr": round(sum(1 / r for r in hits) / len(ranks), 3)
+        }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Chunking throughput and chunked retrieval benchmark")
+    parser.add_argument("--megabytes", type=float, default=10)
+    parser.add_argument("--chunk-chars", type=int, default=2000)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--doc-chars", type=int, default=12000)
+    parser.add_argument("--threshold", type=int, default=4000, help="CHUNK_THRESHOLD_CHARS for the chunked run")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--embedder", default="local", help="local (default), ollama, openai")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Configure before src.config is imported
+    os.environ["STORAGE_BACKEND"] = "embedded"
+    os.environ["QDRANT_PATH"] = ":memory:"
+    os.environ["EMBEDDING_PROVIDER"] = args.embedder
+    os.environ["COLLECTION_NAME"] = "jarvis_bench_chunks"
+    os.environ["HOT_TIER_SIZE"] = "0"
+    os.environ["CHUNK_CHARS"] = str(args.chunk_chars)
+    os.environ["CHUNK_OVERLAP"] = str(args.overlap)
+
+    report = {"config": vars(args)}
+    print(f"✂️  Chunking {args.megabytes} MB...", file=sys.stderr)
+    report["chunking"] = measure_chunking(args.megabytes, args.chunk_chars, args.overlap)
+    print(f"🔎 Storing {args.documents} write-ups of {args.doc_chars} chars twice...", file=sys.stderr)
+    report["retrieval"] = measure_retrieval(args)
+
+    for mode, row in report["chunking"].items():
+        print(f"chunking ({mode}): {row['mb_per_sec']} MB/s, {row['chunks']} chunks", file=sys.stderr)
+    for layout, row in report["retrieval"].items():
+        print(f"{layout:8} top1 {row['top1']:.2f}  top{args.limit} {row[f'top{args.limit}']:.2f}  "
+              f"mrr {row['mrr']:.2f}  ({row['points']} points, {row['store_seconds']}s)", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for Jarvis benchmarks
+"""
+
+import os
+import sys
+import time
+import random
+from contextlib import contextmanager
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(p * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list[float], items_per_sample: int = 1) -> dict:
+    """Latency summary (ms) and throughput for a list of durations in seconds"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "ops_per_sec": round(len(ordered) * items_per_sample / total, 1) if total else 0.0
+    }
+
+
+@contextmanager
+def timed(samples: list[float]):
+    """Append the duration of the block (seconds) to samples"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples.append(time.perf_counter() - started)
+
+
+def random_vector(dim: int, rng: random.Random) -> list[float]:
+    """Random unit-ish vector (cosine distance ignores scale anyway)"""
+    return [rng.uniform(-1.0, 1.0) for _ in range(dim)]
+
+
+def random_vectors(count: int, dim: int, seed: int = 42) -> list[list[float]]:
+    """Many random vectors (NumPy when available - pure Python is slow at 100k)"""
+    try:
+        import numpy as np
+        return np.random.default_rng(seed).uniform(-1.0, 1.0, (count, dim)).astype("float32").tolist()
+    except ImportError:
+        rng = random.Random(seed)
+        return [random_vector(dim, rng) for _ in range(count)]
+
+
+def register_fake_embedder(dim: int):
+    """Register a deterministic 'fake' embedding provider
+
+    Each text maps to a fixed pseudo-random unit vector (seeded by crc32),
+    so runs are reproducible and embedding cost stays out of the numbers.
+    Set EMBEDDING_PROVIDER=fake before importing src.config to select it.
+    """
+    import zlib
+    import numpy as np
+    from src.embeddings import Embedder, ProviderSpec, register_provider
+
+    class FakeEmbedder(Embedder):
+        def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+            vectors = []
+            for text in texts:
+                vector = np.random.default_rng(zlib.crc32(text.encode())).standard_normal(self.dimension)
+                vectors.append((vector / np.linalg.norm(vector)).astype(np.float32).tolist())
+            return vectors
+
+    register_provider(ProviderSpec(
+        name="fake", model=f"fake-{dim}", dimension=dim,
+        max_batch=1024, max_input_chars=100000,
+        factory=lambda spec: FakeEmbedder(**spec.limits())
+    ))
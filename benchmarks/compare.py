@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark JSON reports (e.g. from two commits)
+
+Prints the relative change of every latency/throughput metric present in
+both reports. Exits non-zero if any p95 regressed by more than --threshold.
+
+Usage:
+    python benchmarks/compare.py before.json after.json --threshold 0.2
+"""
+
+import sys
+import json
+import argparse
+
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "max_ms", "seconds")
+HIGHER_IS_BETTER = ("ops_per_sec", "memories_per_sec")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Fail if a p95 gets worse by more than this fraction")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"{before['meta'].get('commit', '?')} → {after['meta'].get('commit', '?')}\n")
+    print(f"{'operation':32} {'metric':18} {'before':>10} {'after':>10} {'change':>8}")
+
+    regressions = []
+    for operation, old in before["results"].items():
+        new = after["results"].get(operation)
+        if not new:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if metric not in old or metric not in new or not old[metric]:
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            worse = change > 0 if metric in LOWER_IS_BETTER else change < 0
+            marker = "🔺" if worse and abs(change) > args.threshold else ""
+            print(f"{operation:32} {metric:18} {old[metric]:>10} {new[metric]:>10} {change:>+7.0%} {marker}")
+            if metric == "p95_ms" and worse and change > args.threshold:
+                regressions.append(f"{operation} p95 {change:+.0%}")
+
+    if regressions:
+        print(f"\n❌ p95 regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No p95 regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Embedding pool benchmark against local stub Ollama servers
+
+Starts in-process HTTP stubs that speak enough of the Ollama API
+(/api/embed, /api/tags) and simulate healthy, slow-tail and failing
+backends, then drives the real OllamaEmbedder + EndpointPool from
+concurrent threads. Compares a single endpoint against the balanced pool
+with and without hedging, and shows circuit breaking on the failing stub.
+
+Usage:
+    python benchmarks/embedding_pool.py --requests 400 --concurrency 8
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from common import summarize
+
+import ollama
+
+from src.embedding_pool import EndpointPool
+from src.embeddings import OllamaEmbedder
+
+
+class StubBehavior:
+    """How a stub responds: base latency, slow tail, failure rate"""
+
+    def __init__(self, name: str, latency: float, tail_rate: float = 0.0,
+                 tail_latency: float = 0.0, failure_rate: float = 0.0):
+        self.name = name
+        self.latency = latency
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.failure_rate = failure_rate
+        self.rng = random.Random(hash(name) & 0xFFFF)
+
+
+def start_stub(behavior: StubBehavior, dim: int) -> ThreadingHTTPServer:
+    """Serve a fake Ollama on an ephemeral localhost port"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status: int, body: dict):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if behavior.failure_rate >= 1.0:
+                return self._reply(503, {"error": "down"})
+            self._reply(200, {"models": []})
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            delay = behavior.latency
+            if behavior.rng.random() < behavior.tail_rate:
+                delay = behavior.tail_latency
+            time.sleep(delay)
+            if behavior.rng.random() < behavior.failure_rate:
+                return self._reply(500, {"error": "stub failure"})
+            inputs = request["input"] if isinstance(request["input"], list) else [request["input"]]
+            self._reply(200, {
+                "model": request.get("model", "stub"),
+                "embeddings": [[0.1] * dim for _ in inputs]
+            })
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_embedder(urls: list[str], hedge: bool, dim: int) -> OllamaEmbedder:
+    pool = EndpointPool(
+        urls=urls,
+        client_factory=lambda url: ollama.Client(host=url, timeout=5),
+        health_check=lambda client: client.list(),
+        failure_threshold=3 if len(urls) > 1 else 0,
+        cooldown=2.0,
+        health_interval=1.0,
+        hedge=hedge,
+        hedge_min_delay=0.01
+    )
+    return OllamaEmbedder(
+        pool, provider="ollama", model="stub", dimension=dim,
+        max_batch=64, max_input_chars=8000
+    )
+
+
+def drive(embedder: OllamaEmbedder, requests: int, concurrency: int) -> dict:
+    """Issue embedding requests from a thread pool and collect latencies"""
+    samples, errors = [], []
+    lock = threading.Lock()
+
+    def one(i: int):
+        started = time.perf_counter()
+        try:
+            embedder.embed(f"memory number {i}")
+            with lock:
+                samples.append(time.perf_counter() - started)
+        except Exception as e:
+            with lock:
+                errors.append(type(e).__name__)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests)))
+
+    result = summarize(samples)
+    result["errors"] = len(errors)
+    result["pool"] = embedder.pool.status()
+    embedder.pool.close()
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Embedding pool benchmark with stub backends")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--dim", type=int, default=768)
+    args = parser.parse_args()
+
+    behaviors = [
+        StubBehavior("fast", latency=0.005),
+        StubBehavior("slow-tail", latency=0.005, tail_rate=0.10, tail_latency=0.300),
+        StubBehavior("failing", latency=0.005, failure_rate=1.0)
+    ]
+    servers = {b.name: start_stub(b, args.dim) for b in behaviors}
+    urls = {name: f"http://127.0.0.1:{s.server_address[1]}" for name, s in servers.items()}
+
+    scenarios = {
+        "single_slow_tail": ([urls["slow-tail"]], False),
+        "pool_balanced": (list(urls.values()), False),
+        "pool_hedged": (list(urls.values()), True)
+    }
+
+    results = {}
+    for name, (scenario_urls, hedge) in scenarios.items():
+        print(f"⏱️  {name}...", file=sys.stderr)
+        results[name] = drive(make_embedder(scenario_urls, hedge, args.dim), args.requests, args.concurrency)
+
+    for server in servers.values():
+        server.shutdown()
+
+    print(json.dumps({"config": vars(args), "endpoints": urls, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
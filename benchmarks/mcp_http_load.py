@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Load test for the shared HTTP transport (MCP_TRANSPORT=http)
+
+Starts one server process, then opens --clients MCP sessions against it at
+once (streamable HTTP on /mcp, or SSE with --transport sse). Each client
+runs --calls tool calls, a mix of store_memory and search_memory on its own
+branch (--store-ratio stores), and records every call's latency.
+
+Reports latency percentiles per tool, total throughput, failed calls and
+the time to open all sessions. Compare runs at several --clients to see
+where tool workers (MCP_TOOL_WORKERS) or the storage backend saturate.
+
+By default the server uses an embedded Qdrant in a temporary directory and
+the local embedder, so nothing else has to run; --backend server uses
+QDRANT_URL and the configured embedding provider instead.
+
+Usage:
+    python benchmarks/mcp_http_load.py --clients 50 --calls 20
+    python benchmarks/mcp_http_load.py --clients 200 --transport sse --workers 32
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+from common import ROOT, summarize, timed
+
+
+def start_server(args, data_dir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "MCP_TRANSPORT": "http",
+        "MCP_HTTP_HOST": "127.0.0.1",
+        "MCP_HTTP_PORT": str(args.port),
+        "MCP_TOOL_WORKERS": str(args.workers),
+        "CHANGE_FEED_PATH": os.path.join(data_dir, "changes.db")
+    })
+    if args.backend == "embedded":
+        env.update({
+            "STORAGE_BACKEND": "embedded",
+            "QDRANT_PATH": os.path.join(data_dir, "qdrant"),
+            "EMBEDDING_PROVIDER": "local"
+        })
+    return subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "src", "server.py")],
+        cwd=ROOT, env=env, stderr=subprocess.DEVNULL if not args.verbose else None
+    )
+
+
+def wait_healthy(port: int, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server not healthy after {timeout:.0f}s")
+
+
+def open_transport(args):
+    base = f"http://127.0.0.1:{args.port}"
+    if args.transport == "sse":
+        from mcp.client.sse import sse_client
+        return sse_client(f"{base}/sse", timeout=60, sse_read_timeout=600)
+    from mcp.client.streamable_http import streamablehttp_client
+    return streamablehttp_client(f"{base}/mcp", timeout=60, sse_read_timeout=600)
+
+
+async def run_client(index: int, args, ready: asyncio.Barrier, results: dict):
+    from mcp import ClientSession
+
+    branch = f"load-{index % args.branches}"
+    store_every = max(1, round(1 / args.store_ratio)) if args.store_ratio > 0 else args.calls + 1
+    try:
+        async with open_transport(args) as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
+                await session.initialize()
+                await ready.wait()
+                for call in range(args.calls):
+                    if call % store_every == 0:
+                        name = "store_memory"
+                        arguments = {
+                            "text": f"client {index} call {call}: terraform state lock held by run {call % 7}",
+                            "branch_id": branch,
+                            "metadata": {"type": "learning"}
+                        }
+                    else:
+                        name = "search_memory"
+                        arguments = {"query": f"state lock run {call % 7}", "branch_id": branch, "limit": 5}
+                    samples = results.setdefault(name, [])
+                    try:
+                        with timed(samples):
+                            result = await session.call_tool(name, arguments)
+                        if result.isError:
+                            results["errors"] += 1
+                    except Exception:
+                        results["errors"] += 1
+    except Exception as e:
+        results["failed_sessions"] += 1
+        if args.verbose:
+            print(f"   client {index}: {e!r}", file=sys.stderr)
+        await ready.abort()
+
+
+async def run_load(args) -> dict:
+    results = {"errors": 0, "failed_sessions": 0}
+    ready = asyncio.Barrier(args.clients + 1)
+    started = time.perf_counter()
+    clients = [asyncio.create_task(run_client(i, args, ready, results)) for i in range(args.clients)]
+    try:
+        await asyncio.wait_for(ready.wait(), timeout=120)
+    except (asyncio.BrokenBarrierError, asyncio.TimeoutError):
+        pass
+    connected = time.perf_counter() - started
+    calls_started = time.perf_counter()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - calls_started
+
+    calls = sum(len(samples) for name, samples in results.items() if isinstance(samples, list))
+    return {
+        "connect_all_s": round(connected, 2),
+        "elapsed_s": round(elapsed, 2),
+        "calls": calls,
+        "calls_per_sec": round(calls / elapsed, 1) if elapsed else 0.0,
+        "errors": results["errors"],
+        "failed_sessions": results["failed_sessions"],
+        **{name: summarize(samples) for name, samples in results.items() if isinstance(samples, list)}
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Many concurrent MCP sessions against one HTTP server")
+    parser.add_argument("--clients", type=int, default=50, help="Simultaneous sessions")
+    parser.add_argument("--calls", type=int, default=20, help="Tool calls per session")
+    parser.add_argument("--store-ratio", type=float, default=0.25, help="Share of calls that store (every 1/ratio-th)")
+    parser.add_argument("--branches", type=int, default=10, help="Branches the clients spread over")
+    parser.add_argument("--transport", choices=["http", "sse"], default="http")
+    parser.add_argument("--backend", choices=["embedded", "server"], default="embedded")
+    parser.add_argument("--workers", type=int, default=16, help="MCP_TOOL_WORKERS of the server")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--verbose", action="store_true", help="Show server logs and client failures")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="jarvis-load-") as data_dir:
+        process = start_server(args, data_dir)
+        try:
+            wait_healthy(args.port, process)
+            print(f"🔌 {args.clients} clients x {args.calls} calls over {args.transport} "
+                  f"({args.workers} tool workers, {args.backend})...", file=sys.stderr)
+            report = {"config": vars(args), **asyncio.run(run_load(args))}
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    print(f"\n{'tool':14} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}", file=sys.stderr)
+    for name in ("store_memory", "search_memory"):
+        if name in report:
+            row = report[name]
+            print(f"{name:14} {row['count']:>6} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}",
+                  file=sys.stderr)
+    print(f"\n   {report['calls_per_sec']} calls/s, sessions opened in {report['connect_all_s']}s, "
+          f"{report['errors']} errors, {report['failed_sessions']} failed sessions", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    return 1 if report["errors"] or report["failed_sessions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
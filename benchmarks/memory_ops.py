@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Hive-mind memory benchmark suite
+
+Loads a synthetic corpus, then measures throughput and p50/p95/p99 latency
+of the MCP tool paths (store_memory, search_memory with and without filters,
+merge_branches, get_branch_stats) plus check_overseer and
+TaskCoordinator.create_execution_plan. search_vector times the search alone
+on precomputed query embeddings (compare runs with and without --hot-tier). Tools are invoked through
+server.call_tool, so results include argument handling and formatting.
+
+Defaults to the embedded backend and a deterministic fake embedder, so no
+services are needed. Results are JSON; diff two runs with compare.py.
+
+Usage:
+    python benchmarks/memory_ops.py --size 10000 --output before.json
+    python benchmarks/memory_ops.py --backend server --embedder local
+    python benchmarks/memory_ops.py --hot-tier 5000 --output hot.json
+    python benchmarks/compare.py before.json after.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from common import ROOT, summarize, timed, register_fake_embedder
+
+WORDS = (
+    "terraform apply plan validate module state drift kubernetes pod deploy rollout "
+    "helm chart incident outage latency timeout retry backoff database migration index "
+    "query cache redis queue worker lambda api gateway auth token jwt oauth secret vault "
+    "pagerduty schedule alert dashboard grafana prometheus metric log trace span error "
+    "regression test fixture mock coverage lint format review merge branch rebase commit"
+).split()
+MEMORY_TYPES = ["skill", "incident", "learning", "context"]
+
+
+def synthetic_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def load_corpus(size: int, branches: int, rng: random.Random) -> float:
+    """Bulk-load `size` memories directly (batched upserts), returning seconds"""
+    from qdrant_client.models import PointStruct
+    from src.config import COLLECTION_NAME
+    from src.hivemind import get_qdrant_client, generate_point_id, memory_timestamps
+    from src.embeddings import generate_embeddings
+
+    client = get_qdrant_client()
+    started = time.perf_counter()
+    batch = 512
+    for start in range(0, size, batch):
+        rows = []
+        for i in range(start, min(start + batch, size)):
+            rows.append({
+                "text": f"{synthetic_text(rng, rng.randint(8, 40))} #{i}",
+                "branch_id": f"branch-{i % branches}",
+                "type": rng.choice(MEMORY_TYPES),
+                **memory_timestamps()
+            })
+        vectors = generate_embeddings([row["text"] for row in rows])
+        client.upsert(
+            collection_name=COLLECTION_NAME,
+            points=[
+                PointStruct(id=generate_point_id(row["text"], row["branch_id"]), vector=vector, payload=row)
+                for row, vector in zip(rows, vectors)
+            ]
+        )
+    return time.perf_counter() - started
+
+
+def bench_tool(name: str, argument_sets: list[dict]) -> dict:
+    """Time server.call_tool for each argument set"""
+    from src.server import call_tool
+
+    samples = []
+    for arguments in argument_sets:
+        with timed(samples):
+            asyncio.run(call_tool(name, arguments))
+    return summarize(samples)
+
+
+def bench_function(fn, argument_sets: list[tuple]) -> dict:
+    samples = []
+    for arguments in argument_sets:
+        with timed(samples):
+            fn(*arguments)
+    return summarize(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Jarvis memory operation benchmarks")
+    parser.add_argument("--backend", choices=["embedded", "server"], default="embedded")
+    parser.add_argument("--embedder", default="fake", help="fake (default), local, ollama, openai")
+    parser.add_argument("--dim", type=int, default=768, help="Vector size for the fake embedder")
+    parser.add_argument("--size", type=int, default=5000, help="Synthetic corpus size")
+    parser.add_argument("--branches", type=int, default=20)
+    parser.add_argument("--ops", type=int, default=200, help="Iterations for store/search/overseer")
+    parser.add_argument("--slow-ops", type=int, default=10,
+                        help="Iterations for merge/stats/execution plan")
+    parser.add_argument("--hot-tier", type=int, default=0, help="HOT_TIER_SIZE (0 = Qdrant only)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--collection", default="jarvis_bench_memory")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    # Configure before src.config is imported
+    os.environ["STORAGE_BACKEND"] = args.backend
+    os.environ["EMBEDDING_PROVIDER"] = args.embedder
+    os.environ["COLLECTION_NAME"] = args.collection
+    os.environ["HOT_TIER_SIZE"] = str(args.hot_tier)
+    if args.backend == "embedded":
+        os.environ["QDRANT_PATH"] = ":memory:"
+
+    if args.embedder == "fake":
+        register_fake_embedder(args.dim)
+
+    from src.hivemind import get_qdrant_client, ensure_collection
+    from src.embeddings import get_vector_size, generate_embeddings
+    from src.hot_tier import get_hot_index, search_memories
+    from src.overseer import check_overseer
+    from src.task_coordinator import TaskCoordinator
+
+    client = get_qdrant_client()
+    if args.backend == "server":
+        if client.collection_exists(args.collection):
+            client.delete_collection(args.collection)
+        ensure_collection(client, get_vector_size())
+
+    rng = random.Random(args.seed)
+    results = {}
+    try:
+        print(f"📦 Loading {args.size} memories...", file=sys.stderr)
+        load_seconds = load_corpus(args.size, args.branches, rng)
+        results["corpus_load"] = {
+            "seconds": round(load_seconds, 2),
+            "memories_per_sec": round(args.size / load_seconds, 1)
+        }
+
+        queries = [synthetic_text(rng, rng.randint(3, 8)) for _ in range(args.ops)]
+        branches = [f"branch-{i}" for i in range(args.branches)]
+
+        if args.hot_tier:
+            index = get_hot_index()
+            while not index.loaded:
+                time.sleep(0.05)
+
+        print("⏱️  search_vector...", file=sys.stderr)
+        results["search_vector"] = bench_function(search_memories, [
+            (vector, 5) for vector in generate_embeddings(queries)
+        ])
+
+        print("⏱️  store_memory...", file=sys.stderr)
+        results["store_memory"] = bench_tool("store_memory", [
+            {
+                "text": f"{synthetic_text(rng, 30)} new-{i}",
+                "branch_id": rng.choice(branches),
+                "metadata": {"type": rng.choice(MEMORY_TYPES)}
+            }
+            for i in range(args.ops)
+        ])
+
+        print("⏱️  search_memory...", file=sys.stderr)
+        results["search_memory"] = bench_tool("search_memory", [
+            {"query": q, "limit": 5} for q in queries
+        ])
+        results["search_memory_branch_filter"] = bench_tool("search_memory", [
+            {"query": q, "limit": 5, "branch_filter": rng.sample(branches, 2)} for q in queries
+        ])
+        results["search_memory_type_filter"] = bench_tool("search_memory", [
+            {"query": q, "limit": 5, "type_filter": rng.choice(MEMORY_TYPES)} for q in queries
+        ])
+
+        print("⏱️  merge_branches / get_branch_stats...", file=sys.stderr)
+        results["merge_branches"] = bench_tool("merge_branches", [
+            {"source_branch": branches[i % len(branches)], "target_branch": f"merged-{i}"}
+            for i in range(args.slow_ops)
+        ])
+        results["get_branch_stats_all"] = bench_tool("get_branch_stats", [{} for _ in range(args.slow_ops)])
+        results["get_branch_stats_branch"] = bench_tool("get_branch_stats", [
+            {"branch_id": rng.choice(branches)} for _ in range(args.slow_ops)
+        ])
+
+        print("⏱️  check_overseer / create_execution_plan...", file=sys.stderr)
+        results["check_overseer"] = bench_function(check_overseer, [
+            (synthetic_text(rng, 40), "bash") for _ in range(args.ops)
+        ])
+        coordinator = TaskCoordinator()
+        plan_tasks = [
+            {"description": synthetic_text(rng, 6), "type": "analyze", "priority": "medium"}
+            for _ in range(5)
+        ]
+        results["create_execution_plan"] = bench_function(coordinator.create_execution_plan, [
+            (plan_tasks, "bench") for _ in range(args.slow_ops)
+        ])
+    finally:
+        if args.backend == "server":
+            client.delete_collection(args.collection)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "embedder": args.embedder,
+            "size": args.size,
+            "branches": args.branches,
+            "ops": args.ops,
+            "slow_ops": args.slow_ops,
+            "hot_tier": args.hot_tier,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"✓ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
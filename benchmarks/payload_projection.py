@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Payload projection benchmark: full payloads vs previews + compressed bodies
+
+Loads the same random memories (bodies of --min-chars to --max-chars words
+drawn from a small vocabulary, like session notes) twice:
+
+    raw         payload stores `text`; searches fetch the whole payload
+    projected   payload from text_fields(); searches fetch SEARCH_FIELDS
+
+and times top-k searches plus the payload bytes they return. Also reports
+the stored body size with and without compression.
+
+Usage:
+    python benchmarks/payload_projection.py --size 5000
+    python benchmarks/payload_projection.py --backend server --size 20000 --limit 20
+"""
+
+import sys
+import json
+import random
+import argparse
+
+from common import summarize, timed, random_vectors
+
+from qdrant_client.models import Distance, VectorParams, PointStruct
+
+from src.hivemind import create_qdrant_client
+from src.memory_text import text_fields, SEARCH_FIELDS
+
+WORDS = (
+    "qdrant branch memory search context embedding session vector payload index merge "
+    "retry timeout latency cache hot tier config server client slack token batch "
+    "fixed added removed refactor bug test deploy review chunk summary decision"
+).split()
+
+
+def random_text(rng: random.Random, min_chars: int, max_chars: int) -> str:
+    target = rng.randint(min_chars, max_chars)
+    words = []
+    length = 0
+    while length < target:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def measure(client, collection: str, queries, limit: int, with_payload) -> tuple[dict, int]:
+    samples = []
+    returned = 0
+    for query in queries:
+        with timed(samples):
+            points = client.query_points(
+                collection_name=collection, query=query, limit=limit, with_payload=with_payload
+            ).points
+        returned += len(json.dumps([point.payload for point in points]))
+    return summarize(samples), returned // len(queries)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Full vs projected payload benchmark")
+    parser.add_argument("--backend", choices=["embedded", "server"], default="embedded")
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--min-chars", type=int, default=500)
+    parser.add_argument("--max-chars", type=int, default=8000)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--collection", default="jarvis_bench_projection")
+    args = parser.parse_args()
+
+    options = {"path": ":memory:"} if args.backend == "embedded" else {}
+    client = create_qdrant_client(backend=args.backend, **options)
+    rng = random.Random(args.seed)
+    texts = [random_text(rng, args.min_chars, args.max_chars) for _ in range(args.size)]
+    queries = random_vectors(args.searches, args.dim, seed=args.seed - 1)
+
+    layouts = {
+        "raw": (lambda text: {"text": text}, True),
+        "projected": (text_fields, SEARCH_FIELDS)
+    }
+    report = {"config": vars(args), "stored_body_bytes": {}}
+    try:
+        for layout, (body, with_payload) in layouts.items():
+            collection = f"{args.collection}_{layout}"
+            if client.collection_exists(collection):
+                client.delete_collection(collection)
+            client.create_collection(
+                collection_name=collection,
+                vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE)
+            )
+            print(f"📦 Loading {args.size} memories ({layout})...", file=sys.stderr)
+            stored = 0
+            for start in range(0, args.size, args.batch):
+                vectors = random_vectors(min(args.batch, args.size - start), args.dim, seed=args.seed + start)
+                points = []
+                for i, vector in enumerate(vectors):
+                    payload = {"branch_id": "bench", "type": "context", "timestamp": "", **body(texts[start + i])}
+                    stored += len(payload.get("text", payload.get("text_zstd", "")))
+                    points.append(PointStruct(id=start + i, vector=vector, payload=payload))
+                client.upsert(collection_name=collection, points=points, wait=True)
+            report["stored_body_bytes"][layout] = stored
+
+            latency, returned = measure(client, collection, queries, args.limit, with_payload)
+            report[layout] = {**latency, "payload_bytes_per_search": returned}
+            client.delete_collection(collection)
+    finally:
+        client.close()
+
+    print(f"\n{'layout':10} {'p50 ms':>8} {'p95 ms':>8} {'bytes/search':>13} {'stored MB':>10}", file=sys.stderr)
+    for layout in layouts:
+        row = report[layout]
+        print(f"{layout:10} {row['p50_ms']:>8} {row['p95_ms']:>8} {row['payload_bytes_per_search']:>13} "
+              f"{report['stored_body_bytes'][layout] / 1024 ** 2:>10.1f}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
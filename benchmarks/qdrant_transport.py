@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+REST vs gRPC benchmark against a local Qdrant
+
+Creates a throwaway collection, then for each transport measures batched
+upserts and top-k searches with the pooled client from src.hivemind.
+
+Start Qdrant first:
+    podman run -d -p 6333:6333 -p 6334:6334 qdrant/qdrant
+
+Usage:
+    python benchmarks/qdrant_transport.py --points 20000 --batch 256 --searches 500
+"""
+
+import sys
+import json
+import random
+import argparse
+
+from common import summarize, timed, random_vector
+
+from qdrant_client.models import Distance, VectorParams, PointStruct
+
+from src.hivemind import create_server_client
+
+
+def run_transport(prefer_grpc: bool, args) -> dict:
+    """Upsert + search with one transport on a fresh collection"""
+    client = create_server_client(prefer_grpc=prefer_grpc)
+    collection = f"{args.collection}_{'grpc' if prefer_grpc else 'rest'}"
+    rng = random.Random(args.seed)
+
+    if client.collection_exists(collection):
+        client.delete_collection(collection)
+    client.create_collection(
+        collection_name=collection,
+        vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE)
+    )
+
+    try:
+        upsert_samples = []
+        for start in range(0, args.points, args.batch):
+            points = [
+                PointStruct(
+                    id=i,
+                    vector=random_vector(args.dim, rng),
+                    payload={"branch_id": f"branch-{i % 10}", "text": f"memory {i}"}
+                )
+                for i in range(start, min(start + args.batch, args.points))
+            ]
+            with timed(upsert_samples):
+                client.upsert(collection_name=collection, points=points, wait=True)
+
+        queries = [random_vector(args.dim, rng) for _ in range(args.searches)]
+        search_samples = []
+        for query in queries:
+            with timed(search_samples):
+                client.query_points(collection_name=collection, query=query, limit=args.limit)
+
+        return {
+            "transport": "grpc" if prefer_grpc else "rest",
+            "upsert_batch": summarize(upsert_samples),
+            "upsert_points_per_sec": summarize(upsert_samples, items_per_sample=args.batch)["ops_per_sec"],
+            "search": summarize(search_samples)
+        }
+    finally:
+        client.delete_collection(collection)
+        client.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Qdrant REST vs gRPC benchmark")
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--searches", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--collection", default="jarvis_bench_transport")
+    parser.add_argument("--transports", default="rest,grpc", help="Comma separated: rest,grpc")
+    args = parser.parse_args()
+
+    results = []
+    for transport in args.transports.split(","):
+        print(f"⏱️  {transport}...", file=sys.stderr)
+        results.append(run_transport(transport.strip() == "grpc", args))
+
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
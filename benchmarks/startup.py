@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Jarvis MCP server
+
+Measures:
+  1. Import cost of src/server.py (`python -X importtime`, median of N runs)
+  2. Which heavy dependencies the import drags in (must be none of them)
+  3. Time-to-first-tool-response: spawn the stdio server, initialize an MCP
+     session and time the first `overseer_check` call (needs Qdrant running)
+
+Exits non-zero when a threshold is exceeded, so it can gate CI.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --max-import-ms 1000 --skip-first-call
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC = os.path.join(ROOT, 'src')
+
+# Modules that importing server.py must not load eagerly
+HEAVY_MODULES = ["qdrant_client", "ollama", "openai", "grpc", "numpy"]
+
+
+def measure_import_ms() -> tuple[float, list[tuple[int, str]]]:
+    """Import server.py once under -X importtime
+
+    Returns:
+        (cumulative import time of `server` in ms, [(cumulative_us, module), ...])
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=SRC, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import server failed:\n{result.stderr}")
+
+    modules = []
+    total_us = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line.split("|")]
+        if not cumulative.isdigit():
+            continue  # header line
+        modules.append((int(cumulative), name))
+        if name == "server":
+            total_us = int(cumulative)
+
+    if total_us is None:
+        raise RuntimeError("`server` not found in -X importtime output")
+    return total_us / 1000, modules
+
+
+def loaded_heavy_modules() -> list[str]:
+    """Heavy dependencies present in sys.modules right after `import server`"""
+    code = (
+        "import sys, json, server; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import server failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+async def measure_first_response_ms() -> float:
+    """Spawn the stdio server and time spawn → first tool response"""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[os.path.join(SRC, "server.py")],
+        env=dict(os.environ),
+        cwd=ROOT
+    )
+
+    started = time.perf_counter()
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            await session.call_tool("overseer_check", {"action_text": "terraform fmt"})
+            return (time.perf_counter() - started) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Jarvis MCP server startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Import runs (median is reported)")
+    parser.add_argument("--max-import-ms", type=float, default=1500,
+                        help="Fail if the median import time exceeds this")
+    parser.add_argument("--max-first-response-ms", type=float, default=5000,
+                        help="Fail if time-to-first-tool-response exceeds this")
+    parser.add_argument("--skip-first-call", action="store_true",
+                        help="Only measure imports (no Qdrant available)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    failures = []
+
+    samples = []
+    modules = []
+    for _ in range(args.runs):
+        ms, modules = measure_import_ms()
+        samples.append(ms)
+    import_ms = statistics.median(samples)
+    if import_ms > args.max_import_ms:
+        failures.append(f"import {import_ms:.0f}ms > {args.max_import_ms:.0f}ms")
+
+    heavy = loaded_heavy_modules()
+    if heavy:
+        failures.append(f"import loads heavy modules: {', '.join(heavy)}")
+
+    first_response_ms = None
+    if not args.skip_first_call:
+        try:
+            first_response_ms = asyncio.run(measure_first_response_ms())
+            if first_response_ms > args.max_first_response_ms:
+                failures.append(
+                    f"first tool response {first_response_ms:.0f}ms > {args.max_first_response_ms:.0f}ms"
+                )
+        except Exception as e:
+            failures.append(f"first tool call failed: {e}")
+
+    results = {
+        "import_ms_median": round(import_ms, 1),
+        "import_ms_samples": [round(s, 1) for s in samples],
+        "heavy_modules_loaded": heavy,
+        "first_tool_response_ms": round(first_response_ms, 1) if first_response_ms else None,
+        "slowest_imports": [
+            {"module": name, "cumulative_ms": round(us / 1000, 1)}
+            for us, name in sorted(modules, reverse=True)[:10]
+        ],
+        "failures": failures
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("🚀 Jarvis startup benchmark")
+        print(f"   import server.py: {import_ms:.0f}ms median of {args.runs} (limit {args.max_import_ms:.0f}ms)")
+        print(f"   heavy modules loaded: {', '.join(heavy) or 'none'}")
+        if first_response_ms is not None:
+            print(f"   first tool response: {first_response_ms:.0f}ms (limit {args.max_first_response_ms:.0f}ms)")
+        print("\n   Slowest imports (cumulative):")
+        for entry in results["slowest_imports"]:
+            print(f"     {entry['cumulative_ms']:>8.1f}ms  {entry['module']}")
+        print()
+        for failure in failures:
+            print(f"❌ {failure}")
+        if not failures:
+            print("✅ Within thresholds")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
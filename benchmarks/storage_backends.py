@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Storage backend benchmark: server Qdrant vs embedded (in-process) Qdrant
+
+For each backend and corpus size, loads random memories in batches, then
+measures unfiltered and branch-filtered top-k searches. The server backend
+needs Qdrant at QDRANT_URL; the embedded backend runs in memory.
+
+Usage:
+    python benchmarks/storage_backends.py --sizes 10000,100000
+    python benchmarks/storage_backends.py --backends embedded --sizes 10000
+"""
+
+import sys
+import json
+import time
+import argparse
+
+from common import summarize, timed, random_vectors
+
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
+)
+
+from src.hivemind import create_qdrant_client
+
+
+def run_backend(backend: str, size: int, args) -> dict:
+    """Load `size` memories into a fresh collection and time searches"""
+    options = {"path": ":memory:"} if backend == "embedded" else {}
+    client = create_qdrant_client(backend=backend, **options)
+    collection = f"{args.collection}_{size}"
+
+    if client.collection_exists(collection):
+        client.delete_collection(collection)
+    client.create_collection(
+        collection_name=collection,
+        vectors_config=VectorParams(size=args.dim, distance=Distance.COSINE)
+    )
+    if backend == "server":
+        client.create_payload_index(collection, field_name="branch_id", field_schema="keyword")
+
+    try:
+        load_started = time.perf_counter()
+        for start in range(0, size, args.batch):
+            count = min(args.batch, size - start)
+            vectors = random_vectors(count, args.dim, seed=args.seed + start)
+            client.upsert(
+                collection_name=collection,
+                points=[
+                    PointStruct(
+                        id=start + i,
+                        vector=vector,
+                        payload={"branch_id": f"branch-{(start + i) % args.branches}"}
+                    )
+                    for i, vector in enumerate(vectors)
+                ],
+                wait=True
+            )
+        load_seconds = time.perf_counter() - load_started
+
+        queries = random_vectors(args.searches, args.dim, seed=args.seed - 1)
+        search_samples = []
+        for query in queries:
+            with timed(search_samples):
+                client.query_points(collection_name=collection, query=query, limit=args.limit)
+
+        branch_filter = Filter(must=[FieldCondition(key="branch_id", match=MatchValue(value="branch-0"))])
+        filtered_samples = []
+        for query in queries:
+            with timed(filtered_samples):
+                client.query_points(
+                    collection_name=collection, query=query, limit=args.limit, query_filter=branch_filter
+                )
+
+        return {
+            "backend": backend,
+            "memories": size,
+            "load_seconds": round(load_seconds, 2),
+            "load_points_per_sec": round(size / load_seconds, 1),
+            "search": summarize(search_samples),
+            "search_branch_filtered": summarize(filtered_samples)
+        }
+    finally:
+        client.delete_collection(collection)
+        client.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Server vs embedded storage backend benchmark")
+    parser.add_argument("--backends", default="server,embedded")
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch", type=int, default=512)
+    parser.add_argument("--branches", type=int, default=20)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--collection", default="jarvis_bench_backend")
+    args = parser.parse_args()
+
+    results = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        for backend in args.backends.split(","):
+            print(f"⏱️  {backend} @ {size} memories...", file=sys.stderr)
+            results.append(run_backend(backend.strip(), size, args))
+
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Backfill created_at (UTC epoch seconds) on memories stored before it existed
+
+since/until filters match created_at only, so older memories are invisible
+to time-windowed searches and stats until this has run. Each point gets the
+epoch of its ISO timestamp (naive timestamps were written in local time).
+Only points without created_at are read, so re-running is cheap and safe.
+
+Usage:
+    python scripts/backfill_created_at.py --dry-run
+    python scripts/backfill_created_at.py --batch-size 1000
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import argparse
+
+from src.config import COLLECTION_NAME
+from src.hivemind import get_qdrant_client, describe_backend, epoch_from_timestamp, PAYLOAD_INDEXES
+
+
+def missing_created_at():
+    from qdrant_client.models import Filter, IsEmptyCondition, PayloadField
+    return Filter(must=[IsEmptyCondition(is_empty=PayloadField(key="created_at"))])
+
+
+def ensure_index(client, collection_name: str) -> bool:
+    """Create the created_at range index if missing (server backend)
+
+    Returns:
+        True if it was created
+    """
+    if getattr(client, "embedded", False):
+        return False
+    schema = client.get_collection(collection_name=collection_name).payload_schema
+    if "created_at" in schema:
+        return False
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="created_at",
+        field_schema=PAYLOAD_INDEXES["created_at"],
+        wait=True
+    )
+    return True
+
+
+def main():
+    from qdrant_client.models import SetPayloadOperation, SetPayload
+
+    parser = argparse.ArgumentParser(description="Backfill created_at from timestamp")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Only count points to backfill")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    pending = client.count(
+        collection_name=args.collection, count_filter=missing_created_at(), exact=True
+    ).count
+
+    print(f"\n🕒 Backfilling created_at in {args.collection} ({describe_backend()})")
+    print("=" * 80)
+    print(f"   {pending} memories without created_at")
+    if args.dry_run:
+        return 0
+
+    if ensure_index(client, args.collection):
+        print("   ✓ created_at index")
+
+    started = time.perf_counter()
+    updated = skipped = 0
+    last_report = started
+    offset = None
+    while pending:
+        # Offset paging: updated points leave the filter behind the cursor
+        points, offset = client.scroll(
+            collection_name=args.collection,
+            scroll_filter=missing_created_at(),
+            limit=args.batch_size,
+            offset=offset,
+            with_payload=["timestamp"],
+            with_vectors=False
+        )
+        operations = []
+        for point in points:
+            epoch = epoch_from_timestamp((point.payload or {}).get("timestamp"))
+            if epoch is None:
+                skipped += 1
+                continue
+            operations.append(SetPayloadOperation(
+                set_payload=SetPayload(payload={"created_at": epoch}, points=[point.id])
+            ))
+        if operations:
+            client.batch_update_points(collection_name=args.collection, update_operations=operations, wait=True)
+            updated += len(operations)
+        if time.perf_counter() - last_report >= 5:
+            last_report = time.perf_counter()
+            print(f"   {updated}/{pending} ({updated / (last_report - started):.0f}/s)", file=sys.stderr)
+        if offset is None:
+            break
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Backfilled {updated} memories in {elapsed:.1f}s")
+    if skipped:
+        print(f"   ⚠️  {skipped} without a parsable timestamp (left without created_at)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
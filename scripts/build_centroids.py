@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Rebuild the branch centroids used for routing (see src/branch_router.py)
+
+Reads every vector (chunks included, since search matches them too),
+clusters each branch into up to --centroids groups with spherical k-means
+and replaces the centroid collection. Stores keep the centroids current
+afterwards; re-run after deletions, compaction or bulk loads by several
+processes, or when memories were stored before centroids existed.
+
+Vectors are grouped in RAM per branch: 100k x 768 dimensions is ~300 MB.
+
+Usage:
+    python scripts/build_centroids.py --dry-run
+    python scripts/build_centroids.py --centroids 8
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import argparse
+
+import numpy as np
+
+from src.config import COLLECTION_NAME, BRANCH_CENTROIDS
+from src.hivemind import get_qdrant_client, describe_backend
+from src.branch_router import (
+    centroid_collection, centroid_id, ensure_centroid_collection, spherical_kmeans, unit_rows
+)
+
+
+def export_branches(client, collection: str, page_size: int) -> dict[str, np.ndarray]:
+    """Unit vectors of every point, by branch"""
+    pages: dict[str, list] = {}
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection,
+            limit=page_size,
+            offset=offset,
+            with_payload=["branch_id"],
+            with_vectors=True
+        )
+        for point in points:
+            pages.setdefault((point.payload or {}).get("branch_id", "main"), []).append(point.vector)
+        if offset is None:
+            break
+    return {branch: unit_rows(vectors) for branch, vectors in pages.items()}
+
+
+def main():
+    from qdrant_client.models import PointStruct
+
+    parser = argparse.ArgumentParser(description="Rebuild branch centroids")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--centroids", type=int, default=BRANCH_CENTROIDS or 4, help="Max centroids per branch")
+    parser.add_argument("--iterations", type=int, default=10, help="k-means iterations")
+    parser.add_argument("--page-size", type=int, default=1000, help="Points per export request")
+    parser.add_argument("--dry-run", action="store_true", help="Compute, but do not store")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+
+    print(f"\n🌿 Building branch centroids for {args.collection} ({describe_backend()})")
+    print("=" * 80)
+    started = time.perf_counter()
+    branches = export_branches(client, args.collection, args.page_size)
+    total = sum(len(units) for units in branches.values())
+    print(f"   Exported {total} vectors of {len(branches)} branches in {time.perf_counter() - started:.1f}s")
+
+    points = []
+    for branch, units in sorted(branches.items()):
+        centers, counts = spherical_kmeans(units, args.centroids, args.iterations)
+        # How well the centroids stand for the branch: mean cosine of each vector to its closest one
+        fit = float(np.mean(np.max(units @ unit_rows(centers).T, axis=1)))
+        print(f"   {branch}: {len(units)} vectors → {len(centers)} centroids (fit {fit:.3f})")
+        points.extend(
+            PointStruct(id=centroid_id(branch, i), vector=center.tolist(), payload={"branch_id": branch, "count": int(count)})
+            for i, (center, count) in enumerate(zip(centers, counts))
+        )
+
+    if args.dry_run or not points:
+        return 0
+    name = centroid_collection(args.collection)
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    ensure_centroid_collection(client, len(points[0].vector), args.collection)
+    for start in range(0, len(points), 500):
+        client.upsert(collection_name=name, points=points[start:start + 500], wait=True)
+
+    print(f"\n✅ Stored {len(points)} centroids in {name} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Precompute every memory's related memories (see src/related.py)
+
+Exports the memories' vectors once, then finds each one's top --k
+neighbours exactly with blocked matrix products (--block-size rows at a
+time) and stores them as the `related` payload field. Stores keep the
+lists current afterwards; re-run after bulk loads, merges of large
+branches or deletions to rebuild them exactly.
+
+Vectors are held in RAM: 100k memories x 768 dimensions is ~300 MB, plus
+one block x 100k score matrix (~400 MB at the default block size).
+
+Usage:
+    python scripts/build_related.py --dry-run
+    python scripts/build_related.py --k 20 --block-size 512
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import argparse
+
+import numpy as np
+
+from src.config import COLLECTION_NAME, RELATED_K
+from src.hivemind import get_qdrant_client, describe_backend, memory_conditions
+from src.related import nearest_neighbors, related_entry, RELATED_FIELD
+
+
+def export_vectors(client, collection: str, page_size: int) -> tuple[list, np.ndarray]:
+    """IDs and vectors of every memory (extra chunks left out)"""
+    from qdrant_client.models import Filter
+
+    ids, pages = [], []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection,
+            scroll_filter=Filter(must=memory_conditions()),
+            limit=page_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=True
+        )
+        if points:
+            ids.extend(point.id for point in points)
+            pages.append(np.asarray([point.vector for point in points], dtype=np.float32))
+        if offset is None:
+            break
+    return ids, np.vstack(pages) if pages else np.zeros((0, 0), dtype=np.float32)
+
+
+def main():
+    from qdrant_client.models import SetPayloadOperation, SetPayload
+
+    parser = argparse.ArgumentParser(description="Precompute related memories")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--k", type=int, default=RELATED_K or 10, help="Neighbours per memory")
+    parser.add_argument("--block-size", type=int, default=1024, help="Rows per matrix product")
+    parser.add_argument("--page-size", type=int, default=1000, help="Points per export request")
+    parser.add_argument("--dry-run", action="store_true", help="Compute, but do not store")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+
+    print(f"\n🔗 Building related memories for {args.collection} ({describe_backend()})")
+    print("=" * 80)
+    started = time.perf_counter()
+    ids, matrix = export_vectors(client, args.collection, args.page_size)
+    exported = time.perf_counter()
+    print(f"   Exported {len(ids)} vectors in {exported - started:.1f}s ({matrix.nbytes / 1024 ** 2:.0f} MB)")
+    if len(ids) < 2:
+        print("   Nothing to relate")
+        return 0
+
+    linked = 0
+    scores_seen = []
+    for start, neighbors, scores in nearest_neighbors(matrix, args.k, args.block_size):
+        operations = [
+            SetPayloadOperation(set_payload=SetPayload(
+                payload={RELATED_FIELD: [related_entry(ids[j], score) for j, score in zip(row, row_scores)]},
+                points=[ids[start + i]]
+            ))
+            for i, (row, row_scores) in enumerate(zip(neighbors, scores))
+        ]
+        if not args.dry_run:
+            client.batch_update_points(collection_name=args.collection, update_operations=operations, wait=True)
+        linked += len(operations)
+        scores_seen.append(scores[:, 0])
+        print(f"   {linked}/{len(ids)} ({linked / (time.perf_counter() - exported):.0f}/s)", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    nearest = np.concatenate(scores_seen)
+    verb = "Computed" if args.dry_run else "Stored"
+    print(f"\n✅ {verb} {min(args.k, len(ids) - 1)} neighbours for {linked} memories in {elapsed:.1f}s")
+    print(f"   Nearest neighbour score: median {np.median(nearest):.3f}, min {nearest.min():.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
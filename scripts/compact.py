@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Expire memories past their retention policy (see src/compaction.py)
+
+Expired memories are archived to COMPACTION_ARCHIVE_DIR before deletion;
+restore an archive with: python scripts/snapshot.py import <archive>
+
+Usage:
+    python scripts/compact.py --dry-run
+    python scripts/compact.py --policy "context=30,incident=730,skill=never,branch:scratch=7"
+    python scripts/compact.py --yes                      # RETENTION_POLICY from .env
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import argparse
+
+from src.config import COLLECTION_NAME, RETENTION_POLICY, COMPACTION_ARCHIVE_DIR, COMPACTION_BATCH_SIZE
+from src.hivemind import describe_backend
+from src.compaction import parse_policy, compact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive and delete memories past retention")
+    parser.add_argument("--policy", default=RETENTION_POLICY,
+                        help="Retention rules (default: RETENTION_POLICY from .env)")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would expire")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--archive-dir", default=COMPACTION_ARCHIVE_DIR)
+    parser.add_argument("--batch-size", type=int, default=COMPACTION_BATCH_SIZE)
+    parser.add_argument("--yes", action="store_true", help="Do not ask for confirmation")
+    args = parser.parse_args()
+
+    try:
+        rules = parse_policy(args.policy)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if not rules:
+        print("❌ No retention policy. Set RETENTION_POLICY in .env or pass --policy")
+        return 1
+
+    print(f"\n🧹 Compacting {args.collection} ({describe_backend()})")
+    print("=" * 80)
+
+    preview = compact(rules, dry_run=True, collection_name=args.collection)
+    print(preview.summary())
+    if args.dry_run or not preview.total:
+        return 0
+
+    if not args.yes:
+        response = input(f"\n   Archive and delete {preview.total} memories? (y/N): ").strip().lower()
+        if response != "y":
+            print("   Aborted.")
+            return 0
+
+    last_report = time.perf_counter()
+
+    def progress(rule: str, done: int):
+        nonlocal last_report
+        if time.perf_counter() - last_report >= 5:
+            last_report = time.perf_counter()
+            print(f"   {rule}: {done} archived", file=sys.stderr)
+
+    report = compact(
+        rules, collection_name=args.collection, archive_dir=args.archive_dir,
+        batch_size=args.batch_size, progress=progress
+    )
+    print(f"\n✅ Compaction complete\n{report.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
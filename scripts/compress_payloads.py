@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Add previews and compress long bodies of memories stored before either existed
+
+Searches fetch only SEARCH_FIELDS (see src/memory_text.py); memories without
+a stored preview cost an extra body fetch per search hit until this has run.
+Bodies of TEXT_COMPRESS_MIN_CHARS or more are moved from `text` to
+`text_zstd`. Only points without a preview are read, so re-running is safe.
+
+Usage:
+    python scripts/compress_payloads.py --dry-run
+    python scripts/compress_payloads.py --batch-size 500
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import argparse
+
+from src.config import COLLECTION_NAME, TEXT_COMPRESS_MIN_CHARS
+from src.hivemind import get_qdrant_client, describe_backend
+from src.memory_text import text_fields, memory_text, TEXT_FIELDS
+
+
+def missing_preview():
+    from qdrant_client.models import Filter, IsEmptyCondition, PayloadField
+    return Filter(must=[IsEmptyCondition(is_empty=PayloadField(key="preview"))])
+
+
+def main():
+    from qdrant_client.models import SetPayloadOperation, SetPayload, DeletePayloadOperation, DeletePayload
+
+    parser = argparse.ArgumentParser(description="Add previews and compress long memory bodies")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Only count points to migrate")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    pending = client.count(collection_name=args.collection, count_filter=missing_preview(), exact=True).count
+
+    print(f"\n🗜️  Compacting payloads in {args.collection} ({describe_backend()})")
+    print("=" * 80)
+    print(f"   {pending} memories without a preview (compressing bodies >= {TEXT_COMPRESS_MIN_CHARS} chars)")
+    if args.dry_run:
+        return 0
+
+    started = time.perf_counter()
+    migrated = compressed = bytes_before = bytes_after = 0
+    last_report = started
+    offset = None
+    while pending:
+        points, offset = client.scroll(
+            collection_name=args.collection,
+            scroll_filter=missing_preview(),
+            limit=args.batch_size,
+            offset=offset,
+            with_payload=TEXT_FIELDS,
+            with_vectors=False
+        )
+        operations = []
+        for point in points:
+            text = memory_text(point.payload)
+            fields = text_fields(text)
+            if "text" in fields:
+                del fields["text"]
+                operations.append(SetPayloadOperation(set_payload=SetPayload(payload=fields, points=[point.id])))
+                continue
+            compressed += 1
+            bytes_before += len(text.encode("utf-8"))
+            bytes_after += len(fields["text_zstd"])
+            # Operations apply in order: text is dropped only after text_zstd is set
+            operations.append(SetPayloadOperation(set_payload=SetPayload(payload=fields, points=[point.id])))
+            operations.append(DeletePayloadOperation(
+                delete_payload=DeletePayload(keys=["text"], points=[point.id])
+            ))
+        if operations:
+            client.batch_update_points(collection_name=args.collection, update_operations=operations, wait=True)
+            migrated += len(points)
+        if time.perf_counter() - last_report >= 5:
+            last_report = time.perf_counter()
+            print(f"   {migrated}/{pending} ({migrated / (last_report - started):.0f}/s)", file=sys.stderr)
+        if offset is None:
+            break
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ Added previews to {migrated} memories in {elapsed:.1f}s")
+    if compressed:
+        print(f"   Compressed {compressed} bodies: {bytes_before / 1024 ** 2:.1f} MB → {bytes_after / 1024 ** 2:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Bulk-load memories into the hive-mind
+
+Streams documents from JSONL files, Markdown/text directories or shell
+history, chunks them, embeds batches on a worker pool and upserts them with
+the same deterministic IDs as store_memory (re-ingesting is idempotent).
+Progress is checkpointed, so an interrupted run resumes where it stopped
+(inside a large file too). Memory stays bounded: files are read and chunked
+READ_CHARS at a time, rows are batched as chunks are produced and at most
+2 x --workers batches are in flight.
+
+Usage:
+    python scripts/ingest.py notes/ --branch docs
+    python scripts/ingest.py export.jsonl --text-field body --type incident
+    python scripts/ingest.py ~/.zsh_history --format history --branch shell
+    python scripts/ingest.py big.jsonl --workers 8 --batch-size 256 --restart
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from src.config import COLLECTION_NAME, STORAGE_BACKEND
+from src.hivemind import (
+    get_qdrant_client, describe_backend, generate_point_id, memory_timestamps, epoch_from_timestamp
+)
+from src.embeddings import generate_embeddings, EmbeddingConfigError
+from src.overseer import check_overseer
+from src.chunking import iter_chunks
+from src.memory_text import text_fields, make_preview, CHUNK_FIELDS
+from src.change_feed import record_changes, change_row
+from src.related import link_related
+from src.branch_router import update_centroids
+from src.metrics import EMBEDDINGS_AVOIDED
+
+TEXT_EXTENSIONS = (".md", ".markdown", ".txt", ".rst")
+CHECKPOINT_DIR = os.path.expanduser("~/.local/share/jarvis-lmao/ingest")
+READ_CHARS = 1 << 20  # Characters read from a text file at a time
+
+
+@dataclass
+class Document:
+    """One source record, before chunking"""
+    pieces: Iterable[str]  # The text, possibly read lazily in parts
+    source: str
+    metadata: dict = field(default_factory=dict)
+    type: Optional[str] = None  # Default memory type for the source format
+
+
+# --- Sources -----------------------------------------------------------------
+
+def read_jsonl(path: str, text_field: str) -> Iterator[Document]:
+    """One document per line; other fields become payload metadata"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️  {path}:{line_number}: invalid JSON, skipped", file=sys.stderr)
+                continue
+            text = record.pop(text_field, None) if isinstance(record, dict) else None
+            if not isinstance(text, str):
+                continue
+            yield Document(pieces=[text], source=f"{path}:{line_number}", metadata=record)
+
+
+def read_file_pieces(file_path: str) -> Iterator[str]:
+    """A file's text, READ_CHARS at a time (opened on first use)"""
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        while True:
+            piece = f.read(READ_CHARS)
+            if not piece:
+                break
+            yield piece
+
+
+def read_text_files(path: str) -> Iterator[Document]:
+    """Every Markdown/text file under path, in sorted order"""
+    if os.path.isfile(path):
+        files = [path]
+    else:
+        files = []
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            files.extend(os.path.join(root, n) for n in sorted(names) if n.lower().endswith(TEXT_EXTENSIONS))
+    for file_path in files:
+        yield Document(
+            pieces=read_file_pieces(file_path), source=file_path, metadata={"title": os.path.basename(file_path)}
+        )
+
+
+def read_shell_history(path: str, min_chars: int = 8) -> Iterator[Document]:
+    """bash history or zsh extended history (": <epoch>:<elapsed>;<command>")"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        pending = ""
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            # zsh continues multi-line commands with a trailing backslash
+            if line.endswith("\\"):
+                pending += line[:-1] + "\n"
+                continue
+            line, pending = pending + line, ""
+            metadata = {}
+            if line.startswith(": ") and ";" in line:
+                header, line = line.split(";", 1)
+                try:
+                    epoch = int(header[2:].split(":")[0])
+                    metadata.update(memory_timestamps(epoch))
+                except ValueError:
+                    pass
+            command = line.strip()
+            if len(command) >= min_chars:
+                yield Document(pieces=[command], source=f"{path}:{line_number}", metadata=metadata)
+
+
+def detect_format(path: str) -> str:
+    if os.path.isdir(path):
+        return "text"
+    name = os.path.basename(path).lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if "history" in name:
+        return "history"
+    return "text"
+
+
+DEFAULT_TYPES = {"text": "document", "history": "shell_history"}
+
+def read_sources(paths: list[str], fmt: str, text_field: str) -> Iterator[Document]:
+    for path in paths:
+        source_format = detect_format(path) if fmt == "auto" else fmt
+        if source_format == "jsonl":
+            documents = read_jsonl(path, text_field)
+        elif source_format == "history":
+            documents = read_shell_history(path)
+        else:
+            documents = read_text_files(path)
+        for document in documents:
+            document.type = DEFAULT_TYPES.get(source_format)
+            yield document
+
+
+# --- Checkpointing -------------------------------------------------------------
+
+class Checkpoint:
+    """Position up to which source chunks are stored, saved atomically
+
+    The position is (documents fully stored, chunks of the next document
+    stored), so a run interrupted inside a large file resumes inside it.
+    Batches finish out of order, so the checkpoint only advances over the
+    contiguous prefix of completed batches.
+    """
+
+    def __init__(self, path: str, key: str):
+        self.path = path
+        self.key = key
+        self.position = (0, 0)
+        self.chunks_done = 0
+        self._completed: dict[int, tuple[tuple[int, int], int]] = {}  # batch seq -> (position, chunks)
+        self._next_seq = 0
+        self._lock = threading.Lock()
+
+    def load(self) -> tuple[int, int]:
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return (0, 0)
+        if state.get("key") != self.key:
+            return (0, 0)
+        self.position = (state["documents_done"], state.get("next_document_chunks_done", 0))
+        self.chunks_done = state.get("chunks_done", 0)
+        return self.position
+
+    def complete(self, seq: int, position: tuple[int, int], chunks: int):
+        with self._lock:
+            self._completed[seq] = (position, chunks)
+            while self._next_seq in self._completed:
+                done, count = self._completed.pop(self._next_seq)
+                self.position = max(self.position, done)
+                self.chunks_done += count
+                self._next_seq += 1
+
+    def save(self):
+        with self._lock:
+            state = {
+                "key": self.key,
+                "documents_done": self.position[0],
+                "next_document_chunks_done": self.position[1],
+                "chunks_done": self.chunks_done,
+                "updated_at": datetime.now().isoformat()
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def checkpoint_key(args) -> str:
+    """Identity of a run: same inputs and chunking resume the same checkpoint"""
+    identity = json.dumps({
+        "sources": [os.path.abspath(p) for p in args.sources],
+        "format": args.format,
+        "branch": args.branch,
+        "collection": COLLECTION_NAME,
+        "chunk_chars": args.chunk_chars,
+        "overlap": args.overlap
+    }, sort_keys=True)
+    return hashlib.sha256(identity.encode()).hexdigest()[:16]
+
+
+# --- Pipeline ----------------------------------------------------------------
+
+class Stats:
+    def __init__(self):
+        self.documents = 0
+        self.chunks = 0
+        self.unchanged = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, documents: int = 0, chunks: int = 0, unchanged: int = 0):
+        with self._lock:
+            self.documents += documents
+            self.chunks += chunks
+            self.unchanged += unchanged
+
+    def line(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        return (f"{self.documents} docs, {self.chunks} chunks in {elapsed:.1f}s "
+                f"({self.documents / elapsed:.1f} docs/s, {self.chunks / elapsed:.1f} chunks/s)")
+
+
+def store_batch(rows: list[dict]) -> int:
+    """Embed and upsert one batch (runs on a worker thread)
+
+    Chunks already stored (same text and branch, so same ID) only get their
+    metadata refreshed; they are not embedded again.
+
+    Returns:
+        Number of chunks that were already stored
+    """
+    from qdrant_client.models import PointStruct, SetPayloadOperation, SetPayload
+
+    client = get_qdrant_client()
+    texts = [row.pop("text") for row in rows]
+    ids = [generate_point_id(text, row["branch_id"]) for text, row in zip(texts, rows)]
+    stored = {record.id for record in client.retrieve(
+        collection_name=COLLECTION_NAME, ids=ids, with_payload=False, with_vectors=False
+    )}
+    updates = [
+        SetPayloadOperation(set_payload=SetPayload(payload=row, points=[point_id]))
+        for point_id, row in zip(ids, rows) if point_id in stored
+    ]
+    if updates:
+        client.batch_update_points(collection_name=COLLECTION_NAME, update_operations=updates, wait=True)
+
+    new = [(point_id, text, row) for point_id, text, row in zip(ids, texts, rows) if point_id not in stored]
+    if new:
+        vectors = generate_embeddings([text for _, text, _ in new])
+        points = [
+            PointStruct(id=point_id, vector=vector, payload={**text_fields(text), **row})
+            for (point_id, text, row), vector in zip(new, vectors)
+        ]
+        client.upsert(collection_name=COLLECTION_NAME, points=points, wait=True)
+        link_related(points, client, COLLECTION_NAME)
+        update_centroids(points)
+    EMBEDDINGS_AVOIDED.inc(len(updates), source="ingest")
+    refreshed = [(point_id, text, row) for point_id, text, row in zip(ids, texts, rows) if point_id in stored]
+    for op, batch in (("update", refreshed), ("store", new)):
+        record_changes(
+            op, [change_row(point_id, {**row, "preview": make_preview(text)}) for point_id, text, row in batch],
+            source="ingest"
+        )
+    return len(updates)
+
+
+def document_times(document: Document) -> dict:
+    """Timestamps shared by every chunk of a document"""
+    times = memory_timestamps()
+    if "timestamp" in document.metadata and "created_at" not in document.metadata:
+        # Keep created_at consistent with a timestamp the source supplied
+        times["created_at"] = epoch_from_timestamp(document.metadata["timestamp"]) or times["created_at"]
+    return times
+
+
+def document_chunks(document: Document, args) -> Iterator[tuple[int, str, bool]]:
+    """(index, chunk, whether the document has several chunks), as chunks are produced
+
+    One chunk is held back to know whether another follows.
+    """
+    held = None
+    for index, chunk in enumerate(iter_chunks(document.pieces, args.chunk_chars, args.overlap)):
+        if held is not None:
+            yield index - 1, held, True
+        held = chunk
+    if held is not None:
+        yield index, held, index > 0
+
+
+def build_row(chunk: str, index: int, several: bool, document: Document, times: dict, args) -> Optional[dict]:
+    """store_memory-shaped payload of one chunk, or None if the overseer rejects it"""
+    overseer_result = check_overseer(chunk, "store_memory")
+    if not overseer_result["safe"] and not args.allow_unsafe:
+        return None
+    row = {
+        "text": chunk,
+        "branch_id": args.branch,
+        **times,
+        "overseer_status": overseer_result["reason"],
+        "source": document.source,
+        **{key: value for key, value in document.metadata.items() if key not in CHUNK_FIELDS}
+    }
+    if several:
+        # Each part is a memory of its own; CHUNK_FIELDS would have search and
+        # metadata refreshes treat it as a chunk of a memory_points() memory
+        row["part_index"] = index
+    if args.type:
+        row["type"] = args.type
+    elif document.type:
+        row.setdefault("type", document.type)
+    return row
+
+
+def ingest(args) -> int:
+    client = get_qdrant_client()
+    if not client.collection_exists(COLLECTION_NAME):
+        print(f"❌ Collection '{COLLECTION_NAME}' does not exist. Run: python scripts/init_schema.py")
+        return 1
+
+    key = checkpoint_key(args)
+    checkpoint = Checkpoint(args.checkpoint or os.path.join(CHECKPOINT_DIR, f"{key}.json"), key)
+    if args.restart:
+        checkpoint.clear()
+    resume_documents, resume_chunks = checkpoint.load()
+    if resume_documents or resume_chunks:
+        print(f"↩️  Resuming after {resume_documents} documents and {resume_chunks} chunks of the next "
+              f"({checkpoint.path})")
+
+    stats = Stats()
+    in_flight = threading.BoundedSemaphore(args.workers * 2)
+    errors = []
+
+    def submit(executor, seq: int, rows: list[dict], position: tuple[int, int]):
+        in_flight.acquire()
+
+        def done(future):
+            in_flight.release()
+            if future.exception():
+                errors.append(future.exception())
+                return
+            checkpoint.complete(seq, position, len(rows))
+            stats.add(chunks=len(rows), unchanged=future.result())
+
+        executor.submit(store_batch, rows).add_done_callback(done)
+
+    print(f"📥 Ingesting into {COLLECTION_NAME} ({describe_backend()}), branch '{args.branch}'")
+    last_report = last_save = time.perf_counter()
+    seq = 0
+    rows: list[dict] = []
+    position = (resume_documents, resume_chunks)
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="jarvis-ingest") as executor:
+            for number, document in enumerate(read_sources(args.sources, args.format, args.text_field), 1):
+                if number <= resume_documents:
+                    continue
+                skip = resume_chunks if number == resume_documents + 1 else 0
+                times = document_times(document)
+                for index, chunk, several in document_chunks(document, args):
+                    if errors:
+                        break
+                    if index < skip:
+                        continue
+                    row = build_row(chunk, index, several, document, times, args)
+                    if row is None:
+                        stats.rejected += 1
+                    else:
+                        rows.append(row)
+                    position = (number - 1, index + 1)
+
+                    if len(rows) >= args.batch_size:
+                        submit(executor, seq, rows, position)
+                        seq, rows = seq + 1, []
+
+                    now = time.perf_counter()
+                    if now - last_save >= args.checkpoint_every:
+                        checkpoint.save()
+                        last_save = now
+                    if now - last_report >= 5:
+                        print(f"   {stats.line()}", file=sys.stderr)
+                        last_report = now
+                if errors:
+                    break
+                position = (number, 0)
+                stats.add(documents=1)
+
+            if rows and not errors:
+                submit(executor, seq, rows, position)
+    except KeyboardInterrupt:
+        # The executor has drained in-flight batches; record them
+        checkpoint.save()
+        raise
+
+    if errors:
+        checkpoint.save()
+        print(f"❌ Ingestion failed: {errors[0]}")
+        print(f"   Progress saved; re-run the same command to resume ({checkpoint.path})")
+        return 1
+
+    checkpoint.clear()
+    print(f"✅ {stats.line()}")
+    if stats.unchanged:
+        print(f"   {stats.unchanged} chunks were already stored (metadata refreshed, embeddings skipped)")
+    if stats.rejected:
+        print(f"   {stats.rejected} chunks rejected by the overseer (--allow-unsafe to keep them)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load memories into the Jarvis hive-mind")
+    parser.add_argument("sources", nargs="+", help="JSONL files, Markdown/text files or directories, shell history")
+    parser.add_argument("--format", choices=["auto", "jsonl", "text", "history"], default="auto")
+    parser.add_argument("--branch", default="main", help="branch_id for every memory (default: main)")
+    parser.add_argument("--type", help="Memory type (default: document / shell_history / from JSONL)")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the text")
+    parser.add_argument("--chunk-chars", type=int, default=2000, help="Max characters per memory")
+    parser.add_argument("--overlap", type=int, default=200, help="Characters shared by adjacent chunks")
+    parser.add_argument("--batch-size", type=int, default=128, help="Chunks per embedding/upsert batch")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel embedding/upsert batches")
+    parser.add_argument("--allow-unsafe", action="store_true", help="Store chunks the overseer flags")
+    parser.add_argument("--checkpoint", help=f"Checkpoint file (default: {CHECKPOINT_DIR}/<run>.json)")
+    parser.add_argument("--checkpoint-every", type=float, default=10.0, help="Seconds between checkpoint saves")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    if STORAGE_BACKEND == "embedded" and args.workers > 1:
+        # Local mode serializes every call; extra workers only overlap embedding
+        print("ℹ️  Embedded storage: upserts are serialized, workers overlap embedding only", file=sys.stderr)
+
+    try:
+        return ingest(args)
+    except EmbeddingConfigError as e:
+        print(f"❌ {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted; re-run the same command to resume")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,43 +5,37 @@ Initialize Qdrant collection for Jarvis Hive-Mind
 
 import os
 import sys
-from dotenv import load_dotenv
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from dotenv import load_dotenv
 load_dotenv()
 
 try:
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import Distance, VectorParams
+    import qdrant_client
 except ImportError:
     print("Error: qdrant-client not installed. Run: pip install qdrant-client")
     exit(1)
 
-# Configuration
-QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
-QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", None)
-COLLECTION_NAME = os.getenv("COLLECTION_NAME", "jarvis_hivemind")
-EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "ollama").lower()
-
-# Vector dimensions based on embedding provider
-VECTOR_DIMENSIONS = {
-    "ollama": 768,  # nomic-embed-text default
-    "openai": 1536  # text-embedding-3-small
-}
+from src.config import COLLECTION_NAME, EMBEDDING_PROVIDER, BRANCH_PARTITIONING
+from src.hivemind import create_qdrant_client, create_collection_schema, describe_backend
+from src.embeddings import get_vector_size, EmbeddingConfigError
 
 def main():
     """Initialize or recreate the Qdrant collection"""
 
-    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+    # Not get_qdrant_client(): that auto-creates the collection in embedded mode
+    client = create_qdrant_client()
 
     print(f"🔧 Initializing Jarvis Hive-Mind schema...")
-    print(f"   Qdrant URL: {QDRANT_URL}")
+    print(f"   Storage: {describe_backend()}")
     print(f"   Collection: {COLLECTION_NAME}")
     print(f"   Embedding: {EMBEDDING_PROVIDER}")
 
     # Get vector dimension
-    vector_size = VECTOR_DIMENSIONS.get(EMBEDDING_PROVIDER)
-    if not vector_size:
-        print(f"❌ Unknown embedding provider: {EMBEDDING_PROVIDER}")
+    try:
+        vector_size = get_vector_size()
+    except EmbeddingConfigError as e:
+        print(f"❌ {e}")
         exit(1)
 
     # Check if collection exists
@@ -61,49 +55,11 @@ def main():
     except Exception:
         print(f"   Collection doesn't exist, creating new...")
 
-    # Create collection with hive-mind schema
-    client.create_collection(
-        collection_name=COLLECTION_NAME,
-        vectors_config=VectorParams(
-            size=vector_size,
-            distance=Distance.COSINE
-        )
-    )
-
-    # Create payload indexes for efficient filtering
-    print("\n📋 Creating payload indexes...")
-
-    # Index for branch filtering
-    client.create_payload_index(
-        collection_name=COLLECTION_NAME,
-        field_name="branch_id",
-        field_schema="keyword"
-    )
-    print("   ✓ branch_id index")
-
-    # Index for memory type filtering
-    client.create_payload_index(
-        collection_name=COLLECTION_NAME,
-        field_name="type",
-        field_schema="keyword"
-    )
-    print("   ✓ type index")
-
-    # Index for skill name filtering
-    client.create_payload_index(
-        collection_name=COLLECTION_NAME,
-        field_name="skill_name",
-        field_schema="keyword"
-    )
-    print("   ✓ skill_name index")
-
-    # Index for timestamp sorting
-    client.create_payload_index(
-        collection_name=COLLECTION_NAME,
-        field_name="timestamp",
-        field_schema="datetime"
-    )
-    print("   ✓ timestamp index")
+    # Create collection with hive-mind schema and payload indexes for efficient filtering
+    print("\n📋 Creating collection and payload indexes...")
+    for field_name in create_collection_schema(client, vector_size):
+        layout = f" ({BRANCH_PARTITIONING})" if field_name == "branch_id" else ""
+        print(f"   ✓ {field_name} index{layout}")
 
     print(f"\n✅ Jarvis Hive-Mind schema initialized successfully!")
     print(f"\n📊 Collection details:")
@@ -1,6 +1,23 @@
 #!/usr/bin/env python3
 """
 Inspect Qdrant collection for duplicates
+
+Streams the whole collection once, keeping only small fixed-size
+fingerprints per point (no vectors or texts):
+  - exact duplicates: hash of whitespace/case-normalized text
+  - near duplicates: random-hyperplane SimHash of the vector, split into
+    bands; points sharing a band are candidates, confirmed by exact cosine
+    similarity on a second, candidates-only fetch
+
+Duplicates are only grouped within a branch unless --cross-branch is given
+(merge_branches copies across branches on purpose). Nothing is changed
+unless --delete or --consolidate is passed; both keep the oldest memory of
+each group.
+
+Usage:
+    python scripts/inspect_collection.py
+    python scripts/inspect_collection.py --threshold 0.95 --branch infra
+    python scripts/inspect_collection.py --consolidate --yes
 """
 
 import sys
@@ -10,72 +27,313 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from dotenv import load_dotenv
 load_dotenv()
 
-from src.server import qdrant_client, COLLECTION_NAME
 import json
+import time
+import hashlib
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+from src.config import COLLECTION_NAME
+from src.hivemind import get_qdrant_client, memory_conditions
+from src.memory_text import memory_text, TEXT_FIELDS
+
+
+class Fingerprints:
+    """Per-point fingerprints, appended page by page"""
+
+    def __init__(self, dim: int, bands: int, band_bits: int, seed: int):
+        rng = np.random.default_rng(seed)
+        self.hyperplanes = rng.standard_normal((bands * band_bits, dim)).astype(np.float32)
+        self.bands = bands
+        self.band_bits = band_bits
+        self.weights = (1 << np.arange(band_bits, dtype=np.uint32)).astype(np.uint32)
+        self.ids: list = []
+        self.branches: dict[str, int] = {}
+        self._content, self._branch, self._time, self._bands = [], [], [], []
+
+    def add_page(self, points):
+        if points[0].vector is None:
+            # --exact-only scans skip vectors
+            self._bands.append(np.zeros((len(points), self.bands), dtype=np.uint32))
+        else:
+            vectors = np.asarray([p.vector for p in points], dtype=np.float32)
+            bits = (vectors @ self.hyperplanes.T) > 0
+            bits = bits.reshape(len(points), self.bands, self.band_bits).astype(np.uint32)
+            self._bands.append(bits @ self.weights)
+
+        content = np.empty(len(points), dtype=np.uint64)
+        branch = np.empty(len(points), dtype=np.int32)
+        created = np.empty(len(points), dtype=np.float64)
+        for i, point in enumerate(points):
+            payload = point.payload or {}
+            normalized = " ".join(memory_text(payload).split()).casefold()
+            content[i] = int.from_bytes(hashlib.blake2b(normalized.encode(), digest_size=8).digest(), "little")
+            branch[i] = self.branches.setdefault(payload.get("branch_id", "unknown"), len(self.branches))
+            try:
+                created[i] = datetime.fromisoformat(payload["timestamp"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                created[i] = np.inf
+            self.ids.append(point.id)
+        self._content.append(content)
+        self._branch.append(branch)
+        self._time.append(created)
+
+    def finish(self):
+        self.content = np.concatenate(self._content) if self._content else np.empty(0, np.uint64)
+        self.branch = np.concatenate(self._branch) if self._branch else np.empty(0, np.int32)
+        self.created = np.concatenate(self._time) if self._time else np.empty(0, np.float64)
+        self.band_keys = np.concatenate(self._bands) if self._bands else np.empty((0, self.bands), np.uint32)
+        self._content = self._branch = self._time = self._bands = None
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent: dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent.get(x, x)
+        return root
+
+    def union(self, a: int, b: int):
+        self.parent.setdefault(a, a)
+        self.parent.setdefault(b, b)
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+    def groups(self) -> list[list[int]]:
+        grouped: dict[int, list[int]] = {}
+        for x in list(self.parent):
+            grouped.setdefault(self.find(x), []).append(x)
+        return [sorted(g) for g in grouped.values() if len(g) > 1]
+
+
+def runs_of_equal(keys: np.ndarray):
+    """(order, starts, ends) of runs with 2+ equal keys"""
+    order = np.argsort(keys, kind="stable")
+    ordered = keys[order]
+    boundaries = np.flatnonzero(ordered[1:] != ordered[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    ends = np.concatenate((boundaries, [len(keys)]))
+    multi = (ends - starts) > 1
+    return order, starts[multi], ends[multi]
+
+
+def scope_keys(fp: Fingerprints, values: np.ndarray, cross_branch: bool) -> np.ndarray:
+    """Combine a fingerprint with the branch so groups never span branches"""
+    if cross_branch:
+        return values.astype(np.uint64)
+    return values.astype(np.uint64) ^ (fp.branch.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15))
+
+
+def exact_groups(fp: Fingerprints, cross_branch: bool, uf: UnionFind) -> int:
+    order, starts, ends = runs_of_equal(scope_keys(fp, fp.content, cross_branch))
+    for start, end in zip(starts, ends):
+        first = int(order[start])
+        for other in order[start + 1:end]:
+            uf.union(first, int(other))
+    return int((ends - starts).sum() - len(starts))
+
+
+def near_candidates(fp: Fingerprints, cross_branch: bool) -> set[tuple[int, int]]:
+    """Pairs sharing at least one SimHash band (star-linked to each bucket's first point)"""
+    pairs = set()
+    for band in range(fp.bands):
+        keys = scope_keys(fp, fp.band_keys[:, band].astype(np.uint64) | np.uint64(band << 32), cross_branch)
+        order, starts, ends = runs_of_equal(keys)
+        for start, end in zip(starts, ends):
+            first = int(order[start])
+            for other in order[start + 1:end]:
+                other = int(other)
+                if fp.content[first] != fp.content[other]:
+                    pairs.add((min(first, other), max(first, other)))
+    return pairs
+
+
+def confirm_near(client, collection: str, fp: Fingerprints, pairs: set, threshold: float,
+                 uf: UnionFind, chunk_pairs: int = 20000, batch_size: int = 512) -> int:
+    """Fetch candidate vectors and keep pairs with cosine >= threshold
+
+    Works through the pairs in chunks so only one chunk's vectors are held.
+    """
+    ordered = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+    confirmed = 0
+    for start in range(0, len(ordered), chunk_pairs):
+        chunk = ordered[start:start + chunk_pairs]
+        needed = np.unique(chunk)
+        matrix = np.zeros((len(needed), fp.hyperplanes.shape[1]), dtype=np.float32)
+        for batch_start in range(0, len(needed), batch_size):
+            batch = needed[batch_start:batch_start + batch_size]
+            by_id = {p.id: p.vector for p in client.retrieve(
+                collection_name=collection, ids=[fp.ids[i] for i in batch],
+                with_payload=False, with_vectors=True
+            )}
+            for offset, i in enumerate(batch):
+                if fp.ids[i] in by_id:
+                    matrix[batch_start + offset] = by_id[fp.ids[i]]
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+
+        rows = np.searchsorted(needed, chunk)
+        similarity = np.einsum("ij,ij->i", matrix[rows[:, 0]], matrix[rows[:, 1]])
+        for a, b in chunk[similarity >= threshold]:
+            uf.union(int(a), int(b))
+            confirmed += 1
+    return confirmed
+
+
+def keeper_of(fp: Fingerprints, group: list[int]) -> int:
+    """Oldest memory of a group (ties: lowest index)"""
+    return min(group, key=lambda i: (fp.created[i], i))
+
+
+def apply_changes(client, collection: str, fp: Fingerprints, groups: list[list[int]],
+                  consolidate: bool, batch_size: int) -> int:
+    from qdrant_client.models import PointIdsList, FilterSelector, Filter, FieldCondition, MatchAny
+
+    branch_names = {index: name for name, index in fp.branches.items()}
+    doomed = []
+    for group in groups:
+        keeper = keeper_of(fp, group)
+        others = [i for i in group if i != keeper]
+        if consolidate:
+            client.set_payload(
+                collection_name=collection,
+                payload={
+                    "duplicates_merged": len(others),
+                    "duplicate_branches": sorted({branch_names[int(fp.branch[i])] for i in group})
+                },
+                points=[fp.ids[keeper]]
+            )
+        doomed.extend(fp.ids[i] for i in others)
+
+    for start in range(0, len(doomed), batch_size):
+        batch = doomed[start:start + batch_size]
+        client.delete(collection_name=collection, points_selector=PointIdsList(points=batch))
+        # With the extra chunks of long memories
+        client.delete(
+            collection_name=collection,
+            points_selector=FilterSelector(filter=Filter(must=[
+                FieldCondition(key="parent_id", match=MatchAny(any=[str(point_id) for point_id in batch]))
+            ]))
+        )
+    return len(doomed)
+
 
 def main():
-    """Inspect all points in collection"""
+    parser = argparse.ArgumentParser(description="Find exact and near-duplicate memories")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--branch", action="append", default=[], help="Only scan this branch_id (repeatable)")
+    parser.add_argument("--threshold", type=float, default=0.97, help="Cosine similarity for near duplicates")
+    parser.add_argument("--exact-only", action="store_true", help="Skip near-duplicate detection")
+    parser.add_argument("--cross-branch", action="store_true", help="Group duplicates across branches")
+    parser.add_argument("--bands", type=int, default=16, help="SimHash bands (more = higher recall)")
+    parser.add_argument("--band-bits", type=int, default=24, help="Hyperplanes per band (more = fewer candidates)")
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--show", type=int, default=10, help="Groups to print")
+    parser.add_argument("--output", help="Write all groups as JSON")
+    parser.add_argument("--delete", action="store_true", help="Delete all but the oldest memory per group")
+    parser.add_argument("--consolidate", action="store_true",
+                        help="Like --delete, recording merged count/branches on the kept memory")
+    parser.add_argument("--yes", action="store_true", help="Do not ask before deleting")
+    args = parser.parse_args()
+
+    from qdrant_client.models import Filter, FieldCondition, MatchAny
+
+    client = get_qdrant_client()
+    collection = client.get_collection(collection_name=args.collection)
+    dim = collection.config.params.vectors.size
+    # Whole memories only: chunks of a long memory are not duplicates of it
+    scroll_filter = Filter(must=memory_conditions())
+    if args.branch:
+        scroll_filter.must.append(FieldCondition(key="branch_id", match=MatchAny(any=args.branch)))
+
     print("\n🔍 Inspecting Collection")
     print("=" * 80)
-
-    # Get collection info
-    collection = qdrant_client.get_collection(collection_name=COLLECTION_NAME)
     print(f"Total points: {collection.points_count}\n")
 
-    # Scroll through all points
-    scroll_result = qdrant_client.scroll(
-        collection_name=COLLECTION_NAME,
-        limit=100,
-        with_vectors=False,
-        with_payload=True
-    )
+    started = time.perf_counter()
+    fp = Fingerprints(dim, args.bands, args.band_bits, args.seed)
+    offset = None
+    last_report = started
+    while True:
+        points, offset = client.scroll(
+            collection_name=args.collection,
+            scroll_filter=scroll_filter,
+            limit=args.page_size,
+            offset=offset,
+            with_payload=[*TEXT_FIELDS, "branch_id", "timestamp"],
+            with_vectors=not args.exact_only
+        )
+        if points:
+            fp.add_page(points)
+        if time.perf_counter() - last_report >= 5:
+            last_report = time.perf_counter()
+            print(f"   scanned {len(fp.ids)} points ({len(fp.ids) / (last_report - started):.0f}/s)",
+                  file=sys.stderr)
+        if offset is None:
+            break
+    fp.finish()
+    scanned = time.perf_counter() - started
 
-    points = scroll_result[0]
+    uf = UnionFind()
+    exact = exact_groups(fp, args.cross_branch, uf)
+    near = 0
+    candidates = set()
+    if not args.exact_only:
+        candidates = near_candidates(fp, args.cross_branch)
+        near = confirm_near(client, args.collection, fp, candidates, args.threshold, uf)
+    groups = sorted(uf.groups(), key=len, reverse=True)
+    redundant = sum(len(g) - 1 for g in groups)
 
-    # Track IDs and text content
-    id_count = {}
-    text_count = {}
-
-    print("All points:")
-    print("-" * 80)
-    for point in points:
-        point_id = point.id
-        text = point.payload.get('text', '')
-        branch = point.payload.get('branch_id', 'unknown')
-        timestamp = point.payload.get('timestamp', 'N/A')
-
-        # Count occurrences
-        id_count[point_id] = id_count.get(point_id, 0) + 1
-        text_preview = text[:60]
-        text_count[text_preview] = text_count.get(text_preview, 0) + 1
-
-        print(f"ID: {point_id}")
-        print(f"  Branch: {branch}")
-        print(f"  Text: {text_preview}...")
-        print(f"  Timestamp: {timestamp}")
-        print()
-
-    # Find duplicates
-    print("=" * 80)
+    print(f"Scanned {len(fp.ids)} points in {scanned:.1f}s ({len(fp.ids) / scanned if scanned else 0:.0f}/s), "
+          f"analyzed in {time.perf_counter() - started - scanned:.1f}s")
     print("\n🔎 Duplicate Analysis:")
     print("-" * 80)
+    print(f"Exact duplicates:  {exact}")
+    if not args.exact_only:
+        print(f"Near duplicates:   {near} confirmed of {len(candidates)} LSH candidate pairs "
+              f"(cosine >= {args.threshold})")
+    print(f"Groups: {len(groups)}, redundant memories: {redundant}")
+
+    if groups and args.show:
+        texts = {p.id: memory_text(p.payload) for p in client.retrieve(
+            collection_name=args.collection,
+            ids=[fp.ids[i] for g in groups[:args.show] for i in g],
+            with_payload=TEXT_FIELDS
+        )}
+        branch_names = {index: name for name, index in fp.branches.items()}
+        for group in groups[:args.show]:
+            keeper = keeper_of(fp, group)
+            print(f"\n  {len(group)} memories:")
+            for i in group:
+                marker = "keep" if i == keeper else "dup "
+                print(f"    [{marker}] {fp.ids[i]} ({branch_names[int(fp.branch[i])]}) "
+                      f"{texts.get(fp.ids[i], '')[:60]!r}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([
+                {"keep": fp.ids[keeper_of(fp, g)], "duplicates": [fp.ids[i] for i in g if i != keeper_of(fp, g)]}
+                for g in groups
+            ], f, indent=2)
+        print(f"\n✓ Groups written to {args.output}")
 
-    duplicate_ids = {k: v for k, v in id_count.items() if v > 1}
-    duplicate_texts = {k: v for k, v in text_count.items() if v > 1}
-
-    if duplicate_ids:
-        print(f"\n⚠️  Found {len(duplicate_ids)} duplicate IDs:")
-        for point_id, count in duplicate_ids.items():
-            print(f"  ID {point_id}: appears {count} times")
-    else:
-        print("\n✓ No duplicate IDs found")
-
-    if duplicate_texts:
-        print(f"\n⚠️  Found {len(duplicate_texts)} duplicate texts:")
-        for text, count in duplicate_texts.items():
-            print(f"  '{text}...': appears {count} times")
-    else:
-        print("\n✓ No duplicate texts found")
+    if (args.delete or args.consolidate) and redundant:
+        if not args.yes:
+            response = input(f"\n   Delete {redundant} duplicate memories? (y/N): ").strip().lower()
+            if response != "y":
+                print("   Aborted.")
+                return
+        deleted = apply_changes(client, args.collection, fp, groups, args.consolidate, batch_size=1000)
+        print(f"\n✅ Deleted {deleted} duplicates{' (kept memories annotated)' if args.consolidate else ''}")
 
     print("\n" + "=" * 80)
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Show or migrate the branch_id index layout of an existing collection
+
+    index   plain keyword index (default)
+    tenant  keyword index with is_tenant - Qdrant groups each branch's points
+            together, so branch-filtered searches and merges read only them
+
+New collections follow BRANCH_PARTITIONING (init_schema.py); this rebuilds
+the index in place for collections created before. Points are untouched.
+
+Usage:
+    python scripts/partition_branches.py                  # show current layout
+    python scripts/partition_branches.py --mode tenant
+    python scripts/partition_branches.py --mode index     # roll back
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import argparse
+
+from src.config import COLLECTION_NAME, BRANCH_PARTITIONING, STORAGE_BACKEND
+from src.hivemind import (
+    create_qdrant_client, describe_backend, get_branch_partitioning, set_branch_partitioning, BRANCH_PARTITIONINGS
+)
+
+
+def wait_for_optimizer(client, collection_name: str, timeout: float = 3600):
+    """Block until the collection is green (segments rebuilt)"""
+    from qdrant_client.models import CollectionStatus
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if client.get_collection(collection_name=collection_name).status == CollectionStatus.GREEN:
+            return True
+        time.sleep(1)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or migrate the branch_id index layout")
+    parser.add_argument("--mode", choices=BRANCH_PARTITIONINGS, help="Target layout (omit to only show)")
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--yes", action="store_true", help="Do not ask for confirmation")
+    args = parser.parse_args()
+
+    if STORAGE_BACKEND == "embedded":
+        print("ℹ️  Embedded storage keeps no payload indexes; branch partitioning only applies to a Qdrant server")
+        return 0
+
+    client = create_qdrant_client()
+    collection = client.get_collection(collection_name=args.collection)
+    current = get_branch_partitioning(client, args.collection)
+
+    print(f"\n🗂️  {args.collection} ({describe_backend()})")
+    print("=" * 80)
+    print(f"   Points: {collection.points_count}")
+    print(f"   branch_id index: {current or 'none'}")
+    print(f"   BRANCH_PARTITIONING: {BRANCH_PARTITIONING}")
+
+    if not args.mode:
+        return 0
+    if current == args.mode:
+        print(f"\n✅ Already '{args.mode}'")
+        return 0
+
+    if not args.yes:
+        response = input(f"\n   Rebuild branch_id index as '{args.mode}'? (y/N): ").strip().lower()
+        if response != "y":
+            print("   Aborted.")
+            return 0
+
+    started = time.perf_counter()
+    set_branch_partitioning(client, args.mode, args.collection)
+    print(f"   ✓ branch_id index rebuilt ({time.perf_counter() - started:.1f}s), waiting for segments...")
+    if not wait_for_optimizer(client, args.collection):
+        print("⚠️  Optimizer still running; searches work meanwhile")
+    print(f"\n✅ branch_id is now '{args.mode}' ({time.perf_counter() - started:.1f}s)")
+    if BRANCH_PARTITIONING != args.mode:
+        print(f"   Set BRANCH_PARTITIONING={args.mode} in .env so init_schema.py creates the same layout")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Aggregate captured tool call profiles (see src/profiler.py)
+
+Usage:
+    python scripts/profile_report.py                 # everything in PROFILE_DIR
+    python scripts/profile_report.py --tool search_memory --top 15
+    python scripts/profile_report.py --dir /tmp/profiles --sort cumulative
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import io
+import json
+import pstats
+import argparse
+from collections import Counter, defaultdict
+
+from src.config import PROFILE_DIR
+
+
+def load_captures(directory: str, tool: str = None) -> list[dict]:
+    captures = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name)) as f:
+            record = json.load(f)
+        if tool is None or record["tool"] == tool:
+            captures.append(record)
+    return captures
+
+
+def print_phases(captures: list[dict]):
+    """Mean and max milliseconds per phase, per tool"""
+    by_tool = defaultdict(list)
+    for record in captures:
+        by_tool[record["tool"]].append(record)
+
+    print("\n⏱️  Phase breakdown (mean ms per call)")
+    print("=" * 80)
+    for tool, records in sorted(by_tool.items()):
+        durations = sorted(r["duration_ms"] for r in records)
+        print(f"\n{tool}: {len(records)} captures, "
+              f"median {durations[len(durations) // 2]:.1f}ms, max {durations[-1]:.1f}ms")
+        totals = Counter()
+        for record in records:
+            totals.update(record["phases_ms"])
+        mean_total = sum(durations) / len(durations)
+        for phase, total in totals.most_common():
+            mean = total / len(records)
+            share = mean / mean_total if mean_total else 0
+            print(f"  {phase:12} {mean:10.2f}ms  {share:6.1%}")
+
+
+def print_cprofile(directory: str, captures: list[dict], sort: str, top: int):
+    """Merge every cProfile capture and print the top functions"""
+    paths = [os.path.join(directory, r["profile"]) for r in captures if r.get("profile")]
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
+        return
+    output = io.StringIO()
+    stats = pstats.Stats(paths[0], stream=output)
+    for path in paths[1:]:
+        stats.add(path)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+    print(f"\n🔬 cProfile hotspots across {len(paths)} sampled calls (by {sort})")
+    print("=" * 80)
+    # Skip pstats' header noise, keep the table
+    lines = output.getvalue().splitlines()
+    start = next((i for i, line in enumerate(lines) if line.strip().startswith("ncalls")), 0)
+    print("\n".join(lines[start:]).rstrip())
+
+
+def print_stacks(directory: str, captures: list[dict], top: int):
+    """Self and inclusive sample counts from the stack-sampled slow calls"""
+    self_samples, inclusive = Counter(), Counter()
+    total = 0
+    for record in captures:
+        path = os.path.join(directory, record["stacks"]) if record.get("stacks") else None
+        if not path or not os.path.exists(path):
+            continue
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip().rpartition(" ")
+                frames = stack.split(";")
+                count = int(count)
+                total += count
+                self_samples[frames[-1]] += count
+                for frame in set(frames):
+                    inclusive[frame] += count
+    if not total:
+        return
+
+    print(f"\n🐢 Slow call stack samples ({total} samples)")
+    print("=" * 80)
+    print(f"{'self':>7} {'incl':>7}  frame")
+    for frame, count in self_samples.most_common(top):
+        print(f"{count / total:7.1%} {inclusive[frame] / total:7.1%}  {frame}")
+    print("\nFlamegraph: cat *.folded | flamegraph.pl > slow.svg")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate Jarvis tool call profiles")
+    parser.add_argument("--dir", default=PROFILE_DIR, help=f"Capture directory (default: {PROFILE_DIR})")
+    parser.add_argument("--tool", help="Only include this tool")
+    parser.add_argument("--top", type=int, default=20, help="Rows per hotspot table")
+    parser.add_argument("--sort", default="tottime", choices=["tottime", "cumulative", "ncalls"],
+                        help="cProfile sort key")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        print(f"❌ No profiles in {args.dir} (set PROFILE_SAMPLE_RATE or PROFILE_SLOW_MS)")
+        return 1
+
+    captures = load_captures(args.dir, args.tool)
+    if not captures:
+        print(f"❌ No captures{f' for {args.tool}' if args.tool else ''} in {args.dir}")
+        return 1
+
+    print_phases(captures)
+    print_cprofile(args.dir, captures, args.sort, args.top)
+    print_stacks(args.dir, captures, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
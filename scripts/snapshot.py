@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Export / import the hive-mind collection without re-embedding
+
+A snapshot is a directory:
+    manifest.json        collection, vector size, point count, filters
+    vectors.npy          float32 (count x dim), row i belongs to payload line i;
+                         load with np.load(path, mmap_mode="r")
+    payloads.jsonl.gz    {"id": ..., "payload": {...}} per line
+
+Both directions stream in pages, so collections larger than RAM work:
+export pages through scroll() appending to the files, import memory-maps
+the vectors and upserts batches on a worker pool.
+
+Usage:
+    python scripts/snapshot.py export backups/2024-06-01
+    python scripts/snapshot.py export backups/infra --branch infra --branch terraform
+    python scripts/snapshot.py import backups/2024-06-01 --workers 8
+    python scripts/snapshot.py import backups/infra --collection jarvis_restore
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import COLLECTION_NAME
+from src.hivemind import get_qdrant_client, create_collection_schema, describe_backend
+from src.cold_store import SnapshotWriter, SnapshotError, read_manifest, read_batches
+
+
+def branch_filter(branches: list[str]):
+    from qdrant_client.models import Filter, FieldCondition, MatchAny
+
+    if not branches:
+        return None
+    return Filter(must=[FieldCondition(key="branch_id", match=MatchAny(any=branches))])
+
+
+def export_snapshot(args) -> int:
+    client = get_qdrant_client()
+    collection = client.get_collection(collection_name=args.collection)
+    dim = collection.config.params.vectors.size
+
+    print(f"📤 Exporting {args.collection} ({describe_backend()}) to {args.path}")
+    started = time.perf_counter()
+    writer = SnapshotWriter(args.path, dim, compress_level=args.compress_level)
+    offset = None
+    last_report = started
+    while True:
+        points, offset = client.scroll(
+            collection_name=args.collection,
+            scroll_filter=branch_filter(args.branch),
+            limit=args.page_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        writer.append(points)
+        if time.perf_counter() - last_report >= 5:
+            last_report = time.perf_counter()
+            print(f"   {writer.count} points ({writer.count / (last_report - started):.0f}/s)", file=sys.stderr)
+        if offset is None:
+            break
+    size_mb = writer.size_bytes() / 1024 ** 2
+    rows = writer.count
+    writer.close(
+        collection=args.collection,
+        distance=str(collection.config.params.vectors.distance),
+        branches=args.branch or None
+    )
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Exported {rows} points ({size_mb:.1f} MB) in {elapsed:.1f}s "
+          f"({rows / elapsed if elapsed else 0:.0f} points/s)")
+    return 0
+
+
+def import_snapshot(args) -> int:
+    from qdrant_client.models import Batch
+
+    try:
+        manifest = read_manifest(args.path)
+    except SnapshotError as e:
+        print(f"❌ {e}")
+        return 1
+
+    client = get_qdrant_client()
+    dim = manifest["vector_size"]
+    if client.collection_exists(args.collection):
+        existing = client.get_collection(collection_name=args.collection).config.params.vectors.size
+        if existing != dim:
+            print(f"❌ {args.collection} has {existing}D vectors, snapshot has {dim}D")
+            return 1
+    else:
+        create_collection_schema(client, dim, collection_name=args.collection)
+        print(f"   Created {args.collection} ({dim}D)")
+
+    print(f"📥 Importing {manifest['count']} points from {args.path} into {args.collection} ({describe_backend()})")
+    started = time.perf_counter()
+    in_flight = threading.BoundedSemaphore(args.workers * 2)
+    errors = []
+    imported = 0
+    lock = threading.Lock()
+
+    def upsert(ids, vectors, payloads):
+        nonlocal imported
+        try:
+            client.upsert(
+                collection_name=args.collection,
+                points=Batch(ids=ids, vectors=vectors, payloads=payloads),
+                wait=True
+            )
+            with lock:
+                imported += len(ids)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            in_flight.release()
+
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="jarvis-import") as executor:
+        for ids, vectors, payloads in read_batches(args.path, args.batch_size, args.branch):
+            if errors:
+                break
+            in_flight.acquire()
+            executor.submit(upsert, ids, vectors, payloads)
+
+    elapsed = time.perf_counter() - started
+    if errors:
+        print(f"❌ Import failed after {imported} points: {errors[0]}")
+        print("   Upserts are idempotent; re-run the same command to finish")
+        return 1
+    print(f"✅ Imported {imported} points in {elapsed:.1f}s ({imported / elapsed if elapsed else 0:.0f} points/s)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export/import the Jarvis hive-mind without re-embedding")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write a snapshot directory")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--page-size", type=int, default=1000, help="Points per scroll page")
+    export_parser.add_argument("--compress-level", type=int, default=6, help="gzip level for payloads")
+
+    import_parser = subparsers.add_parser("import", help="Upsert a snapshot directory")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--batch-size", type=int, default=512, help="Points per upsert")
+    import_parser.add_argument("--workers", type=int, default=4, help="Parallel upserts")
+
+    for sub in (export_parser, import_parser):
+        sub.add_argument("--collection", default=COLLECTION_NAME, help=f"Collection (default: {COLLECTION_NAME})")
+        sub.add_argument("--branch", action="append", default=[], help="Only this branch_id (repeatable)")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        return export_snapshot(args)
+    return import_snapshot(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,13 +10,10 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from dotenv import load_dotenv
 load_dotenv()
 
-from src.server import (
-    qdrant_client,
-    generate_embedding,
-    generate_point_id,
-    check_overseer,
-    COLLECTION_NAME
-)
+from src.config import COLLECTION_NAME
+from src.hivemind import get_qdrant_client, generate_point_id
+from src.embeddings import generate_embedding
+from src.overseer import check_overseer
 from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
 from datetime import datetime
 import json
@@ -65,7 +62,7 @@ def test_store_memory():
         }
     )
 
-    qdrant_client.upsert(collection_name=COLLECTION_NAME, points=[point1])
+    get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=[point1])
     print(f"✓ Stored memory 1: ID {point_id1}")
     print(f"  Branch: {branch1}")
     print(f"  Text: {text1[:50]}...")
@@ -92,7 +89,7 @@ def test_store_memory():
         }
     )
 
-    qdrant_client.upsert(collection_name=COLLECTION_NAME, points=[point2])
+    get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=[point2])
     print(f"✓ Stored memory 2: ID {point_id2}")
     print(f"  Branch: {branch2}")
     print(f"  Text: {text2[:50]}...")
@@ -118,7 +115,7 @@ def test_store_memory():
         }
     )
 
-    qdrant_client.upsert(collection_name=COLLECTION_NAME, points=[point3])
+    get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=[point3])
     print(f"✓ Stored memory 3: ID {point_id3}")
     print(f"  Branch: {branch3}")
     print(f"  Text: {text3[:50]}...")
@@ -133,7 +130,7 @@ def test_search_memory():
     # Test 1: Search for "Jarvis operational"
     query1 = "Jarvis operational status"
     embedding1 = generate_embedding(query1)
-    results1 = qdrant_client.query_points(
+    results1 = get_qdrant_client().query_points(
         collection_name=COLLECTION_NAME,
         query=embedding1,
         limit=3
@@ -148,7 +145,7 @@ def test_search_memory():
     # Test 2: Search for "terraform"
     query2 = "terraform validation patterns"
     embedding2 = generate_embedding(query2)
-    results2 = qdrant_client.query_points(
+    results2 = get_qdrant_client().query_points(
         collection_name=COLLECTION_NAME,
         query=embedding2,
         limit=3
@@ -163,7 +160,7 @@ def test_search_memory():
     # Test 3: Search with branch filter
     query3 = "validation"
     embedding3 = generate_embedding(query3)
-    results3 = qdrant_client.query_points(
+    results3 = get_qdrant_client().query_points(
         collection_name=COLLECTION_NAME,
         query=embedding3,
         limit=3,
@@ -186,7 +183,7 @@ def test_branch_stats():
     print("=" * 50)
 
     # Get all points
-    scroll_result = qdrant_client.scroll(
+    scroll_result = get_qdrant_client().scroll(
         collection_name=COLLECTION_NAME,
         limit=100,
         with_vectors=False
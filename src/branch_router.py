@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Branch Router - Per-branch centroid vectors for two-stage search
+Every branch is summarized by up to BRANCH_CENTROIDS centroids (means of its
+unit vectors; k-means clusters when built by scripts/build_centroids.py),
+kept in a small side collection, <collection>_centroids, shared by all
+processes. Stores and merges move a centroid towards each new vector
+(update_centroids()).
+
+A routed search scores the query against every centroid in RAM, keeps the
+best branches and searches only those with a branch filter. The same
+scores answer "which branch knows about X" (find_branches).
+
+Branches with memories stored before centroids existed are invisible to
+routing until scripts/build_centroids.py has run; so are deletions, which
+only a rebuild takes out of the means.
+"""
+
+import time
+import threading
+from typing import Optional
+
+try:
+    from .config import COLLECTION_NAME, BRANCH_CENTROIDS, BRANCH_ROUTER_REFRESH_SECONDS
+    from .hivemind import get_qdrant_client, generate_point_id
+    from .metrics import REGISTRY
+except ImportError:
+    from config import COLLECTION_NAME, BRANCH_CENTROIDS, BRANCH_ROUTER_REFRESH_SECONDS
+    from hivemind import get_qdrant_client, generate_point_id
+    from metrics import REGISTRY
+
+BRANCH_ROUTING = REGISTRY.counter(
+    "jarvis_branch_routing_total", "Searches by whether centroids narrowed them to some branches", ("result",)
+)
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def centroid_collection(collection_name: str = COLLECTION_NAME) -> str:
+    return f"{collection_name}_centroids"
+
+
+def centroid_id(branch_id: str, index: int) -> int:
+    return generate_point_id(f"centroid#{index}", branch_id)
+
+
+def ensure_centroid_collection(client, vector_size: int, collection_name: str = COLLECTION_NAME) -> bool:
+    """Create the centroid collection if missing (True if it was created)
+
+    Dot product, so Qdrant stores the means as written instead of
+    normalizing them (incremental updates need the actual mean).
+    """
+    from qdrant_client.models import Distance, VectorParams, PayloadSchemaType
+
+    name = centroid_collection(collection_name)
+    if client.collection_exists(name):
+        return False
+    client.create_collection(collection_name=name, vectors_config=VectorParams(size=vector_size, distance=Distance.DOT))
+    if not getattr(client, "embedded", False):
+        client.create_payload_index(
+            collection_name=name, field_name="branch_id", field_schema=PayloadSchemaType.KEYWORD
+        )
+    return True
+
+
+def unit_rows(vectors):
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def spherical_kmeans(units, k: int, iterations: int = 10, seed: int = 0) -> tuple:
+    """Cluster unit vectors by cosine similarity
+
+    Returns:
+        (means of each cluster's unit vectors, cluster sizes); empty
+        clusters are dropped
+    """
+    import numpy as np
+
+    k = min(k, len(units))
+    rng = np.random.default_rng(seed)
+    centers = units[rng.choice(len(units), k, replace=False)]
+    for _ in range(iterations):
+        assignment = np.argmax(units @ centers.T, axis=1)
+        centers = unit_rows([
+            units[assignment == c].mean(axis=0) if (assignment == c).any() else centers[c] for c in range(k)
+        ])
+    assignment = np.argmax(units @ centers.T, axis=1)
+    counts = np.bincount(assignment, minlength=k)
+    keep = np.flatnonzero(counts)
+    return np.stack([units[assignment == c].mean(axis=0) for c in keep]), counts[keep]
+
+
+class BranchRouter:
+    """Centroids of every branch in RAM
+
+    This process's updates are applied in place; a reload every
+    BRANCH_ROUTER_REFRESH_SECONDS picks up other processes' updates and
+    rebuilds by scripts/build_centroids.py.
+    """
+
+    def __init__(self, collection_name: str = COLLECTION_NAME):
+        self.collection_name = collection_name
+        self.ids: list = []                 # point ID of each centroid row
+        self.branches: list[str] = []       # branch of each centroid row
+        self.units = None                   # unit centroid vectors
+        self.loaded_at = -float("inf")
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()   # one read-modify-write of centroids at a time
+        self._collection_ready = False
+
+    def load(self):
+        points = []
+        name = centroid_collection(self.collection_name)
+        client = get_qdrant_client()
+        if client.collection_exists(name):
+            offset = None
+            while True:
+                page, offset = client.scroll(
+                    collection_name=name, limit=1000, offset=offset, with_payload=["branch_id"], with_vectors=True
+                )
+                points.extend(page)
+                if offset is None:
+                    break
+        with self._lock:
+            self.ids = [point.id for point in points]
+            self.branches = [point.payload["branch_id"] for point in points]
+            self.units = unit_rows([point.vector for point in points]) if points else None
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        self.loaded_at = -float("inf")
+
+    def score_branches(self, query_vector: list, limit: int) -> list[tuple[str, float]]:
+        """Best `limit` branches for a query, by their closest centroid (cosine)"""
+        import numpy as np
+
+        if time.monotonic() - self.loaded_at > BRANCH_ROUTER_REFRESH_SECONDS:
+            self.load()
+        with self._lock:
+            if self.units is None:
+                return []
+            scores = self.units @ unit_rows(query_vector)
+            best: dict[str, float] = {}
+            for row in np.argsort(-scores).tolist():
+                best.setdefault(self.branches[row], float(scores[row]))
+                if len(best) == limit:
+                    break
+            return list(best.items())
+
+    def add(self, points: list, client):
+        """Move each new vector's branch centroid (its closest, if several) towards it
+
+        The branches' centroids are read fresh from Qdrant, so updates from
+        other processes are built on rather than overwritten (unless two
+        processes store to one branch at the same moment).
+        """
+        points = [p for p in points if p.vector is not None]
+        if not points:
+            return
+        with self._update_lock:
+            changed = self._add(points, client)
+        self._apply(changed)
+
+    def _apply(self, changed: dict):
+        """Put updated centroids {point ID: (branch, [id, mean, count])} into the RAM matrix"""
+        import numpy as np
+
+        with self._lock:
+            if self.units is None:
+                # Nothing loaded yet (or no centroids then): the next load reads them
+                self.invalidate()
+                return
+            rows = {point_id: row for row, point_id in enumerate(self.ids)}
+            added = []
+            for point_id, (branch, centroid) in changed.items():
+                unit = unit_rows(centroid[1])
+                if point_id in rows:
+                    self.units[rows[point_id]] = unit
+                else:
+                    self.ids.append(point_id)
+                    self.branches.append(branch)
+                    added.append(unit)
+            if added:
+                self.units = np.vstack([self.units, *added])
+
+    def _add(self, points: list, client) -> dict:
+        import numpy as np
+        from qdrant_client.models import Filter, FieldCondition, MatchAny, PointStruct
+
+        if not self._collection_ready:
+            ensure_centroid_collection(client, len(points[0].vector), self.collection_name)
+            self._collection_ready = True
+        name = centroid_collection(self.collection_name)
+        branches = sorted({(p.payload or {}).get("branch_id", "main") for p in points})
+        existing, _ = client.scroll(
+            collection_name=name,
+            scroll_filter=Filter(must=[FieldCondition(key="branch_id", match=MatchAny(any=branches))]),
+            limit=len(branches) * max(BRANCH_CENTROIDS, 1) * 4,
+            with_payload=True,
+            with_vectors=True
+        )
+        centroids: dict[str, list] = {}
+        for record in existing:
+            centroids.setdefault(record.payload["branch_id"], []).append(
+                [record.id, np.asarray(record.vector, dtype=np.float32), record.payload.get("count", 1)]
+            )
+
+        changed = {}
+        for point, unit in zip(points, unit_rows([p.vector for p in points])):
+            branch = (point.payload or {}).get("branch_id", "main")
+            candidates = centroids.setdefault(branch, [])
+            if not candidates:
+                candidates.append([centroid_id(branch, 0), np.zeros_like(unit), 0])
+            best = max(candidates, key=lambda c: float(unit_rows(c[1]) @ unit) if c[2] else 0.0)
+            best[2] += 1
+            best[1] = best[1] + (unit - best[1]) / best[2]
+            changed[best[0]] = (branch, best)
+
+        client.upsert(collection_name=name, points=[
+            PointStruct(id=point_id, vector=centroid[1].tolist(), payload={"branch_id": branch, "count": centroid[2]})
+            for point_id, (branch, centroid) in changed.items()
+        ])
+        return changed
+
+
+def get_branch_router() -> BranchRouter:
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = BranchRouter()
+    return _router
+
+
+def update_centroids(points: list):
+    """Fold freshly stored points (with vectors) into their branches' centroids"""
+    if BRANCH_CENTROIDS > 0:
+        get_branch_router().add(points, get_qdrant_client())
+
+
+def route_branches(query_vector: list, top: int) -> Optional[list[str]]:
+    """The `top` branches a query should search, or None to search all
+
+    None also when there are no centroids yet or no more than `top` branches.
+    """
+    ranked = get_branch_router().score_branches(query_vector, top + 1)
+    if len(ranked) <= top:
+        BRANCH_ROUTING.inc(result="all")
+        return None
+    BRANCH_ROUTING.inc(result="routed")
+    return [branch for branch, _ in ranked[:top]]
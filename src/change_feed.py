@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Change Feed - Append-only, sequence-numbered log of stored memories
+Every store, metadata refresh and merge appends one row per memory to a
+SQLite file shared by all Jarvis processes (MCP servers, Slack bridge,
+ingest). Agents learn what peers stored by reading the rows after the last
+sequence number they saw: no embedding and no Qdrant query.
+
+Long polls wake immediately on writes from the same process and notice
+other processes' writes within CHANGE_FEED_POLL_SECONDS.
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    from .config import CHANGE_FEED_PATH, CHANGE_FEED_POLL_SECONDS
+    from .metrics import REGISTRY
+except ImportError:
+    from config import CHANGE_FEED_PATH, CHANGE_FEED_POLL_SECONDS
+    from metrics import REGISTRY
+
+CHANGES_RECORDED = REGISTRY.counter(
+    "jarvis_change_feed_records_total", "Memory changes appended to the change feed", ("op",)
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    op TEXT NOT NULL,
+    branch_id TEXT NOT NULL,
+    memory_id TEXT NOT NULL,
+    type TEXT,
+    preview TEXT,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS changes_branch_seq ON changes (branch_id, seq);
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+"""
+
+COLUMNS = ("seq", "recorded_at", "op", "branch_id", "memory_id", "type", "preview", "source")
+
+_change_feed = None
+_feed_lock = threading.Lock()
+
+
+def change_rows(points: list) -> list[dict]:
+    """Feed rows for stored points (PointStructs/Records), one per memory
+
+    The extra chunks of a long memory are left out.
+    """
+    return [
+        change_row(point.id, point.payload or {})
+        for point in points if "parent_id" not in (point.payload or {})
+    ]
+
+
+def change_row(memory_id, payload: dict) -> dict:
+    return {
+        "memory_id": str(memory_id),
+        "branch_id": payload.get("branch_id", "main"),
+        "type": payload.get("type"),
+        "preview": payload.get("preview")
+    }
+
+
+class ChangeFeed:
+    """SQLite change log (WAL, so readers never block the writer)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()     # sqlite3 connections are per thread
+        self._appended = threading.Condition()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Autocommit; writers from other processes wait up to 10s for the lock
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def append(self, op: str, rows: list[dict], source: str = "") -> int:
+        """Append changes in one transaction
+
+        Returns:
+            Sequence number of the last one (0 if rows is empty)
+        """
+        if not rows:
+            return 0
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "INSERT INTO changes (recorded_at, op, branch_id, memory_id, type, preview, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(now, op, row["branch_id"], row["memory_id"], row.get("type"), row.get("preview"), source)
+                 for row in rows]
+            )
+            last = connection.execute("SELECT last_insert_rowid()").fetchone()[0]
+        CHANGES_RECORDED.inc(len(rows), op=op)
+        with self._appended:
+            self._appended.notify_all()
+        return last
+
+    def latest_seq(self) -> int:
+        return self._connection().execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def read(self, since_seq: int = 0, branches: Optional[list[str]] = None,
+             limit: int = 100) -> tuple[list[dict], int]:
+        """Changes after since_seq, oldest first
+
+        Returns:
+            (changes, sequence number to pass as since_seq next time)
+        """
+        connection = self._connection()
+        with connection:
+            # One snapshot: nothing committed between the two reads is skipped
+            connection.execute("BEGIN")
+            latest = connection.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+            query = f"SELECT {', '.join(COLUMNS)} FROM changes WHERE seq > ? AND seq <= ?"
+            params: list = [since_seq, latest]
+            if branches:
+                query += f" AND branch_id IN ({', '.join('?' * len(branches))})"
+                params.extend(branches)
+            query += " ORDER BY seq LIMIT ?"
+            params.append(limit)
+            changes = [dict(zip(COLUMNS, row)) for row in connection.execute(query, params)]
+        if len(changes) == limit:
+            return changes, changes[-1]["seq"]
+        return changes, max(since_seq, latest)
+
+    def wait(self, since_seq: int = 0, branches: Optional[list[str]] = None, limit: int = 100,
+             timeout: float = 0.0) -> tuple[list[dict], int]:
+        """read(), blocking up to `timeout` seconds until there is a change"""
+        deadline = time.monotonic() + timeout
+        while True:
+            changes, next_seq = self.read(since_seq, branches, limit)
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                return changes, next_seq
+            with self._appended:
+                self._appended.wait(min(CHANGE_FEED_POLL_SECONDS, remaining))
+
+    def get_cursor(self, name: str) -> Optional[int]:
+        """Saved position of a named consumer (e.g. a webhook fan-out)"""
+        row = self._connection().execute("SELECT seq FROM cursors WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, name: str, seq: int):
+        self._connection().execute(
+            "INSERT INTO cursors (name, seq) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET seq = excluded.seq",
+            (name, seq)
+        )
+
+
+def get_change_feed() -> Optional[ChangeFeed]:
+    """Process-wide change feed (None when CHANGE_FEED_PATH is empty)"""
+    global _change_feed
+    if not CHANGE_FEED_PATH:
+        return None
+    if _change_feed is None:
+        with _feed_lock:
+            if _change_feed is None:
+                _change_feed = ChangeFeed(CHANGE_FEED_PATH)
+    return _change_feed
+
+
+def record_changes(op: str, rows: list[dict], source: str = "") -> int:
+    """Append to the change feed, if enabled
+
+    A failing feed never fails the store that triggered it.
+
+    Returns:
+        Sequence number of the last change (0 if nothing was recorded)
+    """
+    feed = get_change_feed()
+    if feed is None or not rows:
+        return 0
+    try:
+        return feed.append(op, rows, source)
+    except sqlite3.Error as e:
+        print(f"⚠️  Change feed write failed: {e}", file=sys.stderr)
+        return 0
+
+
+class FeedFollower:
+    """Daemon thread handing new changes to a callback, resuming after restarts
+
+    The position is saved in the feed under `name` once handler() returns;
+    if it raises, the same changes are retried after `interval` seconds.
+    A follower without a saved position starts at the end of the feed.
+    """
+
+    def __init__(self, name: str, handler: Callable[[list[dict]], None],
+                 branches: Optional[list[str]] = None, interval: float = 5.0, batch: int = 100):
+        self.name = name
+        self.handler = handler
+        self.branches = branches
+        self.interval = interval
+        self.batch = batch
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        feed = get_change_feed()
+        if feed is None or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(feed,), name=f"feed-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, feed: ChangeFeed):
+        seq = feed.get_cursor(self.name)
+        if seq is None:
+            seq = feed.latest_seq()
+            feed.set_cursor(self.name, seq)
+        while not self._stop.is_set():
+            try:
+                changes, next_seq = feed.wait(seq, self.branches, self.batch, timeout=self.interval)
+                if changes:
+                    self.handler(changes)
+                if next_seq != seq:
+                    feed.set_cursor(self.name, next_seq)
+                    seq = next_seq
+            except Exception as e:
+                print(f"⚠️  Change feed follower '{self.name}' failed: {e}", file=sys.stderr)
+                self._stop.wait(self.interval)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Chunking - Split long text into embedding-sized pieces
+Prefers paragraph, then line, then sentence, then word boundaries so each
+chunk stays readable on its own. Streaming: chunks are produced as input
+arrives and only about one window of text is held beyond the current chunk.
+"""
+
+from typing import Iterable, Iterator
+
+SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def _split_point(text: str, start: int, limit: int) -> int:
+    """Offset (from start) to cut at: the last separator in the back half of the window"""
+    for separator in SEPARATORS:
+        index = text.rfind(separator, start + limit // 2, start + limit)
+        if index != -1:
+            return index - start + len(separator)
+    return limit
+
+
+def iter_chunks(pieces: Iterable[str], max_chars: int = 2000, overlap: int = 200) -> Iterator[str]:
+    """Chunks of the concatenation of `pieces`, yielded as soon as they are final
+
+    Same chunks as chunk_text("".join(pieces)); pieces may be lines of a file,
+    network reads or a single string. Cost is linear in the input.
+    """
+    overlap = min(overlap, max_chars // 4)
+    buffer = ""
+    start = 0
+    for piece in pieces:
+        if not buffer:
+            piece = piece.lstrip()
+        # Drop consumed text only when appending, so one huge piece is never re-copied
+        buffer = buffer[start:] + piece if start else buffer + piece
+        start = 0
+        # A window is only final once non-whitespace follows it (trailing
+        # whitespace is stripped, which could make it the last window)
+        content_end = len(buffer.rstrip())
+        while start + max_chars < content_end:
+            end = _split_point(buffer, start, max_chars)
+            chunk = buffer[start:start + end].strip()
+            if chunk:
+                yield chunk
+            # Step back for overlap, then forward to a word boundary
+            next_start = start + max(end - overlap, 1)
+            space = buffer.find(" ", next_start, start + end)
+            start = space + 1 if space != -1 else next_start
+    tail = buffer[start:].strip()
+    if tail:
+        yield tail
+
+
+def chunk_text(text: str, max_chars: int = 2000, overlap: int = 200) -> list[str]:
+    """Split text into chunks of at most max_chars
+
+    Consecutive chunks share up to `overlap` characters so a fact spanning
+    a boundary is still retrievable. Text that fits is returned as is.
+    """
+    return list(iter_chunks([text], max_chars, overlap))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cold Store - Portable snapshot directories of memories (vectors + payloads)
+Written by scripts/snapshot.py exports and by compaction archives; read back
+by snapshot imports. Streams both ways, so size is not bounded by RAM:
+
+    manifest.json        vector size, point count, plus caller metadata
+    vectors.npy          float32 (count x dim); row i belongs to payload line i
+    payloads.jsonl.gz    {"id": ..., "payload": {...}} per line
+"""
+
+import os
+import gzip
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+VECTORS = "vectors.npy"
+PAYLOADS = "payloads.jsonl.gz"
+
+# .npy header reserved up front and rewritten with the final row count
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+NPY_HEADER_LEN = 118  # magic (8) + length (2) + header = 128 bytes, 64-aligned
+
+
+class SnapshotError(RuntimeError):
+    """Snapshot directory is missing, incomplete or incompatible"""
+
+
+def _npy_header(rows: int, dim: int) -> bytes:
+    header = f"{{'descr': '<f4', 'fortran_order': False, 'shape': ({rows}, {dim}), }}"
+    header = header.ljust(NPY_HEADER_LEN - 1) + "\n"
+    return NPY_MAGIC + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+
+class SnapshotWriter:
+    """Append pages of Qdrant records (with vectors) to a snapshot directory"""
+
+    def __init__(self, path: str, vector_size: int, compress_level: int = 6):
+        import numpy as np
+        self.np = np
+        self.path = path
+        self.vector_size = vector_size
+        self.count = 0
+        os.makedirs(path, exist_ok=True)
+        self._vectors = open(os.path.join(path, VECTORS), "wb")
+        self._vectors.write(_npy_header(0, vector_size))
+        self._payloads = gzip.open(
+            os.path.join(path, PAYLOADS), "wt", encoding="utf-8", compresslevel=compress_level
+        )
+
+    def append(self, points: list):
+        if not points:
+            return
+        self.np.asarray([p.vector for p in points], dtype="<f4").tofile(self._vectors)
+        for point in points:
+            self._payloads.write(json.dumps({"id": point.id, "payload": point.payload}) + "\n")
+        self.count += len(points)
+
+    def flush(self):
+        """Make appended points durable before they are deleted from Qdrant"""
+        self._payloads.flush()
+        self._vectors.flush()
+        os.fsync(self._vectors.fileno())
+
+    def close(self, **metadata) -> dict:
+        """Finalize the header and write the manifest (extra metadata is included)"""
+        self._payloads.close()
+        self._vectors.seek(0)
+        self._vectors.write(_npy_header(self.count, self.vector_size))
+        self._vectors.close()
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "vector_size": self.vector_size,
+            "count": self.count,
+            "created_at": datetime.now().isoformat(),
+            **metadata
+        }
+        with open(os.path.join(self.path, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+    def size_bytes(self) -> int:
+        return sum(
+            os.path.getsize(os.path.join(self.path, name))
+            for name in (VECTORS, PAYLOADS) if os.path.exists(os.path.join(self.path, name))
+        )
+
+
+def read_manifest(path: str) -> dict:
+    """Load and validate a snapshot manifest
+
+    Raises:
+        SnapshotError: missing manifest, unknown format, or vectors/manifest mismatch
+    """
+    import numpy as np
+
+    try:
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise SnapshotError(f"No {MANIFEST} in {path}")
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format: {manifest.get('format_version')}")
+    rows = np.load(os.path.join(path, VECTORS), mmap_mode="r").shape[0]
+    if rows != manifest["count"]:
+        raise SnapshotError(f"Snapshot is incomplete: manifest says {manifest['count']} points, vectors has {rows}")
+    return manifest
+
+
+def read_batches(path: str, batch_size: int,
+                 branches: Optional[list[str]] = None) -> Iterator[tuple[list, list, list]]:
+    """Yield (ids, vectors, payloads) batches; vectors are read through a memory map"""
+    import numpy as np
+
+    vectors = np.load(os.path.join(path, VECTORS), mmap_mode="r")
+    wanted = set(branches) if branches else None
+    ids, payloads, rows = [], [], []
+    with gzip.open(os.path.join(path, PAYLOADS), "rt", encoding="utf-8") as payloads_file:
+        for row, line in enumerate(payloads_file):
+            record = json.loads(line)
+            if wanted is not None and (record["payload"] or {}).get("branch_id") not in wanted:
+                continue
+            ids.append(record["id"])
+            payloads.append(record["payload"])
+            rows.append(row)
+            if len(ids) >= batch_size:
+                yield ids, vectors[rows].tolist(), payloads
+                ids, payloads, rows = [], [], []
+    if ids:
+        yield ids, vectors[rows].tolist(), payloads
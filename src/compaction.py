@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Compaction - Retention policies for stale memories
+Memories older than their rule's retention are archived to a cold-store
+snapshot (restore with: python scripts/snapshot.py import <archive>) and
+deleted in batches. Rules select by the timestamp index, so nothing newer
+than a cutoff is ever read.
+
+Policy syntax (RETENTION_POLICY or --policy), comma separated:
+    incident=730          memories of type "incident": 730 days
+    branch:scratch=7d     everything in branch "scratch": 7 days
+    branch:slack/context=12h
+    skill=never           never expire (also shields it from "default")
+    default=365           everything not matched by another rule
+The most specific rule wins: branch+type, then branch, then type, then default.
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+try:
+    from .config import (
+        COLLECTION_NAME, RETENTION_POLICY, COMPACTION_ARCHIVE_DIR, COMPACTION_BATCH_SIZE
+    )
+    from .hivemind import get_qdrant_client, memory_conditions
+    from .cold_store import SnapshotWriter
+    from .hot_tier import forget_memories
+except ImportError:
+    from config import (
+        COLLECTION_NAME, RETENTION_POLICY, COMPACTION_ARCHIVE_DIR, COMPACTION_BATCH_SIZE
+    )
+    from hivemind import get_qdrant_client, memory_conditions
+    from cold_store import SnapshotWriter
+    from hot_tier import forget_memories
+
+KEEP_FOREVER = ("never", "forever", "keep")
+
+
+@dataclass
+class RetentionRule:
+    """Retention for memories matching branch and/or type (None = any)"""
+    branch: Optional[str]
+    type: Optional[str]
+    max_age: Optional[timedelta]  # None = keep forever
+
+    @property
+    def label(self) -> str:
+        if self.branch and self.type:
+            return f"branch:{self.branch}/{self.type}"
+        if self.branch:
+            return f"branch:{self.branch}"
+        return self.type or "default"
+
+    @property
+    def specificity(self) -> int:
+        return (2 if self.branch else 0) + (1 if self.type else 0)
+
+
+def _parse_age(value: str) -> Optional[timedelta]:
+    value = value.strip().lower()
+    if value in KEEP_FOREVER:
+        return None
+    if value.endswith("h"):
+        return timedelta(hours=float(value[:-1]))
+    return timedelta(days=float(value.rstrip("d")))
+
+
+def parse_policy(spec: str) -> list[RetentionRule]:
+    """Parse "type=days,branch:<id>[/<type>]=days,default=days"
+
+    Raises:
+        ValueError: malformed rule or duplicate scope
+    """
+    rules: dict[tuple, RetentionRule] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        if "=" not in item:
+            raise ValueError(f"Retention rule needs '=': {item!r}")
+        scope, age = item.rsplit("=", 1)
+        scope = scope.strip()
+        branch, memory_type = None, None
+        if scope.startswith("branch:"):
+            branch, _, memory_type = scope[len("branch:"):].partition("/")
+            memory_type = memory_type or None
+        elif scope != "default":
+            memory_type = scope
+        try:
+            max_age = _parse_age(age)
+        except ValueError:
+            raise ValueError(f"Invalid retention for {scope!r}: {age!r} (days, <n>h or 'never')")
+        if (branch, memory_type) in rules:
+            raise ValueError(f"Duplicate retention rule for {scope!r}")
+        rules[(branch, memory_type)] = RetentionRule(branch, memory_type, max_age)
+    return sorted(rules.values(), key=lambda r: -r.specificity)
+
+
+def _match(key: str, value: str):
+    from qdrant_client.models import FieldCondition, MatchValue
+    return FieldCondition(key=key, match=MatchValue(value=value))
+
+
+def _scope_conditions(rule: RetentionRule) -> list:
+    conditions = []
+    if rule.branch:
+        conditions.append(_match("branch_id", rule.branch))
+    if rule.type:
+        conditions.append(_match("type", rule.type))
+    return conditions
+
+
+def rule_filter(rule: RetentionRule, rules: list[RetentionRule], cutoff: datetime):
+    """Memories governed by `rule` (not by a more specific one) older than cutoff"""
+    from qdrant_client.models import Filter, FieldCondition, DatetimeRange
+
+    must_not = []
+    for other in rules:
+        if other is rule or other.specificity <= rule.specificity:
+            continue
+        # Only rules that overlap this one's scope can take memories from it
+        if rule.branch and other.branch != rule.branch:
+            continue
+        if rule.type and other.type not in (None, rule.type):
+            continue
+        must_not.append(Filter(must=_scope_conditions(other)))
+
+    return Filter(
+        must=[
+            *_scope_conditions(rule),
+            FieldCondition(key="timestamp", range=DatetimeRange(lt=cutoff))
+        ],
+        must_not=must_not or None
+    )
+
+
+@dataclass
+class CompactionReport:
+    dry_run: bool
+    rules: list[dict] = field(default_factory=list)
+    archive: Optional[str] = None
+    archived_bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        return sum(r["matched"] for r in self.rules)
+
+    def summary(self) -> str:
+        lines = []
+        for rule in self.rules:
+            if rule["max_age"] is None:
+                lines.append(f"  {rule['rule']:28} keep forever")
+            else:
+                verb = "would expire" if self.dry_run else "expired"
+                lines.append(f"  {rule['rule']:28} {verb} {rule['matched']} (older than {rule['cutoff'][:19]})")
+        rate = self.total / self.seconds if self.seconds else 0
+        if self.dry_run:
+            lines.append(f"  {self.total} memories past retention (dry run, nothing changed)")
+        else:
+            lines.append(f"  {self.total} memories archived and deleted in {self.seconds:.1f}s ({rate:.0f}/s)")
+            if self.archive:
+                lines.append(f"  Archive: {self.archive} ({self.archived_bytes / 1024 ** 2:.1f} MB)")
+        return "\n".join(lines)
+
+
+def compact(rules: Optional[list[RetentionRule]] = None, dry_run: bool = False,
+            collection_name: str = COLLECTION_NAME, archive_dir: str = COMPACTION_ARCHIVE_DIR,
+            batch_size: int = COMPACTION_BATCH_SIZE, now: Optional[datetime] = None,
+            progress: Optional[Callable[[str, int], None]] = None) -> CompactionReport:
+    """Archive then delete memories past their retention
+
+    Each page is flushed to the archive before its points are deleted, so an
+    interrupted run loses nothing; re-running picks up the rest.
+    """
+    from qdrant_client.models import Filter, PointIdsList
+
+    rules = parse_policy(RETENTION_POLICY) if rules is None else rules
+    now = now or datetime.now()
+    client = get_qdrant_client()
+    report = CompactionReport(dry_run=dry_run)
+    writer: Optional[SnapshotWriter] = None
+    started = time.perf_counter()
+
+    try:
+        for rule in rules:
+            entry = {"rule": rule.label, "max_age": rule.max_age, "matched": 0, "cutoff": ""}
+            report.rules.append(entry)
+            if rule.max_age is None:
+                continue
+            cutoff = now - rule.max_age
+            entry["cutoff"] = cutoff.isoformat()
+            scroll_filter = rule_filter(rule, rules, cutoff)
+
+            if dry_run:
+                # Memories, not points: the chunks of a long memory expire with it
+                entry["matched"] = client.count(
+                    collection_name=collection_name,
+                    count_filter=Filter(
+                        must=[*scroll_filter.must, *memory_conditions()], must_not=scroll_filter.must_not
+                    ),
+                    exact=True
+                ).count
+                continue
+
+            # Deleted points drop out of the filter, so always read the first page
+            while True:
+                points, _ = client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=batch_size,
+                    with_payload=True,
+                    with_vectors=True
+                )
+                if not points:
+                    break
+                if writer is None:
+                    stamp = now.strftime("%Y%m%dT%H%M%S")
+                    report.archive = os.path.join(archive_dir, f"{collection_name}-{stamp}")
+                    writer = SnapshotWriter(report.archive, len(points[0].vector))
+                writer.append(points)
+                writer.flush()
+                client.delete(
+                    collection_name=collection_name,
+                    points_selector=PointIdsList(points=[p.id for p in points]),
+                    wait=True
+                )
+                forget_memories([p.id for p in points])
+                entry["matched"] += sum(1 for p in points if "parent_id" not in (p.payload or {}))
+                if progress:
+                    progress(rule.label, entry["matched"])
+    finally:
+        if writer is not None:
+            report.archived_bytes = writer.size_bytes()
+            writer.close(
+                collection=collection_name,
+                reason="compaction",
+                policy=[{"rule": r["rule"], "cutoff": r["cutoff"] or None} for r in report.rules]
+            )
+        report.seconds = time.perf_counter() - started
+    return report
+
+
+async def compaction_loop(interval_hours: float, initial_delay: float = 60.0):
+    """Run compact() every interval_hours in a worker thread (server background task)"""
+    import asyncio
+
+    try:
+        rules = parse_policy(RETENTION_POLICY)
+    except ValueError as e:
+        print(f"✗ Compaction disabled: {e}", file=sys.stderr)
+        return
+    if not any(rule.max_age for rule in rules):
+        print("⚠️  COMPACTION_INTERVAL_HOURS set but RETENTION_POLICY expires nothing", file=sys.stderr)
+        return
+    await asyncio.sleep(initial_delay)
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            report = await loop.run_in_executor(None, lambda: compact(rules))
+            if report.total:
+                print(f"🧹 Compaction:\n{report.summary()}", file=sys.stderr)
+        except Exception as e:
+            print(f"✗ Compaction failed: {e}", file=sys.stderr)
+        await asyncio.sleep(interval_hours * 3600)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Jarvis Configuration - Environment settings shared by every entry point
+Reading this module is free: nothing here imports a client or connects
+"""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Storage backend: "server" (Qdrant at QDRANT_URL) or "embedded" (in-process,
+# persisted at QDRANT_PATH, or ":memory:" for throwaway CI runs)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "server").lower()
+QDRANT_PATH = os.path.expanduser(os.getenv("QDRANT_PATH", "~/.local/share/jarvis-lmao/qdrant"))
+
+# Qdrant
+QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
+QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", None)
+COLLECTION_NAME = os.getenv("COLLECTION_NAME", "jarvis_hivemind")
+# branch_id index: "index" (plain keyword) or "tenant" (keyword with is_tenant,
+# Qdrant >= 1.11 stores each branch's points together; see partition_branches.py)
+BRANCH_PARTITIONING = os.getenv("BRANCH_PARTITIONING", "index").lower()
+
+# Qdrant transport and connection pooling
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "10"))                  # seconds per request
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "16"))              # max HTTP connections
+QDRANT_KEEPALIVE_CONNECTIONS = int(os.getenv("QDRANT_KEEPALIVE_CONNECTIONS", "8"))
+QDRANT_KEEPALIVE_EXPIRY = float(os.getenv("QDRANT_KEEPALIVE_EXPIRY", "60"))  # idle seconds
+QDRANT_GRPC_KEEPALIVE_MS = int(os.getenv("QDRANT_GRPC_KEEPALIVE_MS", "30000"))
+
+# Embeddings
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "ollama").lower()
+# Comma separated list of Ollama endpoints is load balanced (see embedding_pool.py)
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_BASE_URLS = [url.strip() for url in OLLAMA_BASE_URL.split(",") if url.strip()]
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "nomic-embed-text")
+OLLAMA_EMBEDDING_DIM = int(os.getenv("OLLAMA_EMBEDDING_DIM") or "0")  # 0 = known size of the model, else asked from Ollama
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "text-embedding-3-small")
+OPENAI_EMBEDDING_DIM = int(os.getenv("OPENAI_EMBEDDING_DIM") or "0")  # 0 = known size of the model, else asked from the API
+LOCAL_EMBEDDING_DIM = int(os.getenv("LOCAL_EMBEDDING_DIM", "512"))
+
+# Embedding endpoint pool
+EMBEDDING_TIMEOUT = float(os.getenv("EMBEDDING_TIMEOUT", "30"))              # seconds per request
+EMBEDDING_CIRCUIT_FAILURES = int(os.getenv("EMBEDDING_CIRCUIT_FAILURES", "3"))
+EMBEDDING_CIRCUIT_COOLDOWN = float(os.getenv("EMBEDDING_CIRCUIT_COOLDOWN", "30"))
+EMBEDDING_HEALTH_INTERVAL = float(os.getenv("EMBEDDING_HEALTH_INTERVAL", "15"))
+EMBEDDING_HEDGE = os.getenv("EMBEDDING_HEDGE", "false").lower() == "true"
+EMBEDDING_HEDGE_MIN_MS = float(os.getenv("EMBEDDING_HEDGE_MIN_MS", "50"))
+EMBEDDING_BATCH_WORKERS = int(os.getenv("EMBEDDING_BATCH_WORKERS", "4"))    # batches of one call in flight
+# Recent search query vectors, so paging a search (offset / cursor) does not re-embed
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "256"))                 # 0 = off
+
+# Metrics (Prometheus text format; the Slack bridge serves /metrics on its own
+# port, the stdio MCP server only when METRICS_PORT is set)
+# METRICS_ENABLED=false drops the per-call Qdrant timing proxy
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_PORT = int(os.getenv("METRICS_PORT") or "0")               # 0 = no listener
+
+# MCP transport: stdio (one process per session, started by the client) or
+# http (one shared process serving every session: streamable HTTP at /mcp,
+# SSE at /sse); HTTP tool calls run concurrently on MCP_TOOL_WORKERS threads
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")
+MCP_HTTP_HOST = os.getenv("MCP_HTTP_HOST", "127.0.0.1")                # no auth: keep on loopback/behind a proxy
+MCP_HTTP_PORT = int(os.getenv("MCP_HTTP_PORT", "8765"))
+MCP_TOOL_WORKERS = int(os.getenv("MCP_TOOL_WORKERS", "16"))
+
+# Tool call profiling (off by default; see profiler.py)
+PROFILE_DIR = os.path.expanduser(os.getenv("PROFILE_DIR", "~/.local/share/jarvis-lmao/profiles"))
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))     # fraction run under cProfile
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))             # keep stack samples of slower calls
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))     # stack sampling period
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "500"))         # captures kept in PROFILE_DIR
+
+# Retention / compaction (see compaction.py for the policy syntax)
+RETENTION_POLICY = os.getenv("RETENTION_POLICY", "")                   # empty = keep everything
+COMPACTION_INTERVAL_HOURS = float(os.getenv("COMPACTION_INTERVAL_HOURS", "0"))  # 0 = CLI only
+COMPACTION_ARCHIVE_DIR = os.path.expanduser(
+    os.getenv("COMPACTION_ARCHIVE_DIR", "~/.local/share/jarvis-lmao/archive")
+)
+COMPACTION_BATCH_SIZE = int(os.getenv("COMPACTION_BATCH_SIZE", "500"))
+
+# Hot tier: newest / most used memories searched in RAM before Qdrant (see hot_tier.py)
+HOT_TIER_SIZE = int(os.getenv("HOT_TIER_SIZE", "0"))                   # memories in RAM; 0 = off
+HOT_TIER_MIN_SCORE = float(os.getenv("HOT_TIER_MIN_SCORE", "0.75"))    # below this, also ask Qdrant
+HOT_TIER_REFRESH_SECONDS = float(os.getenv("HOT_TIER_REFRESH_SECONDS", "60"))
+
+# Memory bodies (see memory_text.py): searches return only a preview; long
+# bodies are stored zstd-compressed and fetched with the get_memory tool
+PREVIEW_CHARS = int(os.getenv("PREVIEW_CHARS", "200"))
+TEXT_COMPRESS_MIN_CHARS = int(os.getenv("TEXT_COMPRESS_MIN_CHARS", "2000"))   # 0 = never compress
+TEXT_COMPRESS_LEVEL = int(os.getenv("TEXT_COMPRESS_LEVEL", "3"))
+
+# Long memories are stored as overlapping chunks, each embedded on its own and
+# collapsed back into one result by search (see memory_text.py)
+CHUNK_THRESHOLD_CHARS = int(os.getenv("CHUNK_THRESHOLD_CHARS", "4000"))      # 0 = never chunk
+CHUNK_CHARS = int(os.getenv("CHUNK_CHARS", "2000"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))
+
+# Related memories: neighbours kept per memory for related_memories, updated on
+# store (0 = not maintained, the default: costs a search per store; see
+# related.py and scripts/build_related.py)
+RELATED_K = int(os.getenv("RELATED_K", "0"))
+
+# Branch routing: per-branch centroids updated on store (0 = not maintained,
+# the default: costs a centroid read and upsert per store; see
+# branch_router.py and scripts/build_centroids.py)
+BRANCH_CENTROIDS = int(os.getenv("BRANCH_CENTROIDS", "0"))                  # k-means centroids per branch on rebuild
+BRANCH_ROUTING_TOP = int(os.getenv("BRANCH_ROUTING_TOP", "0"))              # unfiltered searches: N best branches (0 = all)
+BRANCH_ROUTER_REFRESH_SECONDS = float(os.getenv("BRANCH_ROUTER_REFRESH_SECONDS", "60"))
+
+# Change feed: stores and merges append to a SQLite log shared by every process,
+# read by poll_changes and the Slack webhook fan-out (see change_feed.py)
+CHANGE_FEED_PATH = os.path.expanduser(os.getenv("CHANGE_FEED_PATH", "~/.local/share/jarvis-lmao/changes.db"))
+CHANGE_FEED_POLL_SECONDS = float(os.getenv("CHANGE_FEED_POLL_SECONDS", "0.5"))   # cross-process long-poll check
+CHANGE_FEED_MAX_WAIT = float(os.getenv("CHANGE_FEED_MAX_WAIT", "60"))           # longest poll_changes wait
+
+# Silent Overseer
+OVERSEER_ENABLED = os.getenv("OVERSEER_ENABLED", "true").lower() == "true"
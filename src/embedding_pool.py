@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Embedding Pool - Load balancing across several embedding endpoints
+Least-outstanding-requests routing, circuit breaking with background health
+checks, failover, and optional hedged requests after a p95-based delay
+"""
+
+import sys
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class NoHealthyEndpointError(RuntimeError):
+    """Every endpoint's circuit is open"""
+
+
+class Endpoint:
+    """One backend with its client, load and circuit state"""
+
+    def __init__(self, url: str, client: Any, window: int = 200):
+        self.url = url
+        self.client = client
+        self.outstanding = 0
+        self.latencies: deque = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.open_until = 0.0       # Circuit open (skipped) until this time.monotonic()
+        self.requests = 0
+        self.failures = 0
+
+    def is_available(self, now: float) -> bool:
+        """Closed circuit, or open circuit whose cooldown elapsed (half-open probe)"""
+        return now >= self.open_until
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.latencies)
+        p95 = ordered[int(0.95 * (len(ordered) - 1))] * 1000 if ordered else None
+        return {
+            "url": self.url,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "circuit": "open" if time.monotonic() < self.open_until else "closed",
+            "p95_ms": round(p95, 1) if p95 is not None else None
+        }
+
+
+class EndpointPool:
+    """Route calls across endpoints
+
+    Args:
+        urls: Endpoint base URLs
+        client_factory: url -> client object handed to each call
+        health_check: client -> None, raising if the endpoint is unhealthy
+        failure_threshold: Consecutive failures that open the circuit (0 = never)
+        cooldown: Seconds an open circuit stays open before a probe
+        health_interval: Seconds between background health checks (0 = off)
+        hedge: Send a duplicate request to a second endpoint when the first
+               is slower than the pool's recent p95
+        hedge_min_delay: Floor for the hedge delay in seconds
+    """
+
+    MIN_HEDGE_SAMPLES = 20
+
+    def __init__(self, urls: list[str], client_factory: Callable[[str], Any],
+                 health_check: Optional[Callable[[Any], Any]] = None,
+                 failure_threshold: int = 3, cooldown: float = 30.0,
+                 health_interval: float = 15.0, hedge: bool = False,
+                 hedge_min_delay: float = 0.05):
+        if not urls:
+            raise ValueError("EndpointPool needs at least one endpoint URL")
+        self.endpoints = [Endpoint(url, client_factory(url)) for url in urls]
+        self.health_check = health_check
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hedge = hedge and len(self.endpoints) > 1
+        self.hedge_min_delay = hedge_min_delay
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self._recent: deque = deque(maxlen=500)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=4 * len(self.endpoints), thread_name_prefix="embedding-pool"
+        )
+        self._stop = threading.Event()
+
+        if health_check and health_interval > 0:
+            threading.Thread(
+                target=self._health_loop, args=(health_interval,),
+                name="embedding-health", daemon=True
+            ).start()
+
+    # Routing
+
+    def _pick(self, exclude: tuple = ()) -> Endpoint:
+        """Least outstanding requests among available endpoints (random tiebreak)"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [e for e in self.endpoints if e not in exclude and e.is_available(now)]
+            if not candidates:
+                raise NoHealthyEndpointError(
+                    f"No healthy embedding endpoints ({len(self.endpoints)} configured, all circuits open)"
+                )
+            fewest = min(e.outstanding for e in candidates)
+            endpoint = random.choice([e for e in candidates if e.outstanding == fewest])
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _run(self, endpoint: Endpoint, fn: Callable[[Any], T]) -> T:
+        """Call fn on an endpoint already reserved by _pick, recording the outcome"""
+        started = time.perf_counter()
+        try:
+            result = fn(endpoint.client)
+        except Exception:
+            with self._lock:
+                endpoint.outstanding -= 1
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if self.failure_threshold and endpoint.consecutive_failures >= self.failure_threshold:
+                    if endpoint.open_until <= time.monotonic():
+                        print(f"⚠️  Embedding endpoint {endpoint.url} circuit opened", file=sys.stderr)
+                    endpoint.open_until = time.monotonic() + self.cooldown
+            raise
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.consecutive_failures = 0
+            endpoint.open_until = 0.0
+            endpoint.latencies.append(elapsed)
+            self._recent.append(elapsed)
+        return result
+
+    def hedge_delay(self) -> Optional[float]:
+        """Recent pool-wide p95 latency, or None until there is enough history"""
+        with self._lock:
+            if len(self._recent) < self.MIN_HEDGE_SAMPLES:
+                return None
+            ordered = sorted(self._recent)
+        return max(self.hedge_min_delay, ordered[int(0.95 * (len(ordered) - 1))])
+
+    def call(self, fn: Callable[[Any], T]) -> T:
+        """Run fn(client) on the best endpoint, failing over on errors"""
+        if self.hedge:
+            return self._call_hedged(fn)
+
+        tried = ()
+        last_error: Optional[Exception] = None
+        while True:
+            try:
+                endpoint = self._pick(exclude=tried)
+            except NoHealthyEndpointError:
+                if last_error:
+                    raise last_error
+                raise
+            try:
+                return self._run(endpoint, fn)
+            except Exception as e:
+                last_error = e
+                tried += (endpoint,)
+
+    def _call_hedged(self, fn: Callable[[Any], T]) -> T:
+        """Primary request; duplicate to another endpoint if it outlives the hedge delay"""
+        primary = self._pick()
+        primary_future = self._executor.submit(self._run, primary, fn)
+        pending = {primary_future}
+        used = (primary,)
+        delay = self.hedge_delay()
+        hedge_sent = False
+        last_error: Optional[Exception] = None
+
+        while pending:
+            # No latency history yet (delay None) means plain failover
+            timeout = None if (hedge_sent or delay is None) else delay
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if hedge_sent and future is not primary_future:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return result
+
+            if done and pending:
+                continue  # One request failed, another is still in flight
+
+            # Primary outlived the hedge delay, or everything sent so far failed
+            try:
+                backup = self._pick(exclude=used)
+            except NoHealthyEndpointError:
+                if pending:
+                    hedge_sent = True  # Nowhere to hedge to; wait for the primary
+                    continue
+                raise last_error or NoHealthyEndpointError("No healthy embedding endpoints")
+            pending.add(self._executor.submit(self._run, backup, fn))
+            used += (backup,)
+            if not done:
+                hedge_sent = True
+                with self._lock:
+                    self.hedged_requests += 1
+
+        raise last_error or NoHealthyEndpointError("No healthy embedding endpoints")
+
+    # Health
+
+    def _health_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            for endpoint in self.endpoints:
+                try:
+                    self.health_check(endpoint.client)
+                    with self._lock:
+                        if endpoint.open_until:
+                            print(f"✓ Embedding endpoint {endpoint.url} healthy again", file=sys.stderr)
+                        endpoint.consecutive_failures = 0
+                        endpoint.open_until = 0.0
+                except Exception:
+                    with self._lock:
+                        endpoint.open_until = time.monotonic() + self.cooldown
+
+    def close(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "endpoints": [e.to_dict() for e in self.endpoints],
+                "hedging": self.hedge,
+                "hedged_requests": self.hedged_requests,
+                "hedge_wins": self.hedge_wins
+            }
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Embeddings - Pluggable, lazily initialized embedding providers
+Each provider registers its dimension and limits; its SDK is imported and
+its client created on the first embedding request, not on import
+"""
+
+import sys
+import zlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+try:
+    from .config import (
+        EMBEDDING_PROVIDER, OLLAMA_BASE_URLS, OLLAMA_MODEL, OLLAMA_EMBEDDING_DIM, OPENAI_API_KEY,
+        OPENAI_MODEL, OPENAI_EMBEDDING_DIM, LOCAL_EMBEDDING_DIM, EMBEDDING_TIMEOUT, EMBEDDING_CIRCUIT_FAILURES,
+        EMBEDDING_CIRCUIT_COOLDOWN, EMBEDDING_HEALTH_INTERVAL, EMBEDDING_HEDGE,
+        EMBEDDING_HEDGE_MIN_MS, EMBEDDING_BATCH_WORKERS, QUERY_CACHE_SIZE
+    )
+    from .embedding_pool import EndpointPool
+    from .metrics import EMBEDDING_LATENCY, EMBEDDING_TEXTS, QUERY_CACHE_LOOKUPS
+    from .profiler import phase
+except ImportError:
+    from config import (
+        EMBEDDING_PROVIDER, OLLAMA_BASE_URLS, OLLAMA_MODEL, OLLAMA_EMBEDDING_DIM, OPENAI_API_KEY,
+        OPENAI_MODEL, OPENAI_EMBEDDING_DIM, LOCAL_EMBEDDING_DIM, EMBEDDING_TIMEOUT, EMBEDDING_CIRCUIT_FAILURES,
+        EMBEDDING_CIRCUIT_COOLDOWN, EMBEDDING_HEALTH_INTERVAL, EMBEDDING_HEDGE,
+        EMBEDDING_HEDGE_MIN_MS, EMBEDDING_BATCH_WORKERS, QUERY_CACHE_SIZE
+    )
+    from embedding_pool import EndpointPool
+    from metrics import EMBEDDING_LATENCY, EMBEDDING_TEXTS, QUERY_CACHE_LOOKUPS
+    from profiler import phase
+
+
+class EmbeddingConfigError(RuntimeError):
+    """Embedding provider cannot be initialized (missing SDK, key, ...)"""
+
+
+class Embedder:
+    """An initialized embedding provider
+
+    Subclasses implement _embed_batch(); inputs are truncated to
+    max_input_chars and batched by max_batch here.
+    """
+
+    def __init__(self, provider: str, model: str, dimension: int,
+                 max_batch: int, max_input_chars: int):
+        self.provider = provider
+        self.model = model
+        self.dimension = dimension
+        self.max_batch = max_batch
+        self.max_input_chars = max_input_chars
+
+    def embed(self, text: str) -> list[float]:
+        """Generate embedding vector for text"""
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[list[float]]:
+        """Generate embedding vectors, one request per max_batch texts
+
+        Up to EMBEDDING_BATCH_WORKERS requests run concurrently (e.g. the
+        chunks of one long memory), spread over the pool's endpoints.
+        """
+        texts = [text[:self.max_input_chars] for text in texts]
+        batches = [texts[start:start + self.max_batch] for start in range(0, len(texts), self.max_batch)]
+        workers = min(EMBEDDING_BATCH_WORKERS, len(batches))
+        if workers <= 1:
+            return [vector for batch in batches for vector in self._timed_batch(batch)]
+        # Workers do not see the profiling context: attribute the wait here
+        with phase("embedding"), ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jarvis-embed") as executor:
+            return [vector for vectors in executor.map(self._timed_batch, batches) for vector in vectors]
+
+    def _timed_batch(self, texts: list[str]) -> list[list[float]]:
+        with EMBEDDING_LATENCY.time(provider=self.provider), phase("embedding"):
+            vectors = self._embed_batch(texts)
+        EMBEDDING_TEXTS.inc(len(texts), provider=self.provider)
+        return vectors
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        raise NotImplementedError
+
+
+class OllamaEmbedder(Embedder):
+    """One or more Ollama servers (network), balanced by an EndpointPool"""
+
+    def __init__(self, pool: EndpointPool, **spec):
+        super().__init__(**spec)
+        self.pool = pool
+        self.client = pool.endpoints[0].client
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return self.pool.call(lambda client: self._request(client, texts))
+
+    def _request(self, client: Any, texts: list[str]) -> list[list[float]]:
+        if hasattr(client, "embed"):
+            return list(client.embed(model=self.model, input=texts)['embeddings'])
+        # ollama < 0.3 has no batch endpoint
+        return [client.embeddings(model=self.model, prompt=text)['embedding'] for text in texts]
+
+
+class OpenAIEmbedder(Embedder):
+    """OpenAI API (network)"""
+
+    def __init__(self, client: Any, **spec):
+        super().__init__(**spec)
+        self.client = client
+        # text-embedding-3-* return shortened vectors on request (OPENAI_EMBEDDING_DIM)
+        self.options = {"dimensions": self.dimension} if openai_shortened(self.model) else {}
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        response = self.client.embeddings.create(model=self.model, input=texts, **self.options)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+class LocalEmbedder(Embedder):
+    """In-process feature-hashing embedder (NumPy, no network, deterministic)
+
+    Hashes word unigrams/bigrams and character trigrams into `dimension`
+    signed buckets with sublinear term frequency, then L2-normalizes. Far
+    weaker semantically than a neural model, but similar texts land close
+    together, it costs microseconds, and identical input gives identical
+    vectors across processes (crc32, not Python's salted hash()).
+    """
+
+    client = None
+
+    def __init__(self, **spec):
+        super().__init__(**spec)
+        import numpy as np
+        self.np = np
+
+    def _features(self, text: str) -> list[str]:
+        words = text.lower().split()
+        features = [f"w:{w}" for w in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        np = self.np
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter(
+                (zlib.crc32(f.encode()) for f in self._features(text)), dtype=np.uint32
+            )
+            if hashes.size == 0:
+                continue
+            buckets = (hashes % self.dimension).astype(np.int64)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], buckets, signs)
+
+        # Sublinear tf, then unit length for cosine
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+        return matrix.tolist()
+
+
+@dataclass
+class ProviderSpec:
+    """Registered embedding provider and its limits"""
+    name: str
+    model: str
+    dimension: int          # Vector size the collection must be created with (0 = ask probe)
+    max_batch: int          # Texts per request
+    max_input_chars: int    # Longer inputs are truncated
+    factory: Callable[["ProviderSpec"], Embedder]
+    probe: Optional[Callable[["ProviderSpec"], int]] = None  # Finds the dimension on first use
+
+    def limits(self) -> dict:
+        return {
+            "provider": self.name,
+            "model": self.model,
+            "dimension": self.dimension,
+            "max_batch": self.max_batch,
+            "max_input_chars": self.max_input_chars
+        }
+
+
+EMBEDDING_PROVIDERS: dict[str, ProviderSpec] = {}
+
+def register_provider(spec: ProviderSpec):
+    """Add (or replace) an embedding provider"""
+    EMBEDDING_PROVIDERS[spec.name] = spec
+
+
+# Output size of common Ollama embedding models (untagged or :latest)
+OLLAMA_MODEL_DIMENSIONS = {
+    "nomic-embed-text": 768,
+    "mxbai-embed-large": 1024,
+    "bge-m3": 1024,
+    "bge-large": 1024,
+    "all-minilm": 384,
+    "embeddinggemma": 768
+}
+
+def ollama_model_dimension(model: str) -> int:
+    """OLLAMA_EMBEDDING_DIM, else the known size of the model (0 = unknown)"""
+    if OLLAMA_EMBEDDING_DIM:
+        return OLLAMA_EMBEDDING_DIM
+    name, _, tag = model.partition(":")
+    return OLLAMA_MODEL_DIMENSIONS.get(name, 0) if tag in ("", "latest") else 0
+
+def _probe_ollama(spec: ProviderSpec) -> int:
+    """Embed one word to learn the model's vector size"""
+    try:
+        import ollama
+        client = ollama.Client(host=OLLAMA_BASE_URLS[0], timeout=EMBEDDING_TIMEOUT)
+        if hasattr(client, "embed"):
+            return len(client.embed(model=spec.model, input=["dimension"])['embeddings'][0])
+        return len(client.embeddings(model=spec.model, prompt="dimension")['embedding'])
+    except Exception as e:
+        raise EmbeddingConfigError(
+            f"Could not get the vector size of {spec.model} from Ollama ({e}). Set OLLAMA_EMBEDDING_DIM"
+        )
+
+def _create_ollama(spec: ProviderSpec) -> Embedder:
+    try:
+        import ollama
+    except ImportError:
+        raise EmbeddingConfigError("ollama library not installed. Run: pip install ollama")
+    # A single endpoint has nothing to fail over to: no circuit breaking
+    balanced = len(OLLAMA_BASE_URLS) > 1
+    pool = EndpointPool(
+        urls=OLLAMA_BASE_URLS,
+        client_factory=lambda url: ollama.Client(host=url, timeout=EMBEDDING_TIMEOUT),
+        health_check=lambda client: client.list(),
+        failure_threshold=EMBEDDING_CIRCUIT_FAILURES if balanced else 0,
+        cooldown=EMBEDDING_CIRCUIT_COOLDOWN,
+        health_interval=EMBEDDING_HEALTH_INTERVAL if balanced else 0,
+        hedge=EMBEDDING_HEDGE,
+        hedge_min_delay=EMBEDDING_HEDGE_MIN_MS / 1000
+    )
+    return OllamaEmbedder(pool, **spec.limits())
+
+# Output size of OpenAI embedding models
+OPENAI_MODEL_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536
+}
+
+def openai_model_dimension(model: str) -> int:
+    """OPENAI_EMBEDDING_DIM, else the known size of the model (0 = unknown)"""
+    return OPENAI_EMBEDDING_DIM or OPENAI_MODEL_DIMENSIONS.get(model, 0)
+
+def openai_shortened(model: str) -> bool:
+    """Whether OPENAI_EMBEDDING_DIM asks a text-embedding-3 model for shorter vectors"""
+    return (
+        bool(OPENAI_EMBEDDING_DIM) and model.startswith("text-embedding-3")
+        and OPENAI_EMBEDDING_DIM != OPENAI_MODEL_DIMENSIONS.get(model)
+    )
+
+def _openai_client():
+    try:
+        from openai import OpenAI
+    except ImportError:
+        raise EmbeddingConfigError("openai library not installed. Run: pip install openai")
+    if not OPENAI_API_KEY:
+        raise EmbeddingConfigError("OPENAI_API_KEY not set in .env")
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+def _probe_openai(spec: ProviderSpec) -> int:
+    """Embed one word to learn the model's vector size"""
+    client = _openai_client()
+    try:
+        return len(client.embeddings.create(model=spec.model, input=["dimension"]).data[0].embedding)
+    except Exception as e:
+        raise EmbeddingConfigError(
+            f"Could not get the vector size of {spec.model} from OpenAI ({e}). Set OPENAI_EMBEDDING_DIM"
+        )
+
+def _create_openai(spec: ProviderSpec) -> Embedder:
+    return OpenAIEmbedder(_openai_client(), **spec.limits())
+
+def _create_local(spec: ProviderSpec) -> Embedder:
+    try:
+        import numpy
+    except ImportError:
+        raise EmbeddingConfigError("numpy not installed. Run: pip install numpy")
+    return LocalEmbedder(**spec.limits())
+
+
+register_provider(ProviderSpec(
+    name="ollama", model=OLLAMA_MODEL,
+    dimension=ollama_model_dimension(OLLAMA_MODEL),
+    max_batch=64, max_input_chars=8000,
+    factory=_create_ollama, probe=_probe_ollama
+))
+register_provider(ProviderSpec(
+    name="openai", model=OPENAI_MODEL,
+    dimension=openai_model_dimension(OPENAI_MODEL),
+    max_batch=256, max_input_chars=30000,
+    factory=_create_openai, probe=_probe_openai
+))
+register_provider(ProviderSpec(
+    name="local", model=f"hashing-{LOCAL_EMBEDDING_DIM}",
+    dimension=LOCAL_EMBEDDING_DIM,
+    max_batch=1024, max_input_chars=100000,
+    factory=_create_local
+))
+
+# Vector dimensions based on embedding provider (0 = probed by get_vector_size())
+VECTOR_DIMENSIONS = {name: spec.dimension for name, spec in EMBEDDING_PROVIDERS.items()}
+
+
+def get_provider_spec(provider: str = EMBEDDING_PROVIDER) -> ProviderSpec:
+    """Spec of a provider, its dimension probed once if not known up front"""
+    if provider not in EMBEDDING_PROVIDERS:
+        raise EmbeddingConfigError(
+            f"Unknown EMBEDDING_PROVIDER: {provider} (expected one of {sorted(EMBEDDING_PROVIDERS)})"
+        )
+    spec = EMBEDDING_PROVIDERS[provider]
+    if not spec.dimension and spec.probe:
+        spec.dimension = spec.probe(spec)
+    return spec
+
+def get_vector_size(provider: str = EMBEDDING_PROVIDER) -> int:
+    """Vector dimension for a provider (without initializing it; unknown
+    Ollama models are asked once)"""
+    return get_provider_spec(provider).dimension
+
+def create_embedder(provider: str = EMBEDDING_PROVIDER) -> Embedder:
+    """Import the provider SDK and build its client
+
+    Raises:
+        EmbeddingConfigError: SDK missing, API key missing or unknown provider
+    """
+    spec = get_provider_spec(provider)
+    embedder = spec.factory(spec)
+    print(f"✓ Using {spec.name} embeddings: {spec.model} ({spec.dimension}D)", file=sys.stderr)
+    return embedder
+
+
+_embedder: Optional[Embedder] = None
+_embedder_lock = threading.Lock()
+
+def get_embedder() -> Embedder:
+    """Get the process-wide embedder, creating it on first use"""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = create_embedder()
+    return _embedder
+
+def generate_embedding(text: str) -> list[float]:
+    """Generate embedding vector for text"""
+    return get_embedder().embed(text)
+
+def generate_embeddings(texts: list[str]) -> list[list[float]]:
+    """Generate embedding vectors for many texts in provider-sized batches"""
+    return get_embedder().embed_batch(texts)
+
+_query_vectors: "OrderedDict[str, list[float]]" = OrderedDict()
+_query_lock = threading.Lock()
+
+def embed_query(query: str) -> list[float]:
+    """Embedding of a search query, remembered for QUERY_CACHE_SIZE recent queries
+
+    Paging through a search (offset / cursor) reuses the vector instead of
+    paying for the embedding again. Do not modify the returned list.
+    """
+    with _query_lock:
+        vector = _query_vectors.get(query)
+        if vector is not None:
+            _query_vectors.move_to_end(query)
+    QUERY_CACHE_LOOKUPS.inc(result="hit" if vector is not None else "miss")
+    if vector is not None:
+        return vector
+    vector = generate_embedding(query)
+    if QUERY_CACHE_SIZE > 0:
+        with _query_lock:
+            _query_vectors[query] = vector
+            while len(_query_vectors) > QUERY_CACHE_SIZE:
+                _query_vectors.popitem(last=False)
+    return vector
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Hive-Mind Core - Shared Qdrant client factory and collection helpers
+The Qdrant client (and qdrant_client itself, ~1s to import) is only
+loaded when something actually talks to the collection
+"""
+
+import os
+import re
+import time
+import atexit
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+try:
+    from .config import (
+        STORAGE_BACKEND, QDRANT_PATH, QDRANT_URL, QDRANT_API_KEY, COLLECTION_NAME, BRANCH_PARTITIONING,
+        QDRANT_PREFER_GRPC, QDRANT_GRPC_PORT, QDRANT_TIMEOUT, QDRANT_POOL_SIZE,
+        QDRANT_KEEPALIVE_CONNECTIONS, QDRANT_KEEPALIVE_EXPIRY, QDRANT_GRPC_KEEPALIVE_MS
+    )
+    from .metrics import instrument_client
+except ImportError:
+    from config import (
+        STORAGE_BACKEND, QDRANT_PATH, QDRANT_URL, QDRANT_API_KEY, COLLECTION_NAME, BRANCH_PARTITIONING,
+        QDRANT_PREFER_GRPC, QDRANT_GRPC_PORT, QDRANT_TIMEOUT, QDRANT_POOL_SIZE,
+        QDRANT_KEEPALIVE_CONNECTIONS, QDRANT_KEEPALIVE_EXPIRY, QDRANT_GRPC_KEEPALIVE_MS
+    )
+    from metrics import instrument_client
+
+_qdrant_client = None
+_client_lock = threading.Lock()
+
+# Payload fields indexed for filtering (server backend only - the embedded
+# backend scans payloads and ignores indexes)
+PAYLOAD_INDEXES = {
+    "branch_id": "keyword",
+    "type": "keyword",
+    "skill_name": "keyword",
+    "timestamp": "datetime",
+    "created_at": "float",
+    "parent_id": "keyword"
+}
+
+# branch_id index layouts (BRANCH_PARTITIONING). A tenant index makes Qdrant
+# group each branch's points into the same segments, so per-branch searches,
+# scrolls and counts skip the rest. Custom shard keys are not used: they need
+# distributed mode and one shard per branch, which suits a few large tenants,
+# not hundreds of small branches.
+BRANCH_PARTITIONINGS = ("index", "tenant")
+
+
+class SerializedClient:
+    """Proxy that serializes calls into a QdrantClient
+
+    qdrant-client's local mode has no internal locking, while the MCP server
+    and Slack bridge call it from worker threads.
+    """
+
+    embedded = True
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+        return call
+
+
+def create_server_client(prefer_grpc: Optional[bool] = None):
+    """Build a QdrantClient with the configured transport and pool settings
+
+    Args:
+        prefer_grpc: Override QDRANT_PREFER_GRPC (used by the transport benchmark)
+
+    Note: qdrant-client disables HTTP keep-alive for localhost by default;
+    explicit limits keep warm connections for every host.
+    """
+    import httpx
+    from qdrant_client import QdrantClient
+
+    if prefer_grpc is None:
+        prefer_grpc = QDRANT_PREFER_GRPC
+
+    return QdrantClient(
+        url=QDRANT_URL,
+        api_key=QDRANT_API_KEY,
+        prefer_grpc=prefer_grpc,
+        grpc_port=QDRANT_GRPC_PORT,
+        timeout=QDRANT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=QDRANT_POOL_SIZE,
+            max_keepalive_connections=QDRANT_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=QDRANT_KEEPALIVE_EXPIRY
+        ),
+        grpc_options={
+            "grpc.keepalive_time_ms": QDRANT_GRPC_KEEPALIVE_MS,
+            "grpc.keepalive_timeout_ms": 10000,
+            "grpc.keepalive_permit_without_calls": 1,
+            "grpc.http2.max_pings_without_data": 0
+        }
+    )
+
+def create_embedded_client(path: Optional[str] = None):
+    """Build an in-process QdrantClient (no service required)
+
+    Args:
+        path: Storage directory, or ":memory:"; defaults to QDRANT_PATH.
+              A directory can only be opened by one process at a time.
+    """
+    from qdrant_client import QdrantClient
+
+    path = path or QDRANT_PATH
+    if path == ":memory:":
+        client = QdrantClient(location=":memory:")
+    else:
+        os.makedirs(path, exist_ok=True)
+        client = QdrantClient(path=path, force_disable_check_same_thread=True)
+    # Flush and release the directory lock before interpreter teardown
+    atexit.register(client.close)
+    return SerializedClient(client)
+
+# Pluggable storage backends: name -> factory(**options)
+STORAGE_BACKENDS: dict[str, Callable] = {
+    "server": create_server_client,
+    "embedded": create_embedded_client
+}
+
+def create_qdrant_client(backend: Optional[str] = None, **options):
+    """Build a client for a storage backend (default: STORAGE_BACKEND)
+
+    Every backend exposes the QdrantClient API, so callers never branch on it.
+    """
+    backend = backend or STORAGE_BACKEND
+    factory = STORAGE_BACKENDS.get(backend)
+    if factory is None:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend} (expected one of {sorted(STORAGE_BACKENDS)})")
+    return factory(**options)
+
+def describe_backend() -> str:
+    """One-line description of where memories are stored"""
+    if STORAGE_BACKEND == "embedded":
+        return f"embedded Qdrant at {QDRANT_PATH}"
+    return f"Qdrant at {QDRANT_URL} ({'gRPC' if QDRANT_PREFER_GRPC else 'REST'})"
+
+def payload_index_schema(field_name: str, partitioning: str = BRANCH_PARTITIONING):
+    """Index schema for a PAYLOAD_INDEXES field under a branch partitioning"""
+    from qdrant_client.models import KeywordIndexParams
+
+    if partitioning not in BRANCH_PARTITIONINGS:
+        raise ValueError(f"Unknown BRANCH_PARTITIONING: {partitioning} (expected one of {list(BRANCH_PARTITIONINGS)})")
+    if field_name == "branch_id" and partitioning == "tenant":
+        return KeywordIndexParams(type="keyword", is_tenant=True)
+    return PAYLOAD_INDEXES[field_name]
+
+def create_collection_schema(client, vector_size: int, collection_name: str = COLLECTION_NAME,
+                             partitioning: str = BRANCH_PARTITIONING) -> list[str]:
+    """Create the hive-mind collection and its payload indexes
+
+    Returns:
+        Names of the payload fields that were indexed
+    """
+    from qdrant_client.models import Distance, VectorParams
+
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
+    )
+
+    if getattr(client, "embedded", False):
+        return []
+
+    for field_name in PAYLOAD_INDEXES:
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=payload_index_schema(field_name, partitioning)
+        )
+    return list(PAYLOAD_INDEXES)
+
+def get_branch_partitioning(client, collection_name: str = COLLECTION_NAME) -> Optional[str]:
+    """Current branch_id index layout ("index"/"tenant"), None if not indexed"""
+    info = client.get_collection(collection_name=collection_name).payload_schema.get("branch_id")
+    if info is None:
+        return None
+    return "tenant" if getattr(info.params, "is_tenant", False) else "index"
+
+def set_branch_partitioning(client, partitioning: str, collection_name: str = COLLECTION_NAME):
+    """Rebuild the branch_id index of an existing collection with a new layout
+
+    Points and vectors are untouched. Until the new index is built, branch
+    filters are answered by scanning payloads (correct, just slower).
+    """
+    schema = payload_index_schema("branch_id", partitioning)
+    if get_branch_partitioning(client, collection_name) is not None:
+        client.delete_payload_index(collection_name=collection_name, field_name="branch_id", wait=True)
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="branch_id",
+        field_schema=schema,
+        wait=True
+    )
+
+def ensure_collection(client, vector_size: int) -> bool:
+    """Create the collection if missing
+
+    Returns:
+        True if it was created
+    """
+    if client.collection_exists(COLLECTION_NAME):
+        return False
+    create_collection_schema(client, vector_size)
+    return True
+
+def get_qdrant_client():
+    """Get the process-wide QdrantClient, creating it on first use
+
+    Shared by every thread in the process (MCP handlers, Slack workers,
+    caches, scripts) so they all reuse one connection pool / gRPC channel.
+    The embedded backend creates its collection on first use, since there
+    is no separate server to run init_schema.py against. Every call is
+    timed into the jarvis_qdrant_duration_seconds histogram.
+    """
+    global _qdrant_client
+    if _qdrant_client is None:
+        with _client_lock:
+            if _qdrant_client is None:
+                client = create_qdrant_client()
+                if STORAGE_BACKEND == "embedded":
+                    try:
+                        from .embeddings import get_vector_size
+                    except ImportError:
+                        from embeddings import get_vector_size
+                    ensure_collection(client, get_vector_size())
+                _qdrant_client = instrument_client(client)
+    return _qdrant_client
+
+def generate_point_id(text: str, branch_id: str) -> int:
+    """Generate deterministic ID from content + branch (for deduplication)"""
+    content = f"{text}{branch_id}"
+    hash_obj = hashlib.sha256(content.encode())
+    return int(hash_obj.hexdigest()[:16], 16)  # Use first 16 hex chars as int
+
+def memory_timestamps(epoch: Optional[float] = None) -> dict:
+    """Time fields for a new memory payload
+
+    timestamp is local ISO time for display (and older tooling); created_at
+    is UTC epoch seconds, indexed for since/until range filters.
+    """
+    epoch = time.time() if epoch is None else epoch
+    return {"timestamp": datetime.fromtimestamp(epoch).isoformat(), "created_at": epoch}
+
+def epoch_from_timestamp(value) -> Optional[float]:
+    """Epoch seconds of a stored ISO timestamp (naive values are local time)"""
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+_RELATIVE_TIME = re.compile(r"^(\d+(?:\.\d+)?)\s*([mhdw])$")
+_TIME_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+def parse_time_bound(value: str, now: Optional[datetime] = None) -> float:
+    """Parse a since/until bound into epoch seconds
+
+    Accepts relative ages ("30m", "12h", "7d", "2w" ago), "today", "now" and
+    ISO dates or datetimes (local time unless they carry an offset).
+
+    Raises:
+        ValueError: unrecognized value
+    """
+    now = now or datetime.now()
+    text = str(value).strip().lower()
+    match = _RELATIVE_TIME.match(text)
+    if match:
+        return (now - timedelta(**{_TIME_UNITS[match.group(2)]: float(match.group(1))})).timestamp()
+    if text == "now":
+        return now.timestamp()
+    if text == "today":
+        return now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    epoch = epoch_from_timestamp(str(value).strip())
+    if epoch is None:
+        raise ValueError(f"Invalid time {value!r} (use e.g. 7d, 12h, today or 2024-06-01)")
+    return epoch
+
+def time_window_conditions(since: Optional[float] = None, until: Optional[float] = None) -> list:
+    """created_at range conditions for memories stored in [since, until)"""
+    from qdrant_client.models import FieldCondition, Range
+
+    if since is None and until is None:
+        return []
+    return [FieldCondition(key="created_at", range=Range(gte=since, lt=until))]
+
+def memory_conditions(since: Optional[float] = None, until: Optional[float] = None) -> list:
+    """Conditions counting each memory once: the extra chunks of a long
+    memory (points with parent_id) are left out"""
+    from qdrant_client.models import IsEmptyCondition, PayloadField
+
+    return [IsEmptyCondition(is_empty=PayloadField(key="parent_id")), *time_window_conditions(since, until)]
+
+def count_memories(since: Optional[float] = None, until: Optional[float] = None) -> int:
+    """Exact number of memories, optionally only those stored in [since, until)"""
+    from qdrant_client.models import Filter
+
+    return get_qdrant_client().count(
+        collection_name=COLLECTION_NAME,
+        count_filter=Filter(must=memory_conditions(since, until)),
+        exact=True
+    ).count
+
+def count_branch(branch_id: str, since: Optional[float] = None, until: Optional[float] = None) -> int:
+    """Exact number of memories in a branch (served from the branch_id index)"""
+    from qdrant_client.models import Filter, FieldCondition, MatchValue
+
+    return get_qdrant_client().count(
+        collection_name=COLLECTION_NAME,
+        count_filter=Filter(
+            must=[
+                FieldCondition(key="branch_id", match=MatchValue(value=branch_id)),
+                *memory_conditions(since, until)
+            ]
+        ),
+        exact=True
+    ).count
+
+def get_branch_counts(max_branches: int = 10000, since: Optional[float] = None,
+                      until: Optional[float] = None) -> dict[str, int]:
+    """Exact memory count per branch, optionally only memories stored in [since, until)
+
+    Uses a facet over the branch_id keyword index, falling back to paging
+    branch_id-only payloads on Qdrant servers without the facet API (< 1.12).
+    """
+    from qdrant_client.models import Filter
+
+    client = get_qdrant_client()
+    memories = Filter(must=memory_conditions(since, until))
+    try:
+        response = client.facet(
+            collection_name=COLLECTION_NAME,
+            key="branch_id",
+            facet_filter=memories,
+            limit=max_branches,
+            exact=True
+        )
+        return {hit.value: hit.count for hit in response.hits}
+    except Exception:
+        pass
+
+    branches = {}
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=COLLECTION_NAME,
+            scroll_filter=memories,
+            limit=1000,
+            offset=offset,
+            with_payload=["branch_id"],
+            with_vectors=False
+        )
+        for point in points:
+            branch = (point.payload or {}).get("branch_id", "unknown")
+            branches[branch] = branches.get(branch, 0) + 1
+        if offset is None:
+            return branches
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Hot Tier - In-RAM index of the most recent / most used memories
+Searches are answered from a NumPy matrix first (one matrix-vector product,
+well under a millisecond for tens of thousands of memories) and only go to
+Qdrant for the long tail:
+
+- Every hot result scores >= HOT_TIER_MIN_SCORE: answered from RAM
+- The hot tier holds the whole collection: answered from RAM (exact)
+- Otherwise Qdrant is queried and both result sets are merged
+
+Memories returned by Qdrant are promoted; when full, the memories unused
+for longest are demoted (a memory's age counts as its last use until then).
+Memories stored by other processes arrive with the periodic refresh. Each
+refresh also compares Qdrant's point count with the rows in RAM: writes it
+could not see (older timestamps, restores) or deletions by other processes
+make them differ, and the tier is reloaded or stops answering exactly.
+"""
+
+import sys
+import time
+import threading
+from typing import Optional
+
+try:
+    from .config import COLLECTION_NAME, HOT_TIER_SIZE, HOT_TIER_MIN_SCORE, HOT_TIER_REFRESH_SECONDS
+    from .hivemind import get_qdrant_client, epoch_from_timestamp, time_window_conditions
+    from .metrics import REGISTRY
+    from .memory_text import SEARCH_FIELDS, make_preview, memory_text, fill_previews, collapse_chunks
+except ImportError:
+    from config import COLLECTION_NAME, HOT_TIER_SIZE, HOT_TIER_MIN_SCORE, HOT_TIER_REFRESH_SECONDS
+    from hivemind import get_qdrant_client, epoch_from_timestamp, time_window_conditions
+    from metrics import REGISTRY
+    from memory_text import SEARCH_FIELDS, make_preview, memory_text, fill_previews, collapse_chunks
+
+HOT_TIER_SEARCHES = REGISTRY.counter(
+    "jarvis_hot_tier_searches_total", "Searches by where they were answered", ("tier",)
+)
+HOT_TIER_LATENCY = REGISTRY.histogram(
+    "jarvis_hot_tier_search_duration_seconds", "In-RAM hot tier search latency", ("outcome",)
+)
+
+# Search candidates per requested result, so chunks collapsing into one
+# memory still leave `limit` distinct memories
+CHUNK_OVERFETCH = 3
+
+_hot_index = None
+_index_lock = threading.Lock()
+
+
+def _project(payload: dict) -> dict:
+    """Keep only what search results show (bodies stay in Qdrant)"""
+    projected = {key: payload[key] for key in SEARCH_FIELDS if key in payload}
+    if "preview" not in projected and ("text" in payload or "text_zstd" in payload):
+        projected["preview"] = make_preview(memory_text(payload))
+    return projected
+
+
+def _epoch(payload: dict) -> float:
+    epoch = payload.get("created_at")
+    if epoch is None:
+        epoch = epoch_from_timestamp(payload.get("timestamp", ""))
+    return float(epoch or 0.0)
+
+
+class HotIndex:
+    """Fixed-capacity matrix of unit vectors with payloads and LRU demotion"""
+
+    def __init__(self, capacity: int, vector_size: int, collection_name: str = COLLECTION_NAME):
+        import numpy as np
+        self.np = np
+        self.capacity = capacity
+        self.collection_name = collection_name
+        self.vectors = np.zeros((capacity, vector_size), dtype=np.float32)
+        self.last_used = np.full(capacity, -np.inf)     # -inf marks a free row
+        self.branches = np.full(capacity, -1, dtype=np.int32)
+        self.types = np.full(capacity, -1, dtype=np.int32)
+        self.created = np.zeros(capacity)                # epoch seconds
+        self.ids: list = [None] * capacity
+        self.payloads: list = [None] * capacity
+        self.rows: dict = {}                            # point id -> row
+        self.codes: dict[str, int] = {}                 # branch/type value -> code
+        self.count = 0
+        self.loaded = False
+        # True while every memory in the collection is in RAM
+        self.complete = False
+        self.newest = ""                                # max timestamp seen
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _code(self, value) -> int:
+        if value is None:
+            return -1
+        return self.codes.setdefault(str(value), len(self.codes))
+
+    def add(self, points: list, used_at: Optional[float] = None):
+        """Insert or refresh points (Records/ScoredPoints with vectors)
+
+        used_at=None keeps a memory's own timestamp as its last use, so a
+        bulk load ranks by recency; promotions pass the current time.
+        """
+        np = self.np
+        points = [p for p in points if p.vector is not None][-self.capacity:]
+        if not points:
+            return
+        with self._lock:
+            new = sum(1 for p in points if p.id not in self.rows)
+            free = self.capacity - len(self.rows)
+            if new > free:
+                # Demote the least recently used rows
+                occupied = np.flatnonzero(self.last_used != -np.inf)
+                oldest = np.argpartition(self.last_used[occupied], new - free - 1)[:new - free]
+                for row in occupied[oldest].tolist():
+                    self.rows.pop(self.ids[row], None)
+                    self.ids[row] = None
+                    self.payloads[row] = None
+                    self.last_used[row] = -np.inf
+                self.complete = False
+            free_rows = iter(np.flatnonzero(self.last_used == -np.inf).tolist())
+
+            for point in points:
+                row = self.rows.get(point.id)
+                if row is None:
+                    row = next(free_rows)
+                    self.rows[point.id] = row
+                    self.ids[row] = point.id
+                payload = _project(point.payload or {})
+                vector = np.asarray(point.vector, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                self.vectors[row] = vector / norm if norm else vector
+                self.payloads[row] = payload
+                self.branches[row] = self._code(payload.get("branch_id"))
+                self.types[row] = self._code(payload.get("type"))
+                self.created[row] = _epoch(payload)
+                self.last_used[row] = used_at if used_at is not None else self.created[row]
+                self.newest = max(self.newest, payload.get("timestamp") or "")
+            self.count = len(self.rows)
+
+    def forget(self, ids: list):
+        """Drop deleted memories"""
+        with self._lock:
+            for point_id in ids:
+                row = self.rows.pop(point_id, None)
+                if row is not None:
+                    self.ids[row] = None
+                    self.payloads[row] = None
+                    self.last_used[row] = -self.np.inf
+            self.count = len(self.rows)
+
+    def search(self, query_vector: list, limit: int, branches: Optional[list[str]] = None,
+               memory_type: Optional[str] = None, since: Optional[float] = None,
+               until: Optional[float] = None, score_threshold: Optional[float] = None) -> list:
+        """Top `limit` hot memories by cosine similarity, as ScoredPoints"""
+        from qdrant_client.models import ScoredPoint
+        np = self.np
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        with self._lock:
+            scores = self.vectors @ query
+            mask = self.last_used != -np.inf
+            if branches:
+                codes = [self.codes[b] for b in branches if b in self.codes]
+                mask &= np.isin(self.branches, codes)
+            if memory_type:
+                mask &= self.types == self.codes.get(memory_type, -2)
+            if since is not None:
+                mask &= self.created >= since
+            if until is not None:
+                mask &= self.created < until
+            if score_threshold is not None:
+                mask &= scores >= score_threshold
+            candidates = np.flatnonzero(mask)
+            if not len(candidates):
+                return []
+            if len(candidates) > limit:
+                top = np.argpartition(scores[candidates], -limit)[-limit:]
+                candidates = candidates[top]
+            candidates = candidates[np.argsort(-scores[candidates])]
+            self.last_used[candidates] = time.time()
+            return [
+                ScoredPoint(id=self.ids[row], version=0, score=float(scores[row]), payload=self.payloads[row])
+                for row in candidates.tolist()
+            ]
+
+    def load(self):
+        """Fill the tier with the newest memories (runs on the refresh thread)"""
+        from qdrant_client.models import OrderBy, Direction
+
+        started = time.perf_counter()
+        points, _ = get_qdrant_client().scroll(
+            collection_name=self.collection_name,
+            limit=self.capacity,
+            order_by=OrderBy(key="timestamp", direction=Direction.DESC),
+            with_payload=SEARCH_FIELDS,
+            with_vectors=True
+        )
+        # Oldest first, so the newest survive if the batch is over capacity
+        self.add(points[::-1])
+        total = get_qdrant_client().count(collection_name=self.collection_name, exact=True).count
+        with self._lock:
+            if total <= self.capacity:
+                # Everything was read: rows not in it were deleted elsewhere
+                loaded = {point.id for point in points}
+                self.forget([point_id for point_id in self.rows if point_id not in loaded])
+            self.complete = total == self.count
+            self.loaded = True
+        print(f"✓ Hot tier: {self.count} memories in RAM ({self.vectors.nbytes / 1024 ** 2:.0f} MB, "
+              f"{time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+    def refresh(self):
+        """Pull memories stored since the newest one in RAM (e.g. by other processes)
+
+        Then check the tier against Qdrant's count: a mismatch means writes
+        the timestamp filter cannot see or deletions, so a collection that
+        fits is reloaded and a larger one is no longer treated as complete.
+        """
+        from qdrant_client.models import Filter, FieldCondition, DatetimeRange
+
+        if not self.newest:
+            return self.load()
+        points, _ = get_qdrant_client().scroll(
+            collection_name=self.collection_name,
+            scroll_filter=Filter(must=[
+                FieldCondition(key="timestamp", range=DatetimeRange(gt=self.newest))
+            ]),
+            limit=self.capacity,
+            with_payload=SEARCH_FIELDS,
+            with_vectors=True
+        )
+        self.add(points)
+        total = get_qdrant_client().count(collection_name=self.collection_name, exact=True).count
+        with self._lock:
+            in_sync = total == self.count
+            if not in_sync:
+                self.complete = False
+        if not in_sync and total <= self.capacity:
+            self.load()
+
+    def start(self, interval: float = HOT_TIER_REFRESH_SECONDS):
+        """Load, then refresh every `interval` seconds from a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="hot-tier", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.refresh() if self.loaded else self.load()
+            except Exception as e:
+                print(f"⚠️  Hot tier refresh failed: {e}", file=sys.stderr)
+            self._stop.wait(interval)
+
+
+def get_hot_index() -> Optional[HotIndex]:
+    """Process-wide hot tier, started on first use (None when HOT_TIER_SIZE=0)"""
+    global _hot_index
+    if HOT_TIER_SIZE <= 0:
+        return None
+    if _hot_index is None:
+        with _index_lock:
+            if _hot_index is None:
+                try:
+                    from .embeddings import get_vector_size
+                except ImportError:
+                    from embeddings import get_vector_size
+                index = HotIndex(HOT_TIER_SIZE, get_vector_size())
+                index.start()
+                _hot_index = index
+    return _hot_index
+
+
+def promote_memories(points: list):
+    """Add freshly stored points (with vectors) to the hot tier, if one is running"""
+    if _hot_index is not None:
+        _hot_index.add(points, used_at=time.time())
+
+
+def forget_memories(ids: list):
+    """Drop deleted memories from the hot tier, if one is running"""
+    if _hot_index is not None:
+        _hot_index.forget(ids)
+
+
+def search_memories(query_vector: list, limit: int = 5, branches: Optional[list[str]] = None,
+                    memory_type: Optional[str] = None, since: Optional[float] = None,
+                    until: Optional[float] = None, score_threshold: Optional[float] = None,
+                    offset: int = 0, collection_name: str = COLLECTION_NAME) -> list:
+    """Vector search through the hot tier, falling back to Qdrant
+
+    offset skips that many memories (not points), so pages stay consistent
+    when chunks collapse; a page costs a top-(offset + limit) search.
+    score_threshold drops weaker hits in Qdrant, before they are transferred.
+
+    Returns:
+        ScoredPoints, best first, with SEARCH_FIELDS payloads (no vectors),
+        one per memory: a chunked memory appears once, under its own ID,
+        with the preview of its best chunk. Fetch a body with memory_text.memory_text() / the get_memory tool.
+    """
+    from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny
+
+    index = get_hot_index() if collection_name == COLLECTION_NAME else None
+    wanted = offset + limit
+    # Chunks of one long memory can take several places; fetch extra, then collapse
+    fetch = wanted * CHUNK_OVERFETCH
+    hot = []
+    if index is not None and index.loaded:
+        with HOT_TIER_LATENCY.time():
+            hot = collapse_chunks(
+                index.search(query_vector, fetch, branches, memory_type, since, until, score_threshold), wanted
+            )
+        if index.complete:
+            HOT_TIER_SEARCHES.inc(tier="hot_exact")
+            return _with_previews(hot[offset:], collection_name)
+        if len(hot) >= wanted and hot[-1].score >= HOT_TIER_MIN_SCORE:
+            HOT_TIER_SEARCHES.inc(tier="hot")
+            return _with_previews(hot[offset:], collection_name)
+
+    conditions = []
+    if branches:
+        conditions.append(FieldCondition(key="branch_id", match=MatchAny(any=branches)))
+    if memory_type:
+        conditions.append(FieldCondition(key="type", match=MatchValue(value=memory_type)))
+    conditions.extend(time_window_conditions(since, until))
+
+    cold = get_qdrant_client().query_points(
+        collection_name=collection_name,
+        query=query_vector,
+        limit=fetch,
+        query_filter=Filter(must=conditions) if conditions else None,
+        score_threshold=score_threshold,
+        with_payload=SEARCH_FIELDS,
+        with_vectors=index is not None
+    ).points
+    if index is None:
+        return _with_previews(collapse_chunks(cold, wanted)[offset:], collection_name)
+
+    HOT_TIER_SEARCHES.inc(tier="merged")
+    index.add(cold, used_at=time.time())
+    for point in cold:
+        point.vector = None
+    merged = sorted(hot + cold, key=lambda p: -p.score)
+    return _with_previews(collapse_chunks(merged, wanted)[offset:], collection_name)
+
+
+def _with_previews(points: list, collection_name: str) -> list:
+    fill_previews(points, get_qdrant_client(), collection_name)
+    return points
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Memory Text - Previews, compressed bodies and chunks of memories
+Searches only display a preview, so every memory stores one and searches
+project the payload down to SEARCH_FIELDS. Bodies of TEXT_COMPRESS_MIN_CHARS
+or more are stored zstd-compressed (base64, as `text_zstd`) instead of
+`text`; read them back with memory_text() or the get_memory tool.
+
+Memories longer than CHUNK_THRESHOLD_CHARS are embedded as overlapping
+chunks. The first chunk is the memory itself (its usual ID and the whole
+body); the others only carry a preview of their passage and `parent_id`,
+and search collapses them back into the memory (collapse_chunks()).
+"""
+
+import base64
+import threading
+from typing import Optional
+
+try:
+    from .config import (
+        PREVIEW_CHARS, TEXT_COMPRESS_MIN_CHARS, TEXT_COMPRESS_LEVEL,
+        CHUNK_THRESHOLD_CHARS, CHUNK_CHARS, CHUNK_OVERLAP
+    )
+    from .chunking import chunk_text
+    from .hivemind import generate_point_id
+except ImportError:
+    from config import (
+        PREVIEW_CHARS, TEXT_COMPRESS_MIN_CHARS, TEXT_COMPRESS_LEVEL,
+        CHUNK_THRESHOLD_CHARS, CHUNK_CHARS, CHUNK_OVERLAP
+    )
+    from chunking import chunk_text
+    from hivemind import generate_point_id
+
+# Payload fields a search result needs (everything but the body)
+SEARCH_FIELDS = ["branch_id", "type", "timestamp", "created_at", "preview", "parent_id"]
+# Payload fields that hold the body, in either representation
+TEXT_FIELDS = ["text", "text_zstd"]
+# Payload fields of the chunk layout written by memory_points() (nothing else may set them)
+CHUNK_FIELDS = ["parent_id", "chunk_index", "chunk_count"]
+
+# zstandard (de)compressors are not safe to share between threads
+_codecs = threading.local()
+
+
+def _compressor():
+    import zstandard
+    if not hasattr(_codecs, "compressor"):
+        _codecs.compressor = zstandard.ZstdCompressor(level=TEXT_COMPRESS_LEVEL)
+    return _codecs.compressor
+
+
+def _decompressor():
+    import zstandard
+    if not hasattr(_codecs, "decompressor"):
+        _codecs.decompressor = zstandard.ZstdDecompressor()
+    return _codecs.decompressor
+
+
+def make_preview(text: str, chars: int = PREVIEW_CHARS) -> str:
+    return text[:chars]
+
+
+def text_fields(text: str) -> dict:
+    """Payload fields storing `text`: preview plus text or text_zstd
+
+    Compressed only when that is actually smaller after base64.
+    """
+    fields = {"preview": make_preview(text)}
+    if TEXT_COMPRESS_MIN_CHARS and len(text) >= TEXT_COMPRESS_MIN_CHARS:
+        raw = text.encode("utf-8")
+        encoded = base64.b64encode(_compressor().compress(raw)).decode("ascii")
+        if len(encoded) < len(raw):
+            fields["text_zstd"] = encoded
+            return fields
+    fields["text"] = text
+    return fields
+
+
+def memory_text(payload: Optional[dict]) -> str:
+    """Full body of a memory, whichever way it was stored"""
+    payload = payload or {}
+    if "text_zstd" in payload:
+        return _decompressor().decompress(base64.b64decode(payload["text_zstd"])).decode("utf-8")
+    return str(payload.get("text", ""))
+
+
+def memory_preview(payload: Optional[dict], chars: int = PREVIEW_CHARS) -> str:
+    payload = payload or {}
+    preview = payload.get("preview")
+    if preview is None:
+        preview = memory_text(payload)
+    return preview[:chars]
+
+
+def fill_previews(points: list, client, collection_name: str):
+    """Add preview to projected results of memories stored before previews existed
+
+    One retrieve of the bodies of just those points; no-op when all have one.
+    """
+    missing = [p for p in points if p.payload is not None and "preview" not in p.payload]
+    if not missing:
+        return
+    bodies = {
+        record.id: record.payload
+        for record in client.retrieve(
+            collection_name=collection_name,
+            ids=[p.id for p in missing],
+            with_payload=TEXT_FIELDS,
+            with_vectors=False
+        )
+    }
+    for point in missing:
+        point.payload["preview"] = make_preview(memory_text(bodies.get(point.id)))
+
+
+def memory_chunks(text: str) -> list[str]:
+    """Passages a memory is embedded as (just the text unless it is long)"""
+    if not CHUNK_THRESHOLD_CHARS or len(text) <= CHUNK_THRESHOLD_CHARS:
+        return [text]
+    return chunk_text(text, CHUNK_CHARS, CHUNK_OVERLAP) or [text]
+
+
+def chunk_point_id(memory_id: int, index: int, branch_id: str) -> int:
+    """ID of chunk `index` of a memory (chunk 0 is the memory itself)"""
+    return memory_id if index == 0 else generate_point_id(f"{memory_id}#{index}", branch_id)
+
+
+def memory_points(text: str, branch_id: str, payload: dict) -> list:
+    """Points storing one memory, embedded in one batch
+
+    Returns:
+        PointStructs, the memory itself first (ID generate_point_id(text, branch_id));
+        more than one when the text is chunked
+    """
+    from qdrant_client.models import PointStruct
+    try:
+        from .embeddings import generate_embeddings
+    except ImportError:
+        from embeddings import generate_embeddings
+
+    memory_id = generate_point_id(text, branch_id)
+    chunks = memory_chunks(text)
+    vectors = generate_embeddings(chunks)
+    payload = {"branch_id": branch_id, **payload}
+    if len(chunks) == 1:
+        return [PointStruct(id=memory_id, vector=vectors[0], payload={**text_fields(text), **payload})]
+
+    points = [PointStruct(
+        id=memory_id,
+        vector=vectors[0],
+        payload={**text_fields(text), **payload, "chunk_index": 0, "chunk_count": len(chunks)}
+    )]
+    for index in range(1, len(chunks)):
+        points.append(PointStruct(
+            id=chunk_point_id(memory_id, index, branch_id),
+            vector=vectors[index],
+            payload={
+                **payload,
+                "preview": make_preview(chunks[index]),
+                # Keyword: memory IDs can exceed Qdrant's signed integer range
+                "parent_id": str(memory_id),
+                "chunk_index": index,
+                "chunk_count": len(chunks)
+            }
+        ))
+    return points
+
+
+def memory_id_of(point) -> object:
+    """ID of the memory a point (or chunk) belongs to"""
+    parent = (point.payload or {}).get("parent_id")
+    if parent is None:
+        return point.id
+    return int(parent) if parent.isdigit() else parent
+
+
+def collapse_chunks(points: list, limit: int) -> list:
+    """Best-scoring point per memory, reported under the memory's ID
+
+    points must be sorted best first; the preview stays that of the best
+    matching chunk.
+    """
+    collapsed = []
+    seen = set()
+    for point in points:
+        memory_id = memory_id_of(point)
+        if memory_id in seen:
+            continue
+        seen.add(memory_id)
+        point.id = memory_id
+        collapsed.append(point)
+        if len(collapsed) == limit:
+            break
+    return collapsed
+
+
+def get_memory_record(point_id, client, collection_name: str):
+    """Record with the full payload of a memory (a chunk ID resolves to it), or None"""
+    records = client.retrieve(collection_name=collection_name, ids=[point_id], with_payload=True, with_vectors=False)
+    if records and "parent_id" in (records[0].payload or {}):
+        records = client.retrieve(
+            collection_name=collection_name, ids=[memory_id_of(records[0])], with_payload=True, with_vectors=False
+        )
+    return records[0] if records else None
+
+
+def update_stored_memory(text: str, branch_id: str, payload: dict, client, collection_name: str) -> tuple:
+    """Refresh the metadata of a memory already stored with this text and branch
+
+    IDs are deterministic, so a retrieve without vectors tells whether the
+    embedding round-trip can be skipped; the body and vectors stay as they are.
+
+    Returns:
+        (memory ID, points updated - i.e. embeddings avoided, 0 when the memory is new)
+    """
+    memory_id = generate_point_id(text, branch_id)
+    records = client.retrieve(
+        collection_name=collection_name, ids=[memory_id], with_payload=["chunk_count"], with_vectors=False
+    )
+    if not records:
+        return memory_id, 0
+    ids = [memory_id]
+    chunk_count = (records[0].payload or {}).get("chunk_count", 1)
+    if chunk_count > 1:
+        # Only chunks stored by memory_points() exist under these IDs
+        ids += [record.id for record in client.retrieve(
+            collection_name=collection_name,
+            ids=[chunk_point_id(memory_id, index, branch_id) for index in range(1, chunk_count)],
+            with_payload=False,
+            with_vectors=False
+        )]
+    client.set_payload(collection_name=collection_name, payload={"branch_id": branch_id, **payload}, points=ids)
+    return memory_id, len(ids)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Metrics - Lightweight counters and latency histograms
+Rendered in the Prometheus text format at /metrics (Slack bridge) or on
+METRICS_PORT for the stdio MCP server. No dependencies; recording is a
+lock, a bisect and two additions, so it is safe on the hot path.
+"""
+
+import sys
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+try:
+    from .config import METRICS_ENABLED
+    from .profiler import PROFILING_ENABLED, phase
+except ImportError:
+    from config import METRICS_ENABLED
+    from profiler import PROFILING_ENABLED, phase
+
+# Seconds; spans sub-millisecond hot-tier hits up to slow cold-start embeddings
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Latency histogram (seconds) with labels"""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = (),
+                 buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # key -> [per-bucket counts (+1 for +Inf), sum]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += seconds
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the block's duration with outcome="ok"/"error" added to labels"""
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            self.observe(time.perf_counter() - started, outcome=outcome, **labels)
+
+    def snapshot(self) -> dict[tuple, tuple[int, float]]:
+        """{label values: (count, sum)}"""
+        with self._lock:
+            return {key: (sum(counts), total) for key, (counts, total) in self._series.items()}
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Named collection of metrics"""
+
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: tuple, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, help: str, labelnames: tuple = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: tuple = (), **kwargs) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, **kwargs)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TOOL_LATENCY = REGISTRY.histogram(
+    "jarvis_tool_duration_seconds", "MCP tool call latency", ("tool", "outcome")
+)
+EMBEDDING_LATENCY = REGISTRY.histogram(
+    "jarvis_embedding_duration_seconds", "Embedding request latency", ("provider", "outcome")
+)
+EMBEDDING_TEXTS = REGISTRY.counter(
+    "jarvis_embedding_texts_total", "Texts embedded", ("provider",)
+)
+EMBEDDINGS_AVOIDED = REGISTRY.counter(
+    "jarvis_embeddings_avoided_total", "Texts not embedded because the memory was already stored", ("source",)
+)
+QUERY_CACHE_LOOKUPS = REGISTRY.counter(
+    "jarvis_query_cache_lookups_total", "Search query vector cache lookups", ("result",)
+)
+QDRANT_LATENCY = REGISTRY.histogram(
+    "jarvis_qdrant_duration_seconds", "Qdrant client call latency", ("operation", "outcome")
+)
+
+
+class InstrumentedClient:
+    """Proxy timing every QdrantClient method call into QDRANT_LATENCY"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        def call(*args, **kwargs):
+            with QDRANT_LATENCY.time(operation=name), phase("qdrant"):
+                return attr(*args, **kwargs)
+
+        # Cache the wrapper so later lookups skip __getattr__
+        setattr(self, name, call)
+        return call
+
+
+def instrument_client(client):
+    """Wrap a QdrantClient for latency metrics and profiler phases
+
+    Returned unwrapped when both METRICS_ENABLED and profiling are off.
+    """
+    return InstrumentedClient(client) if METRICS_ENABLED or PROFILING_ENABLED else client
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics from a daemon thread (for processes without a web app)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_metrics().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    try:
+        httpd = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"⚠️  Metrics server not started on {host}:{port}: {e}", file=sys.stderr)
+        return None
+    threading.Thread(target=httpd.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"✓ Metrics: http://{host}:{port}/metrics", file=sys.stderr)
+    return httpd
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Silent Overseer - Pattern-based safety checks for agent actions
+Pure Python, no clients: safe to import from anywhere
+"""
+
+try:
+    from .config import OVERSEER_ENABLED
+except ImportError:
+    from config import OVERSEER_ENABLED
+
+# Overseer configuration
+DANGEROUS_PATTERNS = [
+    "rm -rf", "sudo", "chmod 777", "curl | sh", "wget | bash",
+    "DROP TABLE", "DELETE FROM", "TRUNCATE", "--force", "force push",
+    "git push --force origin master", "git push --force origin main"
+]
+
+def check_overseer(text: str, action_type: str = "unknown") -> dict:
+    """Silent Overseer: Check if action is safe"""
+    if not OVERSEER_ENABLED:
+        return {"safe": True, "reason": "overseer_disabled"}
+
+    # Check for dangerous patterns
+    text_lower = text.lower()
+    for pattern in DANGEROUS_PATTERNS:
+        if pattern in text_lower:
+            return {
+                "safe": False,
+                "reason": f"Detected dangerous pattern: {pattern}",
+                "severity": "high",
+                "requires_approval": True
+            }
+
+    # Check for rapid destructive actions
+    # TODO: Implement rate limiting and pattern detection
+
+    return {"safe": True, "reason": "passed_overseer_checks"}
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Profiler - Opt-in profiling of MCP tool calls
+A random PROFILE_SAMPLE_RATE of calls run under cProfile. With
+PROFILE_SLOW_MS set, every call is stack-sampled from a background thread
+and kept only if it exceeded the threshold. Captured calls are written to
+PROFILE_DIR with a phase breakdown (embedding / qdrant / psutil / other);
+aggregate them with scripts/profile_report.py.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import threading
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+try:
+    from .config import (
+        PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_SLOW_MS, PROFILE_INTERVAL_MS, PROFILE_MAX_FILES
+    )
+except ImportError:
+    from config import (
+        PROFILE_DIR, PROFILE_SAMPLE_RATE, PROFILE_SLOW_MS, PROFILE_INTERVAL_MS, PROFILE_MAX_FILES
+    )
+
+PROFILING_ENABLED = PROFILE_SAMPLE_RATE > 0 or PROFILE_SLOW_MS > 0
+
+# Phase timings of the tool call running in this context, if it is profiled
+_current_phases: ContextVar[Optional[dict]] = ContextVar("jarvis_profile_phases", default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """Attribute the block's time to `name` in the current profiled call
+
+    Usable as a decorator. Costs one ContextVar lookup when not profiling.
+    """
+    phases = _current_phases.get()
+    if phases is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def _fold_stack(frame, max_depth: int = 64) -> str:
+    """Collapsed stack (root;...;leaf) in flamegraph.pl format"""
+    names = []
+    while frame is not None and len(names) < max_depth:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples the stacks of registered threads every `interval` seconds
+
+    A single daemon thread serves every in-flight call and parks on an
+    event while no call is registered.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active: dict[int, tuple[int, Counter]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, thread_id: int) -> Counter:
+        stacks = Counter()
+        with self._lock:
+            self._active[id(stacks)] = (thread_id, stacks)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="jarvis-profiler", daemon=True)
+                self._thread.start()
+            self._wake.set()
+        return stacks
+
+    def unregister(self, stacks: Counter):
+        with self._lock:
+            self._active.pop(id(stacks), None)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                active = list(self._active.values())
+                if not active:
+                    self._wake.clear()
+                    continue
+            frames = sys._current_frames()
+            for thread_id, stacks in active:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[_fold_stack(frame)] += 1
+
+
+_sampler: Optional[StackSampler] = None
+
+def _get_sampler() -> StackSampler:
+    global _sampler
+    if _sampler is None:
+        _sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+    return _sampler
+
+
+def _prune(directory: str):
+    """Keep at most PROFILE_MAX_FILES captures (oldest removed first)"""
+    captures = sorted(f for f in os.listdir(directory) if f.endswith(".json"))
+    for name in captures[:max(0, len(captures) - PROFILE_MAX_FILES)]:
+        stem = name[:-len(".json")]
+        for suffix in (".json", ".prof", ".folded"):
+            try:
+                os.remove(os.path.join(directory, stem + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def _write_capture(tool: str, trigger: str, started_at: datetime, duration: float,
+                   phases: dict, profile=None, stacks: Optional[Counter] = None) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = f"{started_at.strftime('%Y%m%dT%H%M%S%f')}-{tool}"
+    base = os.path.join(PROFILE_DIR, stem)
+
+    breakdown = {name: round(seconds * 1000, 3) for name, seconds in sorted(phases.items())}
+    breakdown["other"] = round(max(0.0, duration - sum(phases.values())) * 1000, 3)
+    record = {
+        "tool": tool,
+        "trigger": trigger,
+        "started_at": started_at.isoformat(),
+        "duration_ms": round(duration * 1000, 3),
+        "phases_ms": breakdown
+    }
+
+    if profile is not None:
+        profile.dump_stats(base + ".prof")
+        record["profile"] = stem + ".prof"
+    if stacks:
+        with open(base + ".folded", "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        record["stacks"] = stem + ".folded"
+        record["samples"] = sum(stacks.values())
+
+    with open(base + ".json", "w") as f:
+        json.dump(record, f, indent=2)
+    _prune(PROFILE_DIR)
+    return base + ".json"
+
+
+@contextmanager
+def _profile_call(tool: str):
+    import cProfile
+
+    sampled = random.random() < PROFILE_SAMPLE_RATE
+    profile = cProfile.Profile() if sampled else None
+    stacks = None
+    if profile is not None:
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active on this thread (overlapping calls)
+            profile = None
+    if profile is None and PROFILE_SLOW_MS > 0:
+        stacks = _get_sampler().register(threading.get_ident())
+
+    phases: dict[str, float] = {}
+    token = _current_phases.set(phases)
+    started_at = datetime.now()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        _current_phases.reset(token)
+        if profile is not None:
+            profile.disable()
+        if stacks is not None:
+            _get_sampler().unregister(stacks)
+
+        slow = PROFILE_SLOW_MS > 0 and duration * 1000 >= PROFILE_SLOW_MS
+        if profile is not None or slow:
+            try:
+                _write_capture(
+                    tool, "sample" if profile is not None else "slow",
+                    started_at, duration, phases, profile, stacks
+                )
+            except OSError as e:
+                print(f"⚠️  Could not write profile for {tool}: {e}", file=sys.stderr)
+
+
+def profile_call(tool: str):
+    """Context manager profiling one tool call (no-op unless profiling is configured)"""
+    if not PROFILING_ENABLED:
+        return nullcontext()
+    return _profile_call(tool)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Related Memories - Precomputed nearest-neighbour graph
+Each memory keeps its RELATED_K most similar memories in its `related`
+payload field ([{"id": "...", "score": ...}], best first), so the
+related_memories tool is a lookup instead of a vector search:
+
+- scripts/build_related.py computes the whole graph offline (blocked
+  NumPy matrix products over the exported vectors)
+- link_related() keeps it current as memories are stored: one batched
+  search gives new memories their lists, and they join the lists of
+  neighbours they outrank
+
+A memory takes part with its own vector (the first chunk of a long one).
+Lists are approximate between rebuilds: concurrent stores can overwrite each
+other's additions, and deleted memories linger until lookups skip them.
+Memories without a list get one computed on first lookup.
+"""
+
+from typing import Iterator, Optional
+
+try:
+    from .config import COLLECTION_NAME, RELATED_K
+    from .hivemind import memory_conditions
+    from .memory_text import SEARCH_FIELDS, fill_previews, get_memory_record
+except ImportError:
+    from config import COLLECTION_NAME, RELATED_K
+    from hivemind import memory_conditions
+    from memory_text import SEARCH_FIELDS, fill_previews, get_memory_record
+
+RELATED_FIELD = "related"
+
+
+def _point_id(value: str):
+    # IDs are kept as strings: u64 hashes do not fit every payload encoding
+    return int(value) if value.isdigit() else value
+
+
+def nearest_neighbors(matrix, k: int, block_size: int = 1024) -> Iterator[tuple]:
+    """Exact top-k cosine neighbours of every row, one block of rows at a time
+
+    Memory stays at one (block_size x rows) score matrix beyond the input.
+
+    Yields:
+        (first row of the block, neighbour row indices, scores), both
+        (block rows x k) and best first; a row is never its own neighbour
+    """
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    unit = (matrix / np.where(norms == 0, 1, norms)).astype(np.float32)
+    rows = len(unit)
+    k = min(k, rows - 1)
+    if k <= 0:
+        return
+    for start in range(0, rows, block_size):
+        scores = unit[start:start + block_size] @ unit.T
+        block = np.arange(len(scores))
+        scores[block, start + block] = -np.inf
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        yield start, np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def related_entry(point_id, score: float) -> dict:
+    return {"id": str(point_id), "score": round(float(score), 4)}
+
+
+def _insert(related: list[dict], point_id, score: float, k: int) -> Optional[list[dict]]:
+    """related with point_id added, or None if it does not make the top k"""
+    entries = [entry for entry in related if entry["id"] != str(point_id)]
+    entries.append(related_entry(point_id, score))
+    entries.sort(key=lambda entry: -entry["score"])
+    if str(point_id) not in {entry["id"] for entry in entries[:k]}:
+        return None
+    return entries[:k]
+
+
+def link_related(points: list, client, collection_name: str = COLLECTION_NAME, k: int = RELATED_K):
+    """Give freshly stored points (with vectors) their neighbour lists
+
+    Extra chunks are ignored. Neighbours already in the graph (with a list)
+    take the new memory in if it outranks their weakest entry; the others
+    get a full list on their first lookup.
+    """
+    from qdrant_client.models import Filter, QueryRequest, SetPayloadOperation, SetPayload
+
+    memories = [p for p in points if p.vector is not None and "parent_id" not in (p.payload or {})]
+    if k <= 0 or not memories:
+        return
+    responses = client.query_batch_points(
+        collection_name=collection_name,
+        requests=[
+            QueryRequest(
+                query=point.vector, filter=Filter(must=memory_conditions()), limit=k + 1,
+                with_payload=[RELATED_FIELD]
+            )
+            for point in memories
+        ]
+    )
+    own = {point.id for point in memories}
+    lists = {}
+    for point, response in zip(memories, responses):
+        hits = [hit for hit in response.points if hit.id != point.id][:k]
+        lists[point.id] = [related_entry(hit.id, hit.score) for hit in hits]
+        for hit in hits:
+            if hit.id in own:
+                continue
+            current = lists.get(hit.id, (hit.payload or {}).get(RELATED_FIELD))
+            if current is None:
+                continue
+            updated = _insert(current, point.id, hit.score, k)
+            if updated is not None:
+                lists[hit.id] = updated
+
+    client.batch_update_points(
+        collection_name=collection_name,
+        update_operations=[
+            SetPayloadOperation(set_payload=SetPayload(payload={RELATED_FIELD: related}, points=[point_id]))
+            for point_id, related in lists.items()
+        ]
+    )
+
+
+def get_related(memory_id, client, limit: int = 5, collection_name: str = COLLECTION_NAME) -> tuple:
+    """A memory and its most similar memories, from its stored list
+
+    A memory without a list (stored before the graph, or by a process with
+    RELATED_K=0) gets one from a single search, saved for next time.
+
+    Returns:
+        (memory record or None, [(record with SEARCH_FIELDS payload, score)])
+    """
+    record = get_memory_record(memory_id, client, collection_name)
+    if record is None:
+        return None, []
+    related = (record.payload or {}).get(RELATED_FIELD)
+    if related is None:
+        with_vector = client.retrieve(collection_name=collection_name, ids=[record.id], with_vectors=True)
+        link_related(with_vector, client, collection_name, max(RELATED_K, limit))
+        related = client.retrieve(
+            collection_name=collection_name, ids=[record.id], with_payload=[RELATED_FIELD]
+        )[0].payload.get(RELATED_FIELD, [])
+
+    scores = {_point_id(entry["id"]): entry["score"] for entry in related}
+    found = {
+        neighbor.id: neighbor
+        for neighbor in client.retrieve(
+            collection_name=collection_name, ids=list(scores), with_payload=SEARCH_FIELDS, with_vectors=False
+        )
+    }
+    # Deleted neighbours are skipped
+    neighbors = [found[point_id] for point_id in scores if point_id in found][:limit]
+    fill_previews(neighbors, client, collection_name)
+    return record, [(neighbor, scores[neighbor.id]) for neighbor in neighbors]
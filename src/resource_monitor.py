@@ -9,6 +9,11 @@ from typing import Dict, Literal
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    from .profiler import phase
+except ImportError:
+    from profiler import phase
+
 # Resource thresholds
 CPU_THRESHOLD_SAFE = 0.6    # 60%
 RAM_THRESHOLD_SAFE = 0.7    # 70%
@@ -41,8 +46,9 @@ def get_resource_status(current_agent_count: int = 0) -> ResourceStatus:
         ResourceStatus with current metrics and spawn decision
     """
     # Get CPU and RAM usage
-    cpu_percent = psutil.cpu_percent(interval=0.5) / 100.0  # 0-1 scale
-    ram_percent = psutil.virtual_memory().percent / 100.0   # 0-1 scale
+    with phase("psutil"):
+        cpu_percent = psutil.cpu_percent(interval=0.5) / 100.0  # 0-1 scale
+        ram_percent = psutil.virtual_memory().percent / 100.0   # 0-1 scale
 
     # Determine resource zone
     if cpu_percent >= CPU_THRESHOLD_DANGER or ram_percent >= RAM_THRESHOLD_DANGER:
@@ -133,6 +139,7 @@ def check_agent_limit(current_agent_count: int) -> tuple[bool, str]:
 
     return True, f"Can spawn agent: {status.max_agents - status.current_agents} slots available"
 
+@phase("psutil")
 def get_system_info() -> Dict:
     """Get detailed system information"""
     cpu_count = psutil.cpu_count(logical=True)
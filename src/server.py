@@ -4,17 +4,14 @@ Jarvis LMAO - Hive-Mind Memory System
 Because we could've used N8N, but that wouldn't be fun enough
 """
 
-import os
 import json
+import base64
 import asyncio
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 from datetime import datetime
-from dotenv import load_dotenv
 import sys
 
-load_dotenv()
-
 try:
     from mcp.server import Server
     from mcp.types import Tool, TextContent
@@ -24,14 +21,51 @@ except ImportError:
     exit(1)
 
 try:
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import (
-        Distance, VectorParams, PointStruct, Filter,
-        FieldCondition, MatchValue, MatchAny
+    from .config import (
+        COLLECTION_NAME, EMBEDDING_PROVIDER, OVERSEER_ENABLED, METRICS_PORT, COMPACTION_INTERVAL_HOURS,
+        HOT_TIER_SIZE, CHANGE_FEED_MAX_WAIT, BRANCH_ROUTING_TOP, MCP_TRANSPORT, MCP_HTTP_HOST, MCP_HTTP_PORT,
+        MCP_TOOL_WORKERS
+    )
+    from .hivemind import (
+        get_qdrant_client, describe_backend, generate_point_id, count_branch, get_branch_counts,
+        memory_timestamps, parse_time_bound, count_memories
     )
+    from .embeddings import generate_embedding, embed_query, get_embedder
+    from .overseer import check_overseer, DANGEROUS_PATTERNS
+    from .metrics import TOOL_LATENCY, EMBEDDINGS_AVOIDED, start_metrics_server, render_metrics
+    from .profiler import profile_call
+    from .compaction import compaction_loop
+    from .hot_tier import get_hot_index, search_memories, promote_memories
+    from .memory_text import (
+        text_fields, memory_points, memory_text, memory_preview, memory_id_of, chunk_point_id, get_memory_record,
+        update_stored_memory, make_preview, TEXT_FIELDS
+    )
+    from .change_feed import get_change_feed, record_changes, change_rows, change_row
+    from .related import link_related, get_related, RELATED_FIELD
+    from .branch_router import update_centroids, route_branches, get_branch_router
 except ImportError:
-    print("Error: qdrant-client not installed. Run: pip install qdrant-client", file=sys.stderr)
-    exit(1)
+    from config import (
+        COLLECTION_NAME, EMBEDDING_PROVIDER, OVERSEER_ENABLED, METRICS_PORT, COMPACTION_INTERVAL_HOURS,
+        HOT_TIER_SIZE, CHANGE_FEED_MAX_WAIT, BRANCH_ROUTING_TOP, MCP_TRANSPORT, MCP_HTTP_HOST, MCP_HTTP_PORT,
+        MCP_TOOL_WORKERS
+    )
+    from hivemind import (
+        get_qdrant_client, describe_backend, generate_point_id, count_branch, get_branch_counts,
+        memory_timestamps, parse_time_bound, count_memories
+    )
+    from embeddings import generate_embedding, embed_query, get_embedder
+    from overseer import check_overseer, DANGEROUS_PATTERNS
+    from metrics import TOOL_LATENCY, EMBEDDINGS_AVOIDED, start_metrics_server, render_metrics
+    from profiler import profile_call
+    from compaction import compaction_loop
+    from hot_tier import get_hot_index, search_memories, promote_memories
+    from memory_text import (
+        text_fields, memory_points, memory_text, memory_preview, memory_id_of, chunk_point_id, get_memory_record,
+        update_stored_memory, make_preview, TEXT_FIELDS
+    )
+    from change_feed import get_change_feed, record_changes, change_rows, change_row
+    from related import link_related, get_related, RELATED_FIELD
+    from branch_router import update_centroids, route_branches, get_branch_router
 
 try:
     from .resource_monitor import get_system_info, get_resource_status
@@ -46,95 +80,61 @@ except ImportError:
         get_resource_status = None
         TaskCoordinator = None
 
-# Configuration
-QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
-QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", None)
-COLLECTION_NAME = os.getenv("COLLECTION_NAME", "jarvis_hivemind")
-EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "ollama").lower()
-OVERSEER_ENABLED = os.getenv("OVERSEER_ENABLED", "true").lower() == "true"
-
-# Initialize clients
-qdrant_client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
-embedding_client = None
-embedding_model = None
-
-# Overseer configuration
-DANGEROUS_PATTERNS = [
-    "rm -rf", "sudo", "chmod 777", "curl | sh", "wget | bash",
-    "DROP TABLE", "DELETE FROM", "TRUNCATE", "--force", "force push",
-    "git push --force origin master", "git push --force origin main"
-]
-
-# Initialize embedding provider
-if EMBEDDING_PROVIDER == "ollama":
-    try:
-        import ollama
-        OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        embedding_model = os.getenv("OLLAMA_MODEL", "nomic-embed-text")
-        embedding_client = ollama.Client(host=OLLAMA_BASE_URL)
-        print(f"✓ Using Ollama embeddings: {embedding_model}", file=sys.stderr)
-    except ImportError:
-        print("Error: ollama library not installed. Run: pip install ollama", file=sys.stderr)
-        exit(1)
-elif EMBEDDING_PROVIDER == "openai":
-    try:
-        from openai import OpenAI
-        OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-        if not OPENAI_API_KEY:
-            print("Error: OPENAI_API_KEY not set in .env", file=sys.stderr)
-            exit(1)
-        embedding_model = os.getenv("OPENAI_MODEL", "text-embedding-3-small")
-        embedding_client = OpenAI(api_key=OPENAI_API_KEY)
-        print(f"✓ Using OpenAI embeddings: {embedding_model}", file=sys.stderr)
-    except ImportError:
-        print("Error: openai library not installed. Run: pip install openai", file=sys.stderr)
-        exit(1)
-else:
-    print(f"Error: Unknown EMBEDDING_PROVIDER: {EMBEDDING_PROVIDER}", file=sys.stderr)
-    exit(1)
-
 server = Server("jarvis-lmao")
 
-# Initialize task coordinator
+# Initialize task coordinator (one for every session of an HTTP server)
 task_coordinator = TaskCoordinator() if TaskCoordinator else None
 
-def generate_embedding(text: str) -> list[float]:
-    """Generate embedding vector for text"""
-    if EMBEDDING_PROVIDER == "ollama":
-        response = embedding_client.embeddings(model=embedding_model, prompt=text)
-        return response['embedding']
-    elif EMBEDDING_PROVIDER == "openai":
-        response = embedding_client.embeddings.create(model=embedding_model, input=text)
-        return response.data[0].embedding
-    else:
-        raise ValueError(f"Unknown embedding provider: {EMBEDDING_PROVIDER}")
-
-def check_overseer(text: str, action_type: str = "unknown") -> dict:
-    """Silent Overseer: Check if action is safe"""
-    if not OVERSEER_ENABLED:
-        return {"safe": True, "reason": "overseer_disabled"}
-
-    # Check for dangerous patterns
-    text_lower = text.lower()
-    for pattern in DANGEROUS_PATTERNS:
-        if pattern in text_lower:
-            return {
-                "safe": False,
-                "reason": f"Detected dangerous pattern: {pattern}",
-                "severity": "high",
-                "requires_approval": True
-            }
+# HTTP mode runs tool calls on this pool, so one session's embedding or Qdrant
+# round trip does not stall every other session (stdio runs them inline)
+tool_executor: Optional[ThreadPoolExecutor] = None
+# Already non-blocking: kept on the event loop so long polls do not hold a worker
+INLINE_TOOLS = {"poll_changes"}
 
-    # Check for rapid destructive actions
-    # TODO: Implement rate limiting and pattern detection
+TIME_BOUND_HELP = "Only memories stored {bound} this time: relative ('7d', '12h') or ISO date/time"
+
+def parse_time_window(arguments: dict) -> tuple[Optional[float], Optional[float]]:
+    """since/until tool arguments as epoch seconds (ValueError if malformed)"""
+    since, until = arguments.get("since"), arguments.get("until")
+    return (
+        parse_time_bound(since) if since else None,
+        parse_time_bound(until) if until else None
+    )
 
-    return {"safe": True, "reason": "passed_overseer_checks"}
+def describe_time_window(since: Optional[float], until: Optional[float]) -> str:
+    if since is None and until is None:
+        return ""
+    start = datetime.fromtimestamp(since).strftime("%Y-%m-%d %H:%M") if since is not None else "beginning"
+    end = datetime.fromtimestamp(until).strftime("%Y-%m-%d %H:%M") if until is not None else "now"
+    return f"{start} to {end}"
 
-def generate_point_id(text: str, branch_id: str) -> int:
-    """Generate deterministic ID from content + branch (for deduplication)"""
-    content = f"{text}{branch_id}"
-    hash_obj = hashlib.sha256(content.encode())
-    return int(hash_obj.hexdigest()[:16], 16)  # Use first 16 hex chars as int
+def encode_search_cursor(search: dict) -> str:
+    """Opaque token resuming a search: its parameters and the next offset
+
+    Self-contained (time windows already resolved to epochs), so it stays
+    valid across restarts; only the query vector comes from a cache.
+    """
+    raw = json.dumps(search, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str) -> dict:
+    try:
+        search = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(search, dict) or not isinstance(search.get("query"), str):
+            raise ValueError
+        return search
+    except ValueError:
+        raise ValueError("Invalid cursor (pass the cursor from the previous search_memory result as is)")
+
+def __getattr__(name: str):
+    """Lazy module attributes for callers that still import them by name"""
+    if name == "qdrant_client":
+        return get_qdrant_client()
+    if name == "embedding_client":
+        return get_embedder().client
+    if name == "embedding_model":
+        return get_embedder().model
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 @server.list_tools()
 async def list_tools() -> list[Tool]:
@@ -175,16 +175,67 @@ async def list_tools() -> list[Tool]:
                 "properties": {
                     "query": {"type": "string", "description": "Search query"},
                     "limit": {"type": "integer", "description": "Max results", "default": 5},
+                    "offset": {"type": "integer", "description": "Skip this many results (paging)", "default": 0},
+                    "score_threshold": {
+                        "type": "number",
+                        "description": "Only results scoring at least this (cosine similarity)"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Next page of a previous search (other arguments are ignored)"
+                    },
                     "branch_filter": {
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "Filter by branch IDs (empty = all branches)"
                     },
-                    "type_filter": {"type": "string", "description": "Filter by memory type"}
+                    "type_filter": {"type": "string", "description": "Filter by memory type"},
+                    "route_branches": {
+                        "type": "integer",
+                        "description": "Without branch_filter: search only the N branches closest to the query "
+                                       f"(0 = all; default {BRANCH_ROUTING_TOP})"
+                    },
+                    "since": {"type": "string", "description": TIME_BOUND_HELP.format(bound="at or after")},
+                    "until": {"type": "string", "description": TIME_BOUND_HELP.format(bound="before")}
+                },
+                "anyOf": [{"required": ["query"]}, {"required": ["cursor"]}]
+            }
+        ),
+        Tool(
+            name="find_branches",
+            description="Which branches know about a topic (ranked by branch centroids, no memory search)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string", "description": "Topic"},
+                    "limit": {"type": "integer", "description": "Max branches", "default": 5}
                 },
                 "required": ["query"]
             }
         ),
+        Tool(
+            name="get_memory",
+            description="Get the full text and metadata of a memory by ID (search results show previews)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "id": {"type": ["integer", "string"], "description": "Memory ID from search_memory"}
+                },
+                "required": ["id"]
+            }
+        ),
+        Tool(
+            name="related_memories",
+            description="Memories most similar to a memory, by ID (precomputed, no search)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "id": {"type": ["integer", "string"], "description": "Memory ID from search_memory"},
+                    "limit": {"type": "integer", "description": "Max results", "default": 5}
+                },
+                "required": ["id"]
+            }
+        ),
         Tool(
             name="merge_branches",
             description="Merge memories from one branch into another",
@@ -203,6 +254,27 @@ async def list_tools() -> list[Tool]:
                 "required": ["source_branch", "target_branch"]
             }
         ),
+        Tool(
+            name="poll_changes",
+            description="List memories stored or merged since a sequence number (cheap; can wait for new ones)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "branch_id": {"type": "string", "description": "Only this branch (empty = all branches)"},
+                    "since_seq": {
+                        "type": "integer",
+                        "description": "next_seq from the previous poll (0 = from the start)",
+                        "default": 0
+                    },
+                    "limit": {"type": "integer", "description": "Max changes", "default": 50},
+                    "wait_seconds": {
+                        "type": "number",
+                        "description": f"Wait up to this long for a change if there is none (max {CHANGE_FEED_MAX_WAIT:g})",
+                        "default": 0
+                    }
+                }
+            }
+        ),
         Tool(
             name="get_branch_stats",
             description="Get statistics about thinking branches",
@@ -212,7 +284,9 @@ async def list_tools() -> list[Tool]:
                     "branch_id": {
                         "type": "string",
                         "description": "Optional: specific branch (empty = all branches)"
-                    }
+                    },
+                    "since": {"type": "string", "description": TIME_BOUND_HELP.format(bound="at or after")},
+                    "until": {"type": "string", "description": TIME_BOUND_HELP.format(bound="before")}
                 }
             }
         ),
@@ -273,7 +347,21 @@ async def list_tools() -> list[Tool]:
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool calls"""
+    """Handle tool calls (timed into jarvis_tool_duration_seconds, optionally profiled)"""
+    if tool_executor is not None and name not in INLINE_TOOLS:
+        return await asyncio.get_running_loop().run_in_executor(tool_executor, run_tool, name, arguments)
+    with TOOL_LATENCY.time(tool=name), profile_call(name):
+        return await dispatch_tool(name, arguments)
+
+def run_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Run one tool call to completion on a tool_executor thread"""
+    with TOOL_LATENCY.time(tool=name), profile_call(name):
+        return asyncio.run(dispatch_tool(name, arguments))
+
+async def dispatch_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Run a tool by name"""
+    # Deferred so importing this module does not pay for qdrant_client
+    from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, MatchAny
 
     if name == "store_memory":
         text = arguments["text"]
@@ -288,77 +376,148 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 text=f"⚠️ Overseer Alert: {overseer_result['reason']}\nRequires user approval to proceed."
             )]
 
-        # Generate embedding
-        embedding = generate_embedding(text)
-        timestamp = datetime.now().isoformat()
+        payload = {
+            **memory_timestamps(),
+            "overseer_status": overseer_result["reason"],
+            **metadata
+        }
+
+        # Same text in the same branch: same ID, so only refresh its metadata
+        memory_id, updated = update_stored_memory(text, branch_id, payload, get_qdrant_client(), COLLECTION_NAME)
+        if updated:
+            EMBEDDINGS_AVOIDED.inc(updated, source="mcp")
+            record_changes(
+                "update", [change_row(memory_id, {**payload, "branch_id": branch_id, "preview": make_preview(text)})],
+                source="mcp"
+            )
+            return [TextContent(
+                type="text",
+                text=f"✓ Memory already in branch '{branch_id}', metadata updated (embedding skipped)\n"
+                     f"ID: {memory_id}\nOverseer: {overseer_result['reason']}"
+            )]
 
-        # Create point with hive-mind metadata
-        point_id = generate_point_id(text, branch_id)
-        point = PointStruct(
-            id=point_id,
-            vector=embedding,
-            payload={
-                "text": text,
-                "branch_id": branch_id,
-                "timestamp": timestamp,
-                "overseer_status": overseer_result["reason"],
-                **metadata
-            }
-        )
+        # Embed (long texts as chunks, in one batch) and attach hive-mind metadata
+        points = memory_points(text, branch_id, payload)
 
         # Store in Qdrant
-        qdrant_client.upsert(collection_name=COLLECTION_NAME, points=[point])
+        get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=points)
+        promote_memories(points)
+        link_related(points, get_qdrant_client(), COLLECTION_NAME)
+        update_centroids(points)
+        record_changes("store", change_rows(points), source="mcp")
 
+        chunks = f" ({len(points)} chunks)" if len(points) > 1 else ""
         return [TextContent(
             type="text",
-            text=f"✓ Memory stored in branch '{branch_id}'\nID: {point_id}\nOverseer: {overseer_result['reason']}"
+            text=f"✓ Memory stored in branch '{branch_id}'{chunks}\nID: {points[0].id}\nOverseer: {overseer_result['reason']}"
         )]
 
     elif name == "search_memory":
-        query = arguments["query"]
-        limit = arguments.get("limit", 5)
-        branch_filter = arguments.get("branch_filter", [])
-        type_filter = arguments.get("type_filter")
-
-        # Generate query embedding
-        query_embedding = generate_embedding(query)
-
-        # Build filters
-        filter_conditions = []
-        if branch_filter:
-            filter_conditions.append(
-                FieldCondition(key="branch_id", match=MatchAny(any=branch_filter))
-            )
-        if type_filter:
-            filter_conditions.append(
-                FieldCondition(key="type", match=MatchValue(value=type_filter))
-            )
-
-        query_filter = Filter(must=filter_conditions) if filter_conditions else None
-
-        # Search
-        search_response = qdrant_client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_embedding,
-            limit=limit,
-            query_filter=query_filter
+        try:
+            if arguments.get("cursor"):
+                search = decode_search_cursor(arguments["cursor"])
+            elif arguments.get("query"):
+                since, until = parse_time_window(arguments)
+                search = {
+                    "query": arguments["query"],
+                    "limit": arguments.get("limit", 5),
+                    "branches": arguments.get("branch_filter", []),
+                    "type": arguments.get("type_filter"),
+                    "since": since,
+                    "until": until,
+                    "score_threshold": arguments.get("score_threshold"),
+                    "offset": arguments.get("offset", 0),
+                    "route": arguments.get("route_branches", BRANCH_ROUTING_TOP)
+                }
+            else:
+                raise ValueError("Pass a query (or a cursor from a previous search)")
+        except ValueError as e:
+            return [TextContent(type="text", text=f"❌ {e}")]
+
+        # Query embedding (cached, so further pages do not re-embed)
+        query_embedding = embed_query(search["query"])
+
+        # Two-stage: only the branches whose centroids match best (kept by later pages)
+        routed = ""
+        route = search.pop("route", 0)
+        if route and not search["branches"]:
+            search["branches"] = route_branches(query_embedding, route) or []
+            if search["branches"]:
+                routed = f"Routed to branches: {', '.join(search['branches'])} (route_branches=0 searches all)\n"
+
+        # Search (hot tier first when HOT_TIER_SIZE is set)
+        results = search_memories(
+            query_embedding, search["limit"], branches=search["branches"], memory_type=search["type"],
+            since=search["since"], until=search["until"], score_threshold=search["score_threshold"],
+            offset=search["offset"]
         )
-        results = search_response.points
+        window = describe_time_window(search["since"], search["until"])
 
         if not results:
-            return [TextContent(type="text", text="No memories found.")]
+            more = " more" if search["offset"] else ""
+            return [TextContent(type="text", text=f"{routed}No{more} memories found{f' in {window}' if window else ''}.")]
 
-        output = f"🧠 Found {len(results)} memories across hive-mind:\n\n"
-        for i, result in enumerate(results, 1):
+        output = f"{routed}🧠 Found {len(results)} memories across hive-mind{f' ({window})' if window else ''}:\n\n"
+        for i, result in enumerate(results, search["offset"] + 1):
             branch = result.payload.get('branch_id', 'unknown')
             memory_type = result.payload.get('type', 'unknown')
-            text_preview = result.payload.get('text', '')[:150]
+            text_preview = memory_preview(result.payload, 150)
             timestamp = result.payload.get('timestamp', 'N/A')
 
             output += f"{i}. [{result.score:.3f}] [{branch}] {memory_type}\n"
             output += f"   {text_preview}...\n"
-            output += f"   {timestamp}\n\n"
+            output += f"   {timestamp} (ID: {result.id})\n\n"
+        output += "Full text: get_memory with an ID"
+        if len(results) == search["limit"]:
+            cursor = encode_search_cursor({**search, "offset": search["offset"] + search["limit"]})
+            output += f"\nMore results: search_memory with cursor \"{cursor}\""
+
+        return [TextContent(type="text", text=output)]
+
+    elif name == "find_branches":
+        ranked = get_branch_router().score_branches(embed_query(arguments["query"]), arguments.get("limit", 5))
+        if not ranked:
+            return [TextContent(type="text", text="No branch centroids yet (run scripts/build_centroids.py)")]
 
+        output = f"🌿 Branches closest to \"{arguments['query']}\":\n\n"
+        for i, (branch, score) in enumerate(ranked, 1):
+            output += f"{i}. [{score:.3f}] {branch} ({count_branch(branch)} memories)\n"
+        output += "\nSearch one: search_memory with branch_filter"
+        return [TextContent(type="text", text=output)]
+
+    elif name == "get_memory":
+        point_id = arguments["id"]
+        if isinstance(point_id, str) and point_id.isdigit():
+            point_id = int(point_id)
+
+        record = get_memory_record(point_id, get_qdrant_client(), COLLECTION_NAME)
+        if record is None:
+            return [TextContent(type="text", text=f"No memory with ID {point_id}")]
+
+        payload = record.payload or {}
+        metadata = {k: v for k, v in payload.items() if k not in TEXT_FIELDS and k not in ("preview", RELATED_FIELD)}
+        output = f"🧠 Memory {record.id}\n\n{memory_text(payload)}\n\n"
+        output += f"Metadata:\n{json.dumps(metadata, indent=2, default=str)}"
+        return [TextContent(type="text", text=output)]
+
+    elif name == "related_memories":
+        point_id = arguments["id"]
+        if isinstance(point_id, str) and point_id.isdigit():
+            point_id = int(point_id)
+
+        record, related = get_related(point_id, get_qdrant_client(), arguments.get("limit", 5))
+        if record is None:
+            return [TextContent(type="text", text=f"No memory with ID {point_id}")]
+        if not related:
+            return [TextContent(type="text", text=f"No memories related to {record.id}.")]
+
+        output = f"🔗 {len(related)} memories related to {record.id}:\n\n"
+        for i, (neighbor, score) in enumerate(related, 1):
+            output += f"{i}. [{score:.3f}] [{neighbor.payload.get('branch_id', 'unknown')}] "
+            output += f"{neighbor.payload.get('type', 'unknown')}\n"
+            output += f"   {memory_preview(neighbor.payload, 150)}...\n"
+            output += f"   {neighbor.payload.get('timestamp', 'N/A')} (ID: {neighbor.id})\n\n"
+        output += "Full text: get_memory with an ID"
         return [TextContent(type="text", text=output)]
 
     elif name == "merge_branches":
@@ -367,12 +526,13 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         strategy = arguments.get("strategy", "smart")
 
         # Fetch all points from source branch
-        scroll_result = qdrant_client.scroll(
+        scroll_result = get_qdrant_client().scroll(
             collection_name=COLLECTION_NAME,
             scroll_filter=Filter(
                 must=[FieldCondition(key="branch_id", match=MatchValue(value=source_branch))]
             ),
-            limit=1000
+            limit=1000,
+            with_vectors=True
         )
 
         source_points = scroll_result[0]
@@ -381,17 +541,32 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             return [TextContent(type="text", text=f"No memories found in branch '{source_branch}'")]
 
         merged_count = 0
-        for point in source_points:
+        merged_points = []
+        merged_vectors = []  # memories and chunks, for the target's centroids
+        new_ids = {}  # memory ID -> its ID in the target branch
+        # Memories before their extra chunks, which take IDs derived from the memory's
+        for point in sorted(source_points, key=lambda p: "parent_id" in p.payload):
             new_payload = point.payload.copy()
             new_payload["branch_id"] = target_branch
             new_payload["merged_from"] = source_branch
             new_payload["merged_at"] = datetime.now().isoformat()
+            # Neighbours are found again for the copy (link_related below)
+            new_payload.pop(RELATED_FIELD, None)
 
             # Generate new ID for target branch
-            new_id = generate_point_id(
-                new_payload["text"],
-                target_branch
-            )
+            if "parent_id" in new_payload:
+                memory_id = memory_id_of(point)
+                if memory_id not in new_ids:
+                    memory = get_memory_record(memory_id, get_qdrant_client(), COLLECTION_NAME)
+                    new_ids[memory_id] = generate_point_id(memory_text(memory and memory.payload), target_branch)
+                new_payload["parent_id"] = str(new_ids[memory_id])
+                new_id = chunk_point_id(new_ids[memory_id], new_payload.get("chunk_index", 0), target_branch)
+            else:
+                new_id = generate_point_id(
+                    memory_text(new_payload),
+                    target_branch
+                )
+                new_ids[point.id] = new_id
 
             new_point = PointStruct(
                 id=new_id,
@@ -399,57 +574,79 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
                 payload=new_payload
             )
 
-            qdrant_client.upsert(collection_name=COLLECTION_NAME, points=[new_point])
-            merged_count += 1
+            get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=[new_point])
+            promote_memories([new_point])
+            merged_vectors.append(new_point)
+            if "parent_id" not in new_payload:
+                merged_count += 1
+                merged_points.append(new_point)
+
+        link_related(merged_points, get_qdrant_client(), COLLECTION_NAME)
+        update_centroids(merged_vectors)
+        record_changes("merge", change_rows(merged_points), source="mcp")
 
         return [TextContent(
             type="text",
             text=f"✓ Merged {merged_count} memories from '{source_branch}' → '{target_branch}'\nStrategy: {strategy}"
         )]
 
+    elif name == "poll_changes":
+        feed = get_change_feed()
+        if feed is None:
+            return [TextContent(type="text", text="❌ Change feed disabled (set CHANGE_FEED_PATH)")]
+
+        branch_id = arguments.get("branch_id")
+        since_seq = arguments.get("since_seq", 0)
+        limit = max(1, min(arguments.get("limit", 50), 500))
+        wait_seconds = max(0, min(arguments.get("wait_seconds", 0), CHANGE_FEED_MAX_WAIT))
+
+        # Long polls block a worker thread, not the event loop
+        changes, next_seq = await asyncio.to_thread(
+            feed.wait, since_seq, [branch_id] if branch_id else None, limit, wait_seconds
+        )
+
+        where = f" in branch '{branch_id}'" if branch_id else ""
+        if not changes:
+            output = f"No changes{where} after #{since_seq}.\n\n"
+        else:
+            output = f"🔔 {len(changes)} changes{where}:\n\n"
+            for change in changes:
+                output += f"#{change['seq']} {change['op']} [{change['branch_id']}] {change['type'] or 'unknown'}\n"
+                if change["preview"]:
+                    output += f"   {change['preview'][:150]}...\n"
+                recorded = datetime.fromtimestamp(change['recorded_at']).isoformat(timespec='seconds')
+                output += f"   {recorded} (ID: {change['memory_id']})\n\n"
+        output += f"Next poll: since_seq {next_seq}"
+        return [TextContent(type="text", text=output)]
+
     elif name == "get_branch_stats":
         branch_id = arguments.get("branch_id")
+        try:
+            since, until = parse_time_window(arguments)
+        except ValueError as e:
+            return [TextContent(type="text", text=f"❌ {e}")]
 
-        # Get collection info
-        collection = qdrant_client.get_collection(collection_name=COLLECTION_NAME)
+        window = describe_time_window(since, until)
+        total = count_memories(since, until)
 
         if branch_id:
-            # Count points in specific branch
-            scroll_result = qdrant_client.scroll(
-                collection_name=COLLECTION_NAME,
-                scroll_filter=Filter(
-                    must=[FieldCondition(key="branch_id", match=MatchValue(value=branch_id))]
-                ),
-                limit=1,
-                with_payload=False,
-                with_vectors=False
-            )
-            count = len(scroll_result[0])
+            count = count_branch(branch_id, since, until)
 
             stats = {
                 "branch_id": branch_id,
                 "memory_count": count,
-                "collection_total": collection.points_count
+                "collection_total": total
             }
         else:
-            # Get all branches
-            # This is a simple implementation - in production, use proper aggregation
-            scroll_result = qdrant_client.scroll(
-                collection_name=COLLECTION_NAME,
-                limit=1000,
-                with_vectors=False
-            )
-
-            branches = {}
-            for point in scroll_result[0]:
-                branch = point.payload.get("branch_id", "unknown")
-                branches[branch] = branches.get(branch, 0) + 1
+            branches = get_branch_counts(since=since, until=until)
 
             stats = {
                 "total_branches": len(branches),
-                "total_memories": collection.points_count,
+                "total_memories": total,
                 "branches": branches
             }
+        if window:
+            stats["window"] = window
 
         return [TextContent(
             type="text",
@@ -511,23 +708,22 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         # Store execution plan in memory for learning
         plan_text = f"Parallel execution plan created: {plan.total_tasks} tasks, strategy={plan.strategy}, branch={plan.branch_id}"
         embedding = generate_embedding(plan_text)
-        timestamp = datetime.now().isoformat()
         point_id = generate_point_id(plan_text, branch_id)
 
         point = PointStruct(
             id=point_id,
             vector=embedding,
             payload={
-                "text": plan_text,
+                **text_fields(plan_text),
                 "branch_id": branch_id,
-                "timestamp": timestamp,
+                **memory_timestamps(),
                 "type": "parallel_execution",
                 "task_count": plan.total_tasks,
                 "strategy": plan.strategy,
                 "overseer_status": "approved"
             }
         )
-        qdrant_client.upsert(collection_name=COLLECTION_NAME, points=[point])
+        get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=[point])
 
         return [TextContent(type="text", text=output)]
 
@@ -568,7 +764,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             return [TextContent(type="text", text="❌ Resource monitor not available")]
 
         info = get_system_info()
-        current_agents = len([t for t in task_coordinator.tasks.values() if t.status.value == "running"]) if task_coordinator else 0
+        current_agents = task_coordinator.running_count() if task_coordinator else 0
         status = get_resource_status(current_agents)
 
         output = f"💻 System Resources\n\n"
@@ -599,22 +795,122 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     else:
         raise ValueError(f"Unknown tool: {name}")
 
+class StreamableHTTPEndpoint:
+    """ASGI endpoint handing /mcp requests to the session manager"""
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    async def __call__(self, scope, receive, send):
+        await self.sessions.handle_request(scope, receive, send)
+
+def create_http_app():
+    """Starlette app serving the tools to many sessions at once
+
+    /mcp        streamable HTTP (current MCP clients)
+    /sse        SSE stream, with /messages/ for client requests (older clients)
+    /health     liveness and tool worker count
+    /metrics    Prometheus metrics
+    """
+    from contextlib import asynccontextmanager
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, PlainTextResponse, Response
+    from starlette.routing import Mount, Route
+    from mcp.server.sse import SseServerTransport
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+    sessions = StreamableHTTPSessionManager(app=server)
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request):
+        async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+        return Response()
+
+    async def health(request):
+        return JSONResponse({"status": "healthy", "transport": "http", "tool_workers": MCP_TOOL_WORKERS})
+
+    async def metrics(request):
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with sessions.run():
+            yield
+
+    return Starlette(
+        routes=[
+            Route("/mcp", endpoint=StreamableHTTPEndpoint(sessions)),
+            Route("/sse", endpoint=handle_sse, methods=["GET"]),
+            Mount("/messages/", app=sse.handle_post_message),
+            Route("/health", endpoint=health),
+            Route("/metrics", endpoint=metrics)
+        ],
+        lifespan=lifespan
+    )
+
+async def serve_http(host: str = MCP_HTTP_HOST, port: int = MCP_HTTP_PORT):
+    """Serve every session from this process until interrupted"""
+    import uvicorn
+
+    global tool_executor
+    tool_executor = ThreadPoolExecutor(max_workers=MCP_TOOL_WORKERS, thread_name_prefix="jarvis-tool")
+    print(f"✓ MCP over HTTP: http://{host}:{port}/mcp (SSE: /sse), {MCP_TOOL_WORKERS} tool workers",
+          file=sys.stderr)
+    try:
+        config = uvicorn.Config(create_http_app(), host=host, port=port, log_level="warning")
+        await uvicorn.Server(config).serve()
+    finally:
+        tool_executor.shutdown(wait=False)
+        tool_executor = None
+
 async def main():
     """Run the MCP server"""
     try:
-        # Verify Qdrant connection
-        collections = qdrant_client.get_collections()
-        print(f"✓ Connected to Qdrant at {QDRANT_URL}", file=sys.stderr)
+        # Verify storage (server backend) or open/create it (embedded backend)
+        collections = get_qdrant_client().get_collections()
+        print(f"✓ Connected to {describe_backend()}", file=sys.stderr)
         print(f"✓ Collection: {COLLECTION_NAME}", file=sys.stderr)
         print(f"✓ Overseer: {'enabled' if OVERSEER_ENABLED else 'disabled'}", file=sys.stderr)
-
-        # Run server
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await server.run(
-                read_stream,
-                write_stream,
-                server.create_initialization_options()
-            )
+        if METRICS_PORT:
+            start_metrics_server(METRICS_PORT)
+
+        # Warm the embedder off the event loop; config errors surface here
+        # and again on the first tool call that needs embeddings
+        def report_warmup(future):
+            if future.exception():
+                print(f"✗ Embeddings unavailable: {future.exception()}", file=sys.stderr)
+
+        warmup = asyncio.get_running_loop().run_in_executor(None, get_embedder)
+        warmup.add_done_callback(report_warmup)
+
+        if HOT_TIER_SIZE > 0:
+            # Loads the newest memories on a background thread
+            get_hot_index()
+
+        compaction_task = None
+        if COMPACTION_INTERVAL_HOURS > 0:
+            print(f"✓ Compaction: every {COMPACTION_INTERVAL_HOURS:g}h", file=sys.stderr)
+            compaction_task = asyncio.create_task(compaction_loop(COMPACTION_INTERVAL_HOURS))
+
+        try:
+            if MCP_TRANSPORT == "http":
+                await serve_http()
+                return
+
+            # Run server
+            async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+                await server.run(
+                    read_stream,
+                    write_stream,
+                    server.create_initialization_options()
+                )
+        finally:
+            if compaction_task is not None:
+                # Stops the schedule (a compaction already running in its
+                # worker thread is not interrupted)
+                compaction_task.cancel()
+                await asyncio.gather(compaction_task, return_exceptions=True)
     except Exception as e:
         print(f"✗ Failed to start server: {e}", file=sys.stderr)
         return
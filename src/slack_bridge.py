@@ -6,7 +6,11 @@ Simplest possible integration: Slash commands → Jarvis MCP → Slack responses
 
 import os
 import json
+import time
 import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -15,7 +19,7 @@ load_dotenv()
 
 try:
     from fastapi import FastAPI, Request, Response
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import JSONResponse, PlainTextResponse
     import uvicorn
 except ImportError:
     print("Error: FastAPI not installed. Run: pip install fastapi uvicorn")
@@ -24,33 +28,50 @@ except ImportError:
 try:
     from slack_sdk import WebClient
     from slack_sdk.errors import SlackApiError
+    from slack_sdk.webhook import WebhookClient
 except ImportError:
     print("Error: Slack SDK not installed. Run: pip install slack-sdk")
     exit(1)
 
-# Import Jarvis MCP functions
+# Import Jarvis core (not server.py - the bridge does not need the MCP stack)
 try:
-    from .server import (
-        generate_embedding,
-        qdrant_client,
-        COLLECTION_NAME,
-        check_overseer,
-        generate_point_id
+    from .config import COLLECTION_NAME, BRANCH_ROUTING_TOP
+    from .hivemind import (
+        get_qdrant_client, get_branch_counts, memory_timestamps, parse_time_bound,
+        count_memories
     )
+    from .embeddings import embed_query
+    from .overseer import check_overseer
     from .resource_monitor import get_system_info, get_resource_status
     from .task_coordinator import TaskCoordinator
+    from .stats_cache import BackgroundCache, CacheEntry
+    from .metrics import REGISTRY, EMBEDDINGS_AVOIDED, render_metrics
+    from .hot_tier import get_hot_index, search_memories, promote_memories
+    from .memory_text import (
+        memory_points, memory_text, memory_preview, get_memory_record, update_stored_memory, make_preview
+    )
+    from .change_feed import FeedFollower, record_changes, change_rows, change_row
+    from .related import link_related
+    from .branch_router import update_centroids, route_branches
 except ImportError:
-    from server import (
-        generate_embedding,
-        qdrant_client,
-        COLLECTION_NAME,
-        check_overseer,
-        generate_point_id
+    from config import COLLECTION_NAME, BRANCH_ROUTING_TOP
+    from hivemind import (
+        get_qdrant_client, get_branch_counts, memory_timestamps, parse_time_bound,
+        count_memories
     )
+    from embeddings import embed_query
+    from overseer import check_overseer
     from resource_monitor import get_system_info, get_resource_status
     from task_coordinator import TaskCoordinator
-
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, MatchAny
+    from stats_cache import BackgroundCache, CacheEntry
+    from metrics import REGISTRY, EMBEDDINGS_AVOIDED, render_metrics
+    from hot_tier import get_hot_index, search_memories, promote_memories
+    from memory_text import (
+        memory_points, memory_text, memory_preview, get_memory_record, update_stored_memory, make_preview
+    )
+    from change_feed import FeedFollower, record_changes, change_rows, change_row
+    from related import link_related
+    from branch_router import update_centroids, route_branches
 
 # Configuration
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
@@ -58,6 +79,26 @@ SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
 BRIDGE_PORT = int(os.getenv("SLACK_BRIDGE_PORT", "3000"))
 DEFAULT_BRANCH = os.getenv("DEFAULT_SLACK_BRANCH", "slack")
 
+# Deferred responses: Slack gives slash commands 3 seconds to answer, so slow
+# actions are acknowledged immediately and finished on a bounded worker pool
+SLACK_WORKERS = int(os.getenv("SLACK_WORKERS", "4"))
+SLACK_MAX_PENDING = int(os.getenv("SLACK_MAX_PENDING", "32"))
+SLACK_RESPONSE_RETRIES = int(os.getenv("SLACK_RESPONSE_RETRIES", "3"))
+SLACK_RESPONSE_TIMEOUT = int(os.getenv("SLACK_RESPONSE_TIMEOUT", "10"))
+
+# Cached snapshots for `stats` and `resources` (seconds between refreshes)
+SLACK_STATS_TTL = float(os.getenv("SLACK_STATS_TTL", "30"))
+SLACK_RESOURCES_TTL = float(os.getenv("SLACK_RESOURCES_TTL", "10"))
+
+# Change feed fan-out: "branch=webhook_url,..." posts new memories of each
+# branch to a Slack incoming webhook ("*" = every branch)
+SLACK_FEED_WEBHOOKS = os.getenv("SLACK_FEED_WEBHOOKS", "")
+SLACK_FEED_INTERVAL = float(os.getenv("SLACK_FEED_INTERVAL", "5"))
+SLACK_FEED_MAX_LINES = 20
+
+# Actions cheap enough to answer inside the ack
+INLINE_ACTIONS = {"help", "stats", "resources"}
+
 if not SLACK_BOT_TOKEN:
     print("Warning: SLACK_BOT_TOKEN not set. Slack responses will be limited.")
     slack_client = None
@@ -66,6 +107,97 @@ else:
 
 app = FastAPI(title="Jarvis Slack Bridge")
 task_coordinator = TaskCoordinator()
+action_executor = ThreadPoolExecutor(max_workers=SLACK_WORKERS, thread_name_prefix="jarvis-slack")
+# INLINE_ACTIONS get their own threads: queued deferred jobs must not delay an ack
+inline_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jarvis-slack-inline")
+
+
+SLACK_COMMAND_LATENCY = REGISTRY.histogram(
+    "jarvis_slack_command_duration_seconds", "Slash command ack/completion latency", ("phase", "action")
+)
+SLACK_UNDELIVERED = REGISTRY.counter(
+    "jarvis_slack_undelivered_total", "Deferred replies Slack did not accept via response_url", ("action",)
+)
+
+
+class LatencyTracker:
+    """Rolling latency samples (seconds) for a single measurement
+
+    Samples also feed the jarvis_slack_command_duration_seconds histogram
+    served at /metrics; the window here backs the human-readable /latency.
+    """
+
+    def __init__(self, phase: str, window: int = 1000):
+        self.phase = phase
+        self.samples: deque = deque(maxlen=window)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, action: str = ""):
+        SLACK_COMMAND_LATENCY.observe(seconds, phase=self.phase, action=action)
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+
+    def summary(self) -> dict:
+        """Get count and p50/p95/max in milliseconds over the window"""
+        with self._lock:
+            ordered = sorted(self.samples)
+            count = self.count
+        if not ordered:
+            return {"count": count}
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1)
+
+        return {
+            "count": count,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": round(ordered[-1] * 1000, 1)
+        }
+
+
+latency = {
+    "ack": LatencyTracker("ack"),
+    "completion": LatencyTracker("completion")
+}
+
+def load_hivemind_stats(since: Optional[float] = None, until: Optional[float] = None) -> dict:
+    """Snapshot of exact per-branch counts (two cheap Qdrant calls)"""
+    return {
+        "total_memories": count_memories(since, until),
+        "branches": get_branch_counts(since=since, until=until)
+    }
+
+
+def describe_window(params: dict) -> str:
+    """' (since 2024-06-01 09:00)'-style suffix for windowed results"""
+    parts = []
+    for bound in ("since", "until"):
+        if params.get(bound) is not None:
+            parts.append(f"{bound} {datetime.fromtimestamp(params[bound]).strftime('%Y-%m-%d %H:%M')}")
+    return f" ({', '.join(parts)})" if parts else ""
+
+
+def load_resource_snapshot() -> dict:
+    """Snapshot of psutil samples (blocks ~1.5s, so never call inline)"""
+    current_agents = task_coordinator.running_count()
+    return {
+        "info": get_system_info(),
+        "status": get_resource_status(current_agents)
+    }
+
+
+stats_cache = BackgroundCache("hivemind-stats", load_hivemind_stats, ttl=SLACK_STATS_TTL)
+resources_cache = BackgroundCache("system-resources", load_resource_snapshot, ttl=SLACK_RESOURCES_TTL)
+
+
+# Per-user de-duplication of deferred actions: (user_id, action, params) keys
+in_flight: set[tuple[str, str, str]] = set()
+in_flight_lock = threading.Lock()
+# Deferred replies that never reached Slack (guarded by in_flight_lock)
+undelivered = 0
 
 
 def format_slack_response(text: str, response_type: str = "ephemeral") -> dict:
@@ -76,14 +208,38 @@ def format_slack_response(text: str, response_type: str = "ephemeral") -> dict:
     }
 
 
+def parse_time_window(args: str) -> tuple[str, dict]:
+    """Split since:<when> / until:<when> tokens off the arguments
+
+    Returns:
+        (remaining text, {"since": epoch, "until": epoch} for the bounds given)
+
+    Raises:
+        ValueError: malformed bound
+    """
+    window = {}
+    words = []
+    for word in args.split():
+        bound, _, value = word.partition(":")
+        if bound.lower() in ("since", "until") and value:
+            window[bound.lower()] = parse_time_bound(value)
+        else:
+            words.append(word)
+    return " ".join(words), window
+
+
 def parse_jarvis_command(text: str) -> tuple[str, dict]:
     """Parse Slack command into Jarvis MCP action
 
     Examples:
         /jarvis search terraform patterns
         /jarvis store I learned that X works better than Y
+        /jarvis search deploy failures since:7d
         /jarvis stats
+        /jarvis stats since:2024-06-01 until:2024-07-01
         /jarvis resources
+
+    A malformed since/until returns ("help", {"error": ...}).
     """
     text = text.strip()
     parts = text.split(maxsplit=1)
@@ -95,13 +251,20 @@ def parse_jarvis_command(text: str) -> tuple[str, dict]:
     args = parts[1] if len(parts) > 1 else ""
 
     if command in ["search", "find", "query"]:
-        return "search", {"query": args, "limit": 5}
+        return search_action(args)
 
     elif command in ["store", "remember", "save"]:
         return "store", {"text": args, "branch_id": DEFAULT_BRANCH}
 
+    elif command in ["get", "show", "read"]:
+        return "get", {"id": args.strip()}
+
     elif command in ["stats", "status", "branch"]:
-        return "stats", {}
+        try:
+            _, window = parse_time_window(args)
+        except ValueError as e:
+            return "help", {"error": str(e)}
+        return "stats", window
 
     elif command in ["resources", "system", "capacity"]:
         return "resources", {}
@@ -111,18 +274,34 @@ def parse_jarvis_command(text: str) -> tuple[str, dict]:
 
     else:
         # Default: treat entire text as search query
-        return "search", {"query": text, "limit": 5}
+        return search_action(text)
+
+
+def search_action(text: str) -> tuple[str, dict]:
+    """Search action for a query that may carry since:/until: bounds"""
+    try:
+        query, window = parse_time_window(text)
+    except ValueError as e:
+        return "help", {"error": str(e)}
+    return "search", {"query": query, "limit": 5, **window}
+
 
+def execute_jarvis_action(action: str, params: dict) -> str:
+    """Execute Jarvis MCP action and return formatted response
 
-async def execute_jarvis_action(action: str, params: dict) -> str:
-    """Execute Jarvis MCP action and return formatted response"""
+    Blocking (embedding, Qdrant, psutil) - run it on action_executor.
+    """
 
     if action == "help":
-        return """🤖 *Jarvis Slack Commands*
+        error = f"❌ {params['error']}\n\n" if params.get("error") else ""
+        return error + """🤖 *Jarvis Slack Commands*
 
 *Search hive-mind:*
 `/jarvis search <query>` - Search shared memory
 `/jarvis <query>` - Quick search (default action)
+Add `since:<when>` / `until:<when>` to search or stats: `7d`, `12h`, `today`, `2024-06-01`
+
+`/jarvis get <id>` - Full text of a search result
 
 *Store knowledge:*
 `/jarvis store <text>` - Save to hive-mind memory
@@ -135,6 +314,7 @@ async def execute_jarvis_action(action: str, params: dict) -> str:
 • `/jarvis search terraform patterns`
 • `/jarvis store Always validate Terraform before apply`
 • `/jarvis authentication logic`
+• `/jarvis search what did we learn since:7d`
 """
 
     elif action == "search":
@@ -143,26 +323,26 @@ async def execute_jarvis_action(action: str, params: dict) -> str:
             return "❌ Search query cannot be empty. Try: `/jarvis search <query>`"
 
         # Generate embedding and search
-        query_embedding = generate_embedding(query)
-        search_response = qdrant_client.query_points(
-            collection_name=COLLECTION_NAME,
-            query=query_embedding,
-            limit=params.get("limit", 5)
+        query_embedding = embed_query(query)
+        branches = route_branches(query_embedding, BRANCH_ROUTING_TOP) if BRANCH_ROUTING_TOP else None
+        results = search_memories(
+            query_embedding, params.get("limit", 5), branches=branches,
+            since=params.get("since"), until=params.get("until")
         )
-        results = search_response.points
+        window = describe_window(params)
 
         if not results:
-            return f"🔍 No memories found for: `{query}`"
+            return f"🔍 No memories found for: `{query}`{window}"
 
-        output = f"🧠 *Found {len(results)} memories for:* `{query}`\n\n"
+        output = f"🧠 *Found {len(results)} memories for:* `{query}`{window}\n\n"
         for i, result in enumerate(results, 1):
             branch = result.payload.get('branch_id', 'unknown')
-            text_preview = result.payload.get('text', '')[:200]
+            text_preview = memory_preview(result.payload, 200)
             timestamp = result.payload.get('timestamp', 'N/A')
 
             output += f"*{i}. [{result.score:.2f}]* `[{branch}]`\n"
             output += f"{text_preview}...\n"
-            output += f"_Stored: {timestamp}_\n\n"
+            output += f"_Stored: {timestamp} · `/jarvis get {result.id}`_\n\n"
 
         return output
 
@@ -178,55 +358,77 @@ async def execute_jarvis_action(action: str, params: dict) -> str:
         if not overseer_result["safe"]:
             return f"⚠️ *Overseer Alert:* {overseer_result['reason']}\n\nRequires approval to store."
 
-        # Generate embedding and store
-        embedding = generate_embedding(text)
-        timestamp = datetime.now().isoformat()
-        point_id = generate_point_id(text, branch_id)
-
-        point = PointStruct(
-            id=point_id,
-            vector=embedding,
-            payload={
-                "text": text,
-                "branch_id": branch_id,
-                "timestamp": timestamp,
-                "source": "slack",
-                "overseer_status": overseer_result["reason"]
-            }
+        payload = {
+            **memory_timestamps(),
+            "source": "slack",
+            "overseer_status": overseer_result["reason"]
+        }
+
+        # Already stored (same text and branch): refresh it, no embedding needed
+        memory_id, updated = update_stored_memory(text, branch_id, payload, get_qdrant_client(), COLLECTION_NAME)
+        if updated:
+            EMBEDDINGS_AVOIDED.inc(updated, source="slack")
+            stats_cache.invalidate()
+            record_changes(
+                "update", [change_row(memory_id, {**payload, "branch_id": branch_id, "preview": make_preview(text)})],
+                source="slack"
+            )
+            return f"✅ *Already in hive-mind* (timestamp refreshed)\n\nBranch: `{branch_id}`\nID: `{memory_id}`"
+
+        # Generate embeddings (long texts as chunks) and store
+        points = memory_points(text, branch_id, payload)
+
+        get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=points)
+        promote_memories(points)
+        link_related(points, get_qdrant_client(), COLLECTION_NAME)
+        update_centroids(points)
+        stats_cache.invalidate()
+        record_changes("store", change_rows(points), source="slack")
+
+        return f"✅ *Memory stored in hive-mind*\n\nBranch: `{branch_id}`\nID: `{points[0].id}`"
+
+    elif action == "get":
+        point_id = params["id"]
+        if not point_id:
+            return "❌ Which memory? Try: `/jarvis get <id>` (IDs are shown in search results)"
+        record = get_memory_record(
+            int(point_id) if point_id.isdigit() else point_id, get_qdrant_client(), COLLECTION_NAME
         )
-
-        qdrant_client.upsert(collection_name=COLLECTION_NAME, points=[point])
-
-        return f"✅ *Memory stored in hive-mind*\n\nBranch: `{branch_id}`\nID: `{point_id}`"
+        if record is None:
+            return f"🔍 No memory with ID `{point_id}`"
+        payload = record.payload or {}
+        output = f"🧠 *Memory* `{record.id}` `[{payload.get('branch_id', 'unknown')}]`\n\n"
+        output += f"{memory_text(payload)}\n\n"
+        output += f"_Stored: {payload.get('timestamp', 'N/A')}_"
+        return output
 
     elif action == "stats":
-        # Get branch statistics
-        collection = qdrant_client.get_collection(collection_name=COLLECTION_NAME)
-
-        scroll_result = qdrant_client.scroll(
-            collection_name=COLLECTION_NAME,
-            limit=1000,
-            with_vectors=False
-        )
-
-        branches = {}
-        for point in scroll_result[0]:
-            branch = point.payload.get("branch_id", "unknown")
-            branches[branch] = branches.get(branch, 0) + 1
-
-        output = f"📊 *Hive-Mind Statistics*\n\n"
-        output += f"Total Memories: {collection.points_count}\n"
+        if params.get("since") or params.get("until"):
+            # Windowed counts are not cached (deferred like other Qdrant work)
+            entry = CacheEntry(
+                value=load_hivemind_stats(params.get("since"), params.get("until")),
+                refreshed_at=time.time(),
+                load_seconds=0.0
+            )
+        else:
+            # Served from the shared cache - refreshed in the background
+            entry = stats_cache.get()
+        branches = entry.value["branches"]
+
+        output = f"📊 *Hive-Mind Statistics*{describe_window(params)}\n\n"
+        output += f"Total Memories: {entry.value['total_memories']}\n"
         output += f"Total Branches: {len(branches)}\n\n"
         output += "*Branch Breakdown:*\n"
         for branch, count in sorted(branches.items(), key=lambda x: x[1], reverse=True):
             output += f"• `{branch}`: {count} memories\n"
+        output += f"\n_Stats updated {entry.freshness()}_"
 
         return output
 
     elif action == "resources":
-        info = get_system_info()
-        current_agents = len([t for t in task_coordinator.tasks.values() if t.status.value == "running"])
-        status = get_resource_status(current_agents)
+        entry = resources_cache.get()
+        info = entry.value["info"]
+        status = entry.value["status"]
 
         output = f"💻 *System Resources*\n\n"
         output += f"*CPU:* {info['cpu']['percent']}% ({info['cpu']['count']} cores)\n"
@@ -235,6 +437,7 @@ async def execute_jarvis_action(action: str, params: dict) -> str:
         output += f"• Zone: `{status.zone.upper()}`\n"
         output += f"• Max Agents: {status.max_agents}\n"
         output += f"• Can Spawn: {'✅' if status.can_spawn else '❌'}\n"
+        output += f"\n_Sampled {entry.freshness()}_"
 
         return output
 
@@ -242,25 +445,207 @@ async def execute_jarvis_action(action: str, params: dict) -> str:
         return f"❌ Unknown action: `{action}`. Try `/jarvis help`"
 
 
+def post_to_response_url(response_url: str, text: str) -> bool:
+    """Post a deferred response to Slack's response_url, retrying with backoff
+
+    Returns:
+        True if Slack accepted the message
+    """
+    return post_to_webhook(response_url, format_slack_response(text, response_type="ephemeral"), "response_url")
+
+
+def post_to_webhook(url: str, payload: dict, label: str) -> bool:
+    """Post to a Slack webhook URL, retrying 5xx/429/network errors with backoff
+
+    Returns:
+        True if Slack accepted the message
+    """
+    webhook = WebhookClient(url, timeout=SLACK_RESPONSE_TIMEOUT)
+
+    for attempt in range(SLACK_RESPONSE_RETRIES + 1):
+        try:
+            response = webhook.send(**payload)
+            if response.status_code == 200:
+                return True
+            # 4xx (other than rate limiting) will not succeed on retry
+            if response.status_code < 500 and response.status_code != 429:
+                print(f"✗ {label} rejected message: {response.status_code} {response.body}")
+                return False
+            error = f"HTTP {response.status_code}"
+        except Exception as e:
+            error = str(e)
+
+        if attempt < SLACK_RESPONSE_RETRIES:
+            delay = 0.5 * (2 ** attempt)
+            print(f"⚠️  {label} post failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    print(f"✗ Giving up on {label} after {SLACK_RESPONSE_RETRIES + 1} attempts: {error}")
+    return False
+
+
+def parse_feed_webhooks(spec: str) -> dict[str, str]:
+    """SLACK_FEED_WEBHOOKS ("branch=url,...") as {branch: url}"""
+    webhooks = {}
+    for entry in spec.split(","):
+        branch, _, url = entry.strip().partition("=")
+        if branch and url:
+            webhooks[branch.strip()] = url.strip()
+    return webhooks
+
+
+def format_feed_message(changes: list[dict]) -> str:
+    """Slack message announcing new memories from the change feed"""
+    branches = sorted({change["branch_id"] for change in changes})
+    where = f"`{branches[0]}`" if len(branches) == 1 else f"{len(branches)} branches"
+    lines = [f"🔔 *{len(changes)} new in hive-mind* ({where})"]
+    for change in changes[:SLACK_FEED_MAX_LINES]:
+        preview = (change["preview"] or "")[:120]
+        lines.append(f"• `{change['branch_id']}` {change['op']} {change['type'] or 'memory'}: {preview}")
+    if len(changes) > SLACK_FEED_MAX_LINES:
+        lines.append(f"…and {len(changes) - SLACK_FEED_MAX_LINES} more")
+    return "\n".join(lines)
+
+
+def make_feed_follower(branch: str, url: str) -> FeedFollower:
+    """Follower posting `branch` changes to `url`; undelivered changes are retried"""
+    def deliver(changes: list[dict]):
+        if not post_to_webhook(url, {"text": format_feed_message(changes)}, f"feed webhook ({branch})"):
+            raise RuntimeError("Slack did not accept the message")
+
+    branches = None if branch == "*" else [branch]
+    return FeedFollower(f"slack-webhook:{branch}", deliver, branches=branches, interval=SLACK_FEED_INTERVAL)
+
+
+feed_followers = [make_feed_follower(branch, url) for branch, url in parse_feed_webhooks(SLACK_FEED_WEBHOOKS).items()]
+
+
+def run_action_safely(action: str, params: dict) -> str:
+    """execute_jarvis_action, with failures turned into a Slack message"""
+    try:
+        return execute_jarvis_action(action, params)
+    except Exception as e:
+        print(f"✗ Slack action '{action}' failed: {e}")
+        return f"❌ Jarvis hit an error running `{action}`: {e}"
+
+
+def run_deferred_action(action: str, params: dict, response_url: str,
+                        dedup_key: tuple[str, str, str], received_at: float):
+    """Worker: execute the action and deliver the result via response_url
+
+    Completion latency is only recorded for replies Slack accepted; the
+    rest count as undelivered.
+    """
+    global undelivered
+    delivered = False
+    try:
+        response_text = run_action_safely(action, params)
+        delivered = post_to_response_url(response_url, response_text)
+        elapsed = time.perf_counter() - received_at
+        if delivered:
+            latency["completion"].record(elapsed, action)
+            print(f"⏱️  {action} completed in {elapsed * 1000:.0f}ms")
+        else:
+            print(f"✗ {action} finished in {elapsed * 1000:.0f}ms but its reply was not delivered")
+    finally:
+        if not delivered:
+            SLACK_UNDELIVERED.inc(action=action)
+        with in_flight_lock:
+            in_flight.discard(dedup_key)
+            if not delivered:
+                undelivered += 1
+
+
 @app.post("/slack/command")
 async def handle_slack_command(request: Request):
-    """Handle Slack slash command"""
+    """Handle Slack slash command
+
+    Acknowledges within Slack's 3 second deadline; anything outside
+    INLINE_ACTIONS (help and the cached stats/resources, answered on their
+    own threads) runs on the worker pool and answers via response_url.
+    """
+    received_at = time.perf_counter()
     form_data = await request.form()
 
     # Extract Slack command data
     command = form_data.get("command", "")
     text = form_data.get("text", "")
     user_name = form_data.get("user_name", "unknown")
+    user_id = form_data.get("user_id", user_name)
     channel_id = form_data.get("channel_id", "")
+    response_url = form_data.get("response_url", "")
 
     print(f"📨 Slack command from @{user_name}: {command} {text}")
 
-    # Parse and execute Jarvis action
     action, params = parse_jarvis_command(text)
-    response_text = await execute_jarvis_action(action, params)
 
-    # Return response to Slack
-    return format_slack_response(response_text, response_type="ephemeral")
+    windowed = "since" in params or "until" in params
+    if (action in INLINE_ACTIONS and not windowed) or not response_url:
+        # Cache reads answer on their own threads; anything else without a
+        # response_url (nowhere to post a deferred reply) waits for a worker
+        executor = inline_executor if action in INLINE_ACTIONS and not windowed else action_executor
+        loop = asyncio.get_running_loop()
+        response_text = await loop.run_in_executor(executor, run_action_safely, action, params)
+        latency["ack"].record(time.perf_counter() - received_at, action)
+        latency["completion"].record(time.perf_counter() - received_at, action)
+        return format_slack_response(response_text, response_type="ephemeral")
+
+    dedup_key = (user_id, action, json.dumps(params, sort_keys=True))
+    with in_flight_lock:
+        if dedup_key in in_flight:
+            ack_text = f"⏳ Already working on `{action}` for you - hang tight."
+        elif len(in_flight) >= SLACK_MAX_PENDING:
+            ack_text = "🚦 Jarvis is busy right now. Try again in a few seconds."
+        else:
+            in_flight.add(dedup_key)
+            action_executor.submit(
+                run_deferred_action, action, params, response_url, dedup_key, received_at
+            )
+            ack_text = f"⏳ Working on `{action}`..."
+
+    latency["ack"].record(time.perf_counter() - received_at, action)
+    return format_slack_response(ack_text, response_type="ephemeral")
+
+
+@app.get("/latency")
+async def latency_stats():
+    """Ack vs completion latency for slash commands"""
+    with in_flight_lock:
+        pending = len(in_flight)
+        failed = undelivered
+    return {
+        "ack": latency["ack"].summary(),
+        "completion": latency["completion"].summary(),
+        "undelivered": failed,
+        "in_flight": pending,
+        "workers": SLACK_WORKERS
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: tool, embedding, Qdrant and slash command latency"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.on_event("startup")
+async def start_caches():
+    """Keep stats/resources warm so slash commands never sample inline"""
+    stats_cache.start()
+    resources_cache.start()
+    get_hot_index()
+    for follower in feed_followers:
+        follower.start()
+
+
+@app.on_event("shutdown")
+async def stop_caches():
+    stats_cache.stop()
+    resources_cache.stop()
+    for follower in feed_followers:
+        follower.stop()
+    if get_hot_index():
+        get_hot_index().stop()
 
 
 @app.get("/health")
@@ -281,6 +666,8 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/slack/command": "Slack slash command webhook",
+            "/latency": "Slash command ack/completion latency",
+            "/metrics": "Prometheus metrics",
             "/health": "Health check"
         },
         "usage": "Configure Slack app to POST to /slack/command"
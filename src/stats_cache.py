@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Stats Cache - Shared TTL cache for expensive read-mostly snapshots
+Hive-mind stats and psutil samples are refreshed in the background so
+callers (e.g. busy Slack channels) never pay for them inline
+"""
+
+import sys
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and when it was produced"""
+    value: Any
+    refreshed_at: float     # time.time() when the loader finished
+    load_seconds: float     # How long the loader took
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.refreshed_at)
+
+    def freshness(self) -> str:
+        """Human readable age, e.g. '12s ago'"""
+        age = self.age_seconds
+        if age < 1:
+            return "just now"
+        if age < 120:
+            return f"{age:.0f}s ago"
+        return f"{age / 60:.0f}m ago"
+
+
+class BackgroundCache:
+    """TTL cache around a single loader with stale-while-revalidate semantics
+
+    - First get() loads synchronously (nothing to serve yet)
+    - A stale entry is served immediately while one background refresh runs
+    - start() keeps the entry warm with a daemon thread every `ttl` seconds
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], ttl: float):
+        self.name = name
+        self.loader = loader
+        self.ttl = ttl
+        self._entry: Optional[CacheEntry] = None
+        self._stale = False
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> Optional[CacheEntry]:
+        """Run the loader now (skipped if a refresh is already running)"""
+        if not self._refreshing.acquire(blocking=False):
+            return self._entry
+        try:
+            self._stale = False
+            started = time.perf_counter()
+            value = self.loader()
+            entry = CacheEntry(
+                value=value,
+                refreshed_at=time.time(),
+                load_seconds=time.perf_counter() - started
+            )
+            with self._lock:
+                self._entry = entry
+            return entry
+        except Exception as e:
+            print(f"⚠️  {self.name} cache refresh failed: {e}", file=sys.stderr)
+            return self._entry
+        finally:
+            self._refreshing.release()
+
+    def get(self) -> CacheEntry:
+        """Get the cached entry, loading or scheduling a refresh as needed"""
+        with self._lock:
+            entry = self._entry
+
+        if entry is None:
+            # Concurrent first callers wait for the same load
+            with self._refreshing:
+                pass
+            entry = self._entry or self.refresh()
+            if entry is None:
+                raise RuntimeError(f"{self.name} cache has no value")
+            return entry
+
+        if self._stale or entry.age_seconds >= self.ttl:
+            threading.Thread(target=self.refresh, daemon=True).start()
+        return entry
+
+    def invalidate(self):
+        """Mark the entry stale; the next get() triggers a background refresh"""
+        self._stale = True
+
+    def start(self):
+        """Keep the entry warm from a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-cache", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.ttl)
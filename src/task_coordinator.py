@@ -5,6 +5,7 @@ Manages task spawning, queuing, and branch context propagation
 """
 
 import json
+import threading
 from typing import List, Dict, Literal, Optional
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
@@ -83,6 +84,8 @@ class TaskCoordinator:
     def __init__(self):
         self.tasks: Dict[str, ParallelTask] = {}
         self.execution_history: List[Dict] = []
+        # Shared by every session of an HTTP server (tools run on worker threads)
+        self._lock = threading.RLock()
 
     def generate_task_id(self, description: str, branch_id: str) -> str:
         """Generate unique task ID"""
@@ -108,46 +111,48 @@ class TaskCoordinator:
         Returns:
             ExecutionPlan with task allocation
         """
-        # Create task objects
-        tasks = []
-        for desc in task_descriptions:
-            task_id = self.generate_task_id(desc['description'], branch_id)
-            task = ParallelTask(
-                id=task_id,
-                description=desc['description'],
-                task_type=desc.get('type', 'general'),
-                priority=TaskPriority[desc.get('priority', 'MEDIUM').upper()],
-                branch_id=branch_id,
-                metadata=desc.get('metadata', {})
-            )
-            tasks.append(task)
-            self.tasks[task_id] = task
-
-        # Sort by priority
-        tasks.sort(key=lambda t: t.priority.value)
-
-        # Get resource recommendation
-        current_running = len([t for t in self.tasks.values() if t.status == TaskStatus.RUNNING])
-        recommendation = get_recommended_parallelism(len(tasks), current_running)
-
-        # Allocate tasks based on strategy
-        if strategy == "sequential":
-            parallel_tasks = tasks[:1]
-            queued_tasks = tasks[1:]
-            exec_strategy = "sequential"
-        elif strategy == "parallel":
-            parallel_tasks = tasks[:recommendation['parallel_tasks']]
-            queued_tasks = tasks[recommendation['parallel_tasks']:]
-            exec_strategy = "parallel"
-        else:  # auto or adaptive
-            parallel_tasks = tasks[:recommendation['parallel_tasks']]
-            queued_tasks = tasks[recommendation['parallel_tasks']:]
-            exec_strategy = recommendation['strategy']
-
-        # Mark parallel tasks as running
-        for task in parallel_tasks:
-            task.status = TaskStatus.RUNNING
-            task.started_at = datetime.now().isoformat()
+        # One plan at a time, so concurrent sessions see each other's running tasks
+        with self._lock:
+            # Create task objects
+            tasks = []
+            for desc in task_descriptions:
+                task_id = self.generate_task_id(desc['description'], branch_id)
+                task = ParallelTask(
+                    id=task_id,
+                    description=desc['description'],
+                    task_type=desc.get('type', 'general'),
+                    priority=TaskPriority[desc.get('priority', 'MEDIUM').upper()],
+                    branch_id=branch_id,
+                    metadata=desc.get('metadata', {})
+                )
+                tasks.append(task)
+                self.tasks[task_id] = task
+
+            # Sort by priority
+            tasks.sort(key=lambda t: t.priority.value)
+
+            # Get resource recommendation
+            current_running = self.running_count()
+            recommendation = get_recommended_parallelism(len(tasks), current_running)
+
+            # Allocate tasks based on strategy
+            if strategy == "sequential":
+                parallel_tasks = tasks[:1]
+                queued_tasks = tasks[1:]
+                exec_strategy = "sequential"
+            elif strategy == "parallel":
+                parallel_tasks = tasks[:recommendation['parallel_tasks']]
+                queued_tasks = tasks[recommendation['parallel_tasks']:]
+                exec_strategy = "parallel"
+            else:  # auto or adaptive
+                parallel_tasks = tasks[:recommendation['parallel_tasks']]
+                queued_tasks = tasks[recommendation['parallel_tasks']:]
+                exec_strategy = recommendation['strategy']
+
+            # Mark parallel tasks as running
+            for task in parallel_tasks:
+                task.status = TaskStatus.RUNNING
+                task.started_at = datetime.now().isoformat()
 
         return ExecutionPlan(
             strategy=exec_strategy,
@@ -158,17 +163,24 @@ class TaskCoordinator:
             branch_id=branch_id
         )
 
+    def running_count(self) -> int:
+        """Number of tasks currently running"""
+        with self._lock:
+            return sum(1 for t in self.tasks.values() if t.status == TaskStatus.RUNNING)
+
     def get_task_stats(self) -> Dict:
         """Get statistics about current tasks"""
-        running = [t for t in self.tasks.values() if t.status == TaskStatus.RUNNING]
-        queued = [t for t in self.tasks.values() if t.status == TaskStatus.QUEUED]
-        completed = [t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED]
-        failed = [t for t in self.tasks.values() if t.status == TaskStatus.FAILED]
+        with self._lock:
+            tasks = list(self.tasks.values())
+        running = [t for t in tasks if t.status == TaskStatus.RUNNING]
+        queued = [t for t in tasks if t.status == TaskStatus.QUEUED]
+        completed = [t for t in tasks if t.status == TaskStatus.COMPLETED]
+        failed = [t for t in tasks if t.status == TaskStatus.FAILED]
 
         resource_status = get_resource_status(len(running))
 
         return {
-            "total_tasks": len(self.tasks),
+            "total_tasks": len(tasks),
             "running": len(running),
             "queued": len(queued),
             "completed": len(completed),